@@ -0,0 +1,7 @@
+from app import create_app
+from app.aio.server import serve
+
+app = create_app(config='app.config.DevelopmentConfig')
+
+if __name__ == '__main__':
+    serve(app)
@@ -3,33 +3,56 @@ from flask.logging import default_handler
 
 from app.middlewares.json_provider import AppJSONProvider
 from app.utils import logging_utils
+from app.utils.startup import warm_up
 
 
 def create_app(config='app.config.DevelopmentConfig'):
     app = Flask(__name__)
-    app.json = AppJSONProvider(app)
-    app.json.sort_keys = False
     app.logger.removeHandler(default_handler)
     logging_utils.setup_logging()
 
     # Load configuration
     app.config.from_object(config)
+    app.json = AppJSONProvider(app)
+    app.json.sort_keys = False
 
     # Register error handler
-    from .middlewares import error_handler, request_id_loader
+    from .middlewares import compression, error_handler, request_id_loader
     error_handler.init_app(app)
     request_id_loader.init_app(app)
+    compression.init_app(app)
 
     # Register database
 
     from .database import db
     db.init_app(app)
 
+    # Register event broker
+    from .events import broker, outbox_dispatcher
+    broker.init_app(app)
+    outbox_dispatcher.init_app(app)
+
+    # Register caches and read coalescing
+    from .cache import user_cache
+    from .utils import single_flight
+    user_cache.init_app(app)
+    single_flight.init_app(app)
+
     # Register blueprints
-    from app.routes import api
+    from app.routes import api, user_routes
     from app.routes.user_routes import user_bp
+    from app.routes.metrics_routes import metrics_bp
 
     api.register_blueprint(user_bp, url_prefix="/users")  # child blueprint(s)
+    api.register_blueprint(metrics_bp, url_prefix="/metrics")
     app.register_blueprint(api, url_prefix='/api')  # parent blueprint
 
+    if app.config['DATA_ACCESS_MODE'] == 'async':
+        from app.routes import async_user_routes
+        async_user_routes.init_app(app)
+    user_routes.init_app(app)
+
+    if app.config['WARM_UP_ON_START']:
+        warm_up(app)
+
     return app
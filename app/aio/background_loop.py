@@ -0,0 +1,133 @@
+"""background_loop.py
+
+A process-wide asyncio event loop running on a daemon thread.
+
+Async resources such as `psycopg_pool.AsyncConnectionPool` are bound to the loop that opened them,
+while Flask runs every request in a worker thread without a loop of its own. Owning those resources on
+one long-lived loop lets any thread (through `submit`/`run`) or any other loop (by awaiting
+`wrap_future(submit(...))`) use them, and lets async views run on that same loop so their awaits
+never hop between loops.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import os
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Coroutine
+
+from app.utils.class_helpers import auto_repr
+from app.utils.singleton_decorator import singleton
+
+
+@singleton
+class BackgroundLoop:
+    def __init__(self, name: str = 'aio-background') -> None:
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        _loops.add(self)
+
+    def _reset_after_fork(self) -> None:
+        self._loop, self._thread, self._lock = None, None, threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The event loop, started on first access."""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(target=loop.run_forever, name=self.name, daemon=True)
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+    def is_current(self) -> bool:
+        """Whether the caller is running on this loop."""
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def submit(self, coro: Coroutine, context: contextvars.Context | None = None) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the loop from any thread.
+
+        Args:
+            coro (Coroutine): The coroutine to run.
+            context (contextvars.Context | None): Context to run it in, e.g. a copy of the caller's so that
+                Flask's request context is visible. Defaults to a fresh copy of the loop thread's context.
+
+        Returns:
+            concurrent.futures.Future: Resolved with the coroutine's result or exception.
+        """
+        if context is None:
+            return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+        future: concurrent.futures.Future = concurrent.futures.Future()
+
+        def copy_result(task: asyncio.Task) -> None:
+            if task.cancelled():
+                future.set_exception(concurrent.futures.CancelledError())
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+
+        def start() -> None:
+            if future.set_running_or_notify_cancel():
+                self.loop.create_task(coro, context=context).add_done_callback(copy_result)
+            else:
+                coro.close()
+
+        self.loop.call_soon_threadsafe(start)
+        return future
+
+    def run(self, coro: Coroutine, context: contextvars.Context | None = None) -> Any:
+        """Run a coroutine on the loop and block the calling thread until it finishes."""
+        if self.is_current():
+            raise RuntimeError("BackgroundLoop.run() would deadlock when called from the loop itself")
+        return self.submit(coro, context).result()
+
+    async def call(self, coro: Coroutine) -> Any:
+        """Await a coroutine on this loop from any loop, directly when already running on it."""
+        if self.is_current():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def async_to_sync(self, func: Callable[..., Awaitable[Any]]) -> Callable[..., Any]:
+        """
+        Drop-in for `Flask.async_to_sync`: run async views on this loop, inside the request's context,
+        instead of on a new event loop per request (which would need `asgiref`).
+        """
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.run(func(*args, **kwargs), context=contextvars.copy_context())
+
+        return wrapper
+
+    def close(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+
+    __repr__ = auto_repr
+
+
+_loops: weakref.WeakSet[BackgroundLoop] = weakref.WeakSet()
+
+
+def _reset_loops_after_fork() -> None:
+    """The loop thread does not survive fork(); a child starts its own loop on first use."""
+    for background_loop in list(_loops):
+        background_loop._reset_after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_loops_after_fork)
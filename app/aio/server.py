@@ -0,0 +1,341 @@
+"""server.py
+
+An asyncio HTTP/1.1 front end for the Flask app.
+
+Server-Sent Events endpoints (views marked with `SSEHandler.endpoint`) are served directly on the
+event loop, so an idle stream costs one socket and one coroutine instead of one OS thread.
+Every other request is handed to the regular WSGI app on a small thread pool, so the CRUD routes
+behave exactly as they do under `wsgi.py`.
+"""
+
+import asyncio
+import io
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Dict, List, Tuple
+from urllib.parse import unquote, parse_qsl
+
+from flask import Flask
+
+from app.events.broker import EventBroker, SubscriptionClosed
+from app.exceptions.api_exception import APIException
+from app.handlers.sse_handler import HEARTBEAT_FRAME, SSEHandler
+from app.utils.class_helpers import auto_repr
+
+logger = logging.getLogger(__name__)
+
+MAX_HEADER_BYTES = 64 * 1024
+
+
+def _has_body(status_code: int, method: str) -> bool:
+    """Whether a response may carry a body (RFC 9112 section 6.3): never to HEAD, nor with 1xx, 204 or 304."""
+    return method != 'HEAD' and status_code >= 200 and status_code not in (204, 304)
+
+
+@dataclass
+class HTTPRequest:
+    method: str
+    path: str
+    query_string: str
+    version: str
+    headers: List[Tuple[str, str]] = field(default_factory=list)
+    body: bytes = b''
+
+    def header(self, name: str, default: str | None = None) -> str | None:
+        name = name.lower()
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return default
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = (self.header('Connection') or '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+
+class AsyncServer:
+    def __init__(self, app: Flask, broker: EventBroker, wsgi_threads: int = 16,
+                 heartbeat_interval: float = 15, max_body_size: int = 16 * 1024 * 1024) -> None:
+        self.app = app
+        self.broker = broker
+        self.heartbeat_interval = heartbeat_interval
+        # Request bodies are read into memory before the WSGI app runs; larger ones are answered with a 413.
+        self.max_body_size = max_body_size
+        self.executor = ThreadPoolExecutor(max_workers=wsgi_threads, thread_name_prefix='wsgi')
+        self.stream_routes: Dict[str, Tuple[str, str | None]] = self._collect_stream_routes(app)
+        self.open_streams = 0
+
+    @staticmethod
+    def _collect_stream_routes(app: Flask) -> Dict[str, Tuple[str, str | None]]:
+        """Map the URL of every argument-less SSE view to the broker topic and key parameter it streams."""
+        routes = {}
+        for rule in app.url_map.iter_rules():
+            view = app.view_functions.get(rule.endpoint)
+            topic = getattr(view, 'sse_topic', None)
+            if topic is not None and not rule.arguments:
+                routes[rule.rule] = (topic, view.sse_key_param)
+        return routes
+
+    async def serve_forever(self, host: str, port: int) -> None:
+        server = await asyncio.start_server(self._handle_connection, host, port, limit=MAX_HEADER_BYTES,
+                                            backlog=4096)
+        logger.info(f"Async server listening on {host}:{port} (streams: {list(self.stream_routes)})")
+        async with server:
+            await server.serve_forever()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = writer.get_extra_info('peername')
+        try:
+            while True:
+                request = await self._read_request(reader, writer)
+                if request is None:
+                    break
+                stream = self.stream_routes.get(request.path)
+                if stream is not None and request.method == 'GET':
+                    if await self._serve_stream(reader, writer, request, *stream):
+                        break
+                if not await self._serve_wsgi(writer, request, peer) or not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            logger.exception(f"Unhandled error while serving {peer}: {e}")
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> HTTPRequest | None:
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            await self._write_status(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+            return None
+
+        request_line, *header_lines = head.decode('latin-1').rstrip('\r\n').split('\r\n')
+        try:
+            method, target, version = request_line.split(' ', 2)
+        except ValueError:
+            await self._write_status(writer, HTTPStatus.BAD_REQUEST)
+            return None
+
+        path, _, query_string = target.partition('?')
+        headers = []
+        for line in header_lines:
+            name, _, value = line.partition(':')
+            headers.append((name.strip(), value.strip()))
+        request = HTTPRequest(method=method.upper(), path=unquote(path), query_string=query_string,
+                              version=version, headers=headers)
+
+        try:
+            if (request.header('Transfer-Encoding') or '').lower() == 'chunked':
+                body = await self._read_chunked(reader)
+            elif request.header('Content-Length'):
+                length = int(request.header('Content-Length'))
+                if length < 0:
+                    raise ValueError(f"Negative Content-Length: {length}")
+                body = await reader.readexactly(length) if length <= self.max_body_size else None
+            else:
+                body = b''
+        except ValueError:
+            await self._write_status(writer, HTTPStatus.BAD_REQUEST)
+            return None
+        if body is None:
+            # The rest of the body is never read, so the connection cannot be reused.
+            await self._write_status(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            return None
+        request.body = body
+        return request
+
+    async def _read_chunked(self, reader: asyncio.StreamReader) -> bytes | None:
+        """Read a chunked request body, or return None once it grows past `max_body_size`."""
+        body = bytearray()
+        while True:
+            size = int((await reader.readline()).split(b';', 1)[0], 16)
+            if size == 0:
+                await reader.readuntil(b'\r\n')
+                return bytes(body)
+            if len(body) + size > self.max_body_size:
+                return None
+            body += await reader.readexactly(size)
+            await reader.readexactly(2)
+
+    @staticmethod
+    async def _write_status(writer: asyncio.StreamWriter, status: HTTPStatus) -> None:
+        writer.write(f"HTTP/1.1 {status.value} {status.phrase}\r\nContent-Length: 0\r\n"
+                     f"Connection: close\r\n\r\n".encode('latin-1'))
+        await writer.drain()
+
+    async def _serve_stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                            request: HTTPRequest, topic: str, key_param: str | None) -> bool:
+        """
+        Drain a broker subscription onto the socket without ever blocking the loop.
+
+        Returns:
+            bool: False if the request was not served (e.g. invalid filters) and should go to the WSGI app.
+        """
+        try:
+            with self.app.app_context():
+                subscription = SSEHandler.subscribe(self.broker, topic, dict(parse_qsl(request.query_string)),
+                                                    last_event_id=request.header('Last-Event-ID'),
+                                                    key_param=key_param)
+        except APIException:
+            return False
+
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        subscription.set_waker(lambda: loop.call_soon_threadsafe(wakeup.set))
+        # The client never sends anything after the request, so EOF means it went away.
+        disconnected = asyncio.ensure_future(reader.read())
+
+        self.open_streams += 1
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\n"
+                         b"Content-Type: text/event-stream; charset=utf-8\r\n"
+                         b"Cache-Control: no-cache\r\n"
+                         b"X-Accel-Buffering: no\r\n"
+                         b"Connection: close\r\n\r\n" + HEARTBEAT_FRAME)
+            await writer.drain()
+
+            while not disconnected.done():
+                wakeup.clear()
+                frames = []
+                while (event := subscription.get(timeout=0)) is not None:
+                    frames.append(event.frame)
+                if frames:
+                    writer.write(b''.join(frames))
+                    await writer.drain()
+                    continue
+
+                flush = subscription.next_flush_in()
+                flushing = flush is not None and flush < self.heartbeat_interval
+                woken = asyncio.ensure_future(wakeup.wait())
+                done, _ = await asyncio.wait({woken, disconnected},
+                                             timeout=flush if flushing else self.heartbeat_interval,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                woken.cancel()
+                if not done and not flushing:
+                    writer.write(HEARTBEAT_FRAME)
+                    await writer.drain()
+        except SubscriptionClosed as e:
+            logger.info(f"SSE stream closed by broker: {e}")
+        finally:
+            self.open_streams -= 1
+            disconnected.cancel()
+            subscription.set_waker(None)
+            self.broker.unsubscribe(subscription)
+        return True
+
+    async def _serve_wsgi(self, writer: asyncio.StreamWriter, request: HTTPRequest, peer) -> bool:
+        """
+        Run the WSGI app on the thread pool. The response body is iterated on that same thread
+        (Flask's streaming contexts are thread-bound) and written back through the loop.
+
+        Returns:
+            bool: Whether the connection can be reused.
+        """
+        loop = asyncio.get_running_loop()
+        environ = self._environ(request, peer)
+
+        def write(data: bytes) -> None:
+            asyncio.run_coroutine_threadsafe(self._write(writer, data), loop).result()
+
+        def run() -> bool:
+            response_started = {}
+
+            def start_response(status, headers, exc_info=None):
+                response_started['status'] = status
+                response_started['headers'] = headers
+                return write
+
+            result = self.app(environ, start_response)
+            try:
+                headers = response_started['headers']
+                has_body = _has_body(int(response_started['status'].split(' ', 1)[0]), request.method)
+                has_length = any(name.lower() == 'content-length' for name, _ in headers)
+                chunked = has_body and not has_length and request.version == 'HTTP/1.1'
+                # Without a length or chunking, only closing the connection tells the client where the body ends.
+                keep_alive = request.keep_alive and (not has_body or has_length or chunked)
+
+                head = [f"HTTP/1.1 {response_started['status']}"]
+                head += [f"{name}: {value}" for name, value in headers]
+                if chunked:
+                    head.append("Transfer-Encoding: chunked")
+                head.append("Connection: keep-alive" if keep_alive else "Connection: close")
+                write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+
+                if has_body:
+                    for chunk in result:
+                        if chunk:
+                            write(b'%x\r\n%b\r\n' % (len(chunk), chunk) if chunked else chunk)
+                if chunked:
+                    write(b'0\r\n\r\n')
+                return keep_alive
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+
+        return await loop.run_in_executor(self.executor, run)
+
+    @staticmethod
+    async def _write(writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(data)
+        await writer.drain()
+
+    @staticmethod
+    def _environ(request: HTTPRequest, peer) -> dict:
+        host, _, port = (request.header('Host') or 'localhost').partition(':')
+        environ = {
+            'REQUEST_METHOD': request.method,
+            'SCRIPT_NAME': '',
+            'PATH_INFO': request.path,
+            'QUERY_STRING': request.query_string,
+            'SERVER_NAME': host,
+            'SERVER_PORT': port or '80',
+            'SERVER_PROTOCOL': request.version,
+            'REMOTE_ADDR': peer[0] if peer else '',
+            'CONTENT_LENGTH': str(len(request.body)) if request.body else '',
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(request.body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for name, value in request.headers:
+            key = name.upper().replace('-', '_')
+            if key == 'CONTENT_TYPE':
+                environ['CONTENT_TYPE'] = value
+            elif key not in ('CONTENT_LENGTH', 'TRANSFER_ENCODING'):
+                key = f'HTTP_{key}'
+                environ[key] = f"{environ[key]}, {value}" if key in environ else value
+        return environ
+
+    __repr__ = auto_repr
+
+
+def serve(app: Flask, host: str | None = None, port: int | None = None) -> None:
+    """Run the app under the asyncio server until interrupted."""
+    server = AsyncServer(
+        app,
+        broker=EventBroker(),
+        wsgi_threads=app.config['AIO_WSGI_THREADS'],
+        heartbeat_interval=app.config['SSE_HEARTBEAT_INTERVAL'],
+        max_body_size=app.config['AIO_MAX_BODY_SIZE'],
+    )
+    # A worker may serve nothing but SSE streams, which never run Flask's request hooks.
+    if (dispatcher := app.extensions.get('outbox_dispatcher')) is not None:
+        dispatcher.start_once()
+    try:
+        asyncio.run(server.serve_forever(host or app.config['AIO_HOST'], port or app.config['AIO_PORT']))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,210 @@
+"""shared_cache.py
+
+Cache tier shared by the worker processes of one host, kept in a SQLite file (ideally on a RAM-backed
+filesystem such as /dev/shm).
+"""
+
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Hashable, Tuple
+
+from app.cache.ttl_cache import MISSING
+from app.database.dialect import SQLiteDialect
+from app.utils.class_helpers import auto_repr
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS cache_generations (
+    key TEXT PRIMARY KEY,
+    gen INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Generation row bumped by `clear`; it counts towards the generation of every key.
+ALL_KEYS = ''
+
+# Sum of the key's generation and the `clear` generation: both only grow, so the sum changes with either.
+GENERATION = f"SELECT COALESCE(SUM(gen), 0) FROM cache_generations WHERE key IN (?, '{ALL_KEYS}')"
+
+_SQLITE = SQLiteDialect()
+BUMP_GENERATION = _SQLITE.translate(_SQLITE.upsert(
+    "cache_generations", ("key", "gen", "updated_at"), ("key",),
+    {"gen": "cache_generations.gen + 1", "updated_at": "excluded.updated_at"}))
+
+
+class SharedCache:
+    """
+    TTL cache visible to every process that opens the same file, so a row one worker loaded serves the others
+    and an invalidation in one worker reaches all of them.
+
+    Values are pickled, so the file is created readable by its owner only. The cache never fails the caller:
+    a lock timeout or an I/O error counts as a miss (or a skipped write) and is logged at debug level.
+
+    Every `delete` (and `clear`) bumps a generation, kept per key. A value loaded while another process
+    invalidated its key would be stale, so fills can be made conditional: read `generation(key)` before loading
+    and pass it to `set`, which stores nothing if the generation moved meanwhile. Generations of keys left
+    alone for `generation_ttl` seconds are forgotten, which lets through a fill whose load took longer.
+
+    Each thread uses its own connection; connections are not carried across `fork()`.
+    """
+
+    def __init__(self, path: str, max_size: int = 100000, timeout: float = 0.05, purge_every: int = 1000,
+                 generation_ttl: float = 300) -> None:
+        self.path = path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.purge_every = purge_every
+        self.generation_ttl = generation_ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._writes = 0
+        self._counter_lock = threading.Lock()
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._local = threading.local()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            os.close(fd)
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=wal")
+            conn.execute("PRAGMA synchronous=off")  # A cache: losing it in a crash is harmless
+            self._local.conn = conn
+        return conn
+
+    def _count(self, counter: str) -> None:
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get_with_ttl(self, key: Hashable) -> Tuple[Any, float] | object:
+        """Return `(value, seconds left)`, or `MISSING` if the key is absent, expired or the cache unavailable."""
+        try:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?", (str(key),)).fetchone()
+        except sqlite3.Error as e:
+            logger.debug(f"Shared cache read failed: {e}")
+            self._count('errors')
+            row = None
+        remaining = row[1] - time.time() if row is not None else 0
+        if remaining <= 0:
+            self._count('misses')
+            return MISSING
+        self._count('hits')
+        return pickle.loads(row[0]), remaining
+
+    def get(self, key: Hashable) -> Any:
+        entry = self.get_with_ttl(key)
+        return entry if entry is MISSING else entry[0]
+
+    def generation(self, key: Hashable) -> int | None:
+        """Invalidation count of `key`, to be passed back to `set`; `None` if the cache is unavailable."""
+        try:
+            return self._connection().execute(GENERATION, (str(key),)).fetchone()[0]
+        except sqlite3.Error as e:
+            logger.debug(f"Shared cache read failed: {e}")
+            self._count('errors')
+            return None
+
+    def set(self, key: Hashable, value: Any, ttl: float, generation: int | None = None) -> bool:
+        """
+        Store a value for `ttl` seconds.
+
+        Args:
+            generation (int | None): The `generation(key)` read before the value was loaded. If the key was
+                invalidated since, the value may be stale and is not stored.
+
+        Returns:
+            bool: Whether the value was stored.
+        """
+        params = (str(key), pickle.dumps(value, pickle.HIGHEST_PROTOCOL), time.time() + ttl)
+        try:
+            conn = self._connection()
+            if generation is None:
+                stored = conn.execute("INSERT OR REPLACE INTO cache_entries (key, value, expires_at) "
+                                      "VALUES (?, ?, ?)", params).rowcount
+            else:
+                # One statement, so the comparison and the write happen under the same write lock.
+                stored = conn.execute("INSERT OR REPLACE INTO cache_entries (key, value, expires_at) "
+                                      f"SELECT ?, ?, ? WHERE ({GENERATION}) = ?",
+                                      params + (str(key), generation)).rowcount
+            with self._counter_lock:
+                self._writes += 1
+                purge = self._writes % self.purge_every == 0
+            if purge:
+                self._purge(conn)
+            return stored > 0
+        except sqlite3.Error as e:
+            logger.debug(f"Shared cache write failed: {e}")
+            self._count('errors')
+            return False
+
+    def _purge(self, conn: sqlite3.Connection) -> None:
+        """Drop expired entries, then the ones closest to expiry beyond `max_size`, then stale generations."""
+        now = time.time()
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        conn.execute("DELETE FROM cache_entries WHERE key IN (SELECT key FROM cache_entries "
+                     "ORDER BY expires_at DESC LIMIT -1 OFFSET ?)", (self.max_size,))
+        conn.execute(f"DELETE FROM cache_generations WHERE updated_at <= ? AND key != '{ALL_KEYS}'",
+                     (now - self.generation_ttl,))
+
+    def _invalidate(self, key: str, delete: str, params: tuple) -> None:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(delete, params)
+            conn.execute(BUMP_GENERATION, (key, 1, time.time()))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def delete(self, key: Hashable) -> None:
+        try:
+            self._invalidate(str(key), "DELETE FROM cache_entries WHERE key = ?", (str(key),))
+        except sqlite3.Error as e:
+            # A stale entry would outlive the write, so this one is worth a warning.
+            logger.warning(f"Shared cache invalidation of {key!r} failed: {e}")
+            self._count('errors')
+
+    def clear(self) -> None:
+        try:
+            self._invalidate(ALL_KEYS, "DELETE FROM cache_entries", ())
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache clear failed: {e}")
+            self._count('errors')
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            size = self._connection().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        except sqlite3.Error:
+            size = None
+        with self._counter_lock:
+            lookups = self.hits + self.misses
+            return {
+                'path': self.path,
+                'size': size,
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+                'errors': self.errors,
+            }
+
+    __repr__ = auto_repr
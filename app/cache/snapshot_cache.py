@@ -0,0 +1,172 @@
+"""snapshot_cache.py
+
+Stale-while-revalidate cache of one expensive, pre-serialized result.
+"""
+
+import logging
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple
+
+from flask import Flask
+
+from app.utils.gzip_utils import deflate_segment
+from app.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    data: bytes
+    version: Any  # What the loader reported the data to reflect, e.g. a table version for ETags
+    loaded_at: float  # time.monotonic()
+    load_ms: float
+    deflated: bytes | None = None  # `data` as a raw deflate segment, see app/utils/gzip_utils.py
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.loaded_at
+
+
+class SnapshotCache:
+    """
+    Holds the latest `(data, version)` returned by `loader()` and serves it without running the loader again:
+
+    - younger than `soft_ttl`: served as is;
+    - between `soft_ttl` and `hard_ttl`: still served, while one background thread reloads it;
+    - older than `hard_ttl` (or never loaded, or invalidated): reloaded before it is served, with concurrent
+      callers sharing that one reload.
+
+    `invalidate()` drops the snapshot; a load that was already running when it was called still answers its own
+    callers, but is not kept. A failed background refresh is logged and the stale snapshot keeps being served
+    until `hard_ttl`.
+    The loader runs in an application context of `app`. With a `deflate_level`, each load also compresses the
+    data once for gzip responses (`Snapshot.deflated`).
+    """
+
+    def __init__(self, app: Flask, loader: Callable[[], Tuple[bytes, Any]], soft_ttl: float, hard_ttl: float,
+                 name: str = 'snapshot', deflate_level: int | None = None) -> None:
+        if soft_ttl > hard_ttl:
+            raise ValueError(f"soft_ttl ({soft_ttl}) must not exceed hard_ttl ({hard_ttl})")
+        self.app = app
+        self.loader = loader
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.name = name
+        self.deflate_level = deflate_level
+        self._snapshot: Snapshot | None = None
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._refreshing = False
+        # Bumped by `invalidate`; a load only stores its snapshot if it did not change while it ran.
+        self._generation = 0
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.sync_loads = 0
+        self.background_refreshes = 0
+        self.refresh_errors = 0
+        _snapshot_caches.add(self)
+
+    def _reset_after_fork(self) -> None:
+        # A refresh thread running at fork() does not exist in the child.
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def get(self) -> Snapshot:
+        snapshot = self._snapshot
+        age = snapshot.age if snapshot is not None else None
+        if age is None or age >= self.hard_ttl:
+            generation = self._generation
+            # Keyed by generation: callers arriving after an invalidation never join a load started before it.
+            return self._flight.do((self.name, generation), lambda: self._load_sync(generation))
+        with self._lock:
+            if age < self.soft_ttl:
+                self.fresh_hits += 1
+                return snapshot
+            self.stale_hits += 1
+            start_refresh = not self._refreshing
+            self._refreshing = True
+            generation = self._generation
+        if start_refresh:
+            threading.Thread(target=self._refresh, args=(generation,), name=f'{self.name}-refresh',
+                             daemon=True).start()
+        return snapshot
+
+    def invalidate(self) -> None:
+        """Drop the snapshot, so the next `get` reloads it; call after writing what it reflects."""
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+
+    def _load(self, generation: int) -> Snapshot:
+        started = time.perf_counter()
+        data, version = self.loader()
+        deflated = deflate_segment(data, self.deflate_level) if self.deflate_level is not None else None
+        load_ms = round((time.perf_counter() - started) * 1000, 3)
+        snapshot = Snapshot(data=data, version=version, loaded_at=time.monotonic(), load_ms=load_ms,
+                            deflated=deflated)
+        with self._lock:
+            if generation != self._generation:
+                logger.debug(f"Discarded {self.name} snapshot loaded across an invalidation")
+                return snapshot
+            self._snapshot = snapshot
+        logger.debug(f"Loaded {self.name} snapshot ({len(data)} bytes) in {load_ms} ms")
+        return snapshot
+
+    def _load_sync(self, generation: int) -> Snapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.age < self.hard_ttl:
+            return snapshot  # A refresh landed while this caller was getting here
+        with self._lock:
+            self.sync_loads += 1
+        return self._load(generation)
+
+    def _refresh(self, generation: int) -> None:
+        try:
+            with self.app.app_context():
+                self._load(generation)
+            with self._lock:
+                self.background_refreshes += 1
+        except Exception as e:
+            logger.error(f"Background refresh of the {self.name} snapshot failed: {e}")
+            with self._lock:
+                self.refresh_errors += 1
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        with self._lock:
+            return {
+                'soft_ttl': self.soft_ttl,
+                'hard_ttl': self.hard_ttl,
+                'bytes': len(snapshot.data) if snapshot is not None else None,
+                'deflated_bytes': len(snapshot.deflated) if snapshot is not None and snapshot.deflated else None,
+                'age': round(snapshot.age, 3) if snapshot is not None else None,
+                'load_ms': snapshot.load_ms if snapshot is not None else None,
+                'fresh_hits': self.fresh_hits,
+                'stale_hits': self.stale_hits,
+                'sync_loads': self.sync_loads,
+                'background_refreshes': self.background_refreshes,
+                'refresh_errors': self.refresh_errors,
+                'refreshing': self._refreshing,
+            }
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(name={self.name!r}, soft_ttl={self.soft_ttl}, hard_ttl={self.hard_ttl})"
+
+
+_snapshot_caches: weakref.WeakSet[SnapshotCache] = weakref.WeakSet()
+
+
+def _reset_snapshot_caches_after_fork() -> None:
+    for cache in list(_snapshot_caches):
+        cache._reset_after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_snapshot_caches_after_fork)
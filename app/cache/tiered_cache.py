@@ -0,0 +1,87 @@
+"""tiered_cache.py
+
+An in-process `TTLCache` in front of an optional host-wide `SharedCache`.
+"""
+
+from typing import Any, Dict, Hashable
+
+from app.cache.shared_cache import SharedCache
+from app.cache.ttl_cache import TTLCache, MISSING
+from app.utils.class_helpers import auto_repr
+
+
+class TieredCache:
+    """
+    Looks a key up in the local tier, then in the shared tier; a shared hit is copied into the local tier
+    for the rest of its lifetime. Writes and invalidations go to both tiers.
+
+    A fill is guarded in each tier by what was read before the load: the local `epoch` and the shared tier's
+    `generation(key)`, bumped by invalidations from any process on the host.
+
+    Examples:
+        >>> cache = TieredCache(TTLCache(max_size=1000, ttl=60), SharedCache('/dev/shm/app-users.cache'))
+        >>> epoch, generation = cache.epoch, cache.generation(42)
+        >>> user = load_user(42)
+        >>> cache.set(42, user, epoch=epoch, generation=generation)  # Skipped if 42 was invalidated meanwhile
+    """
+
+    def __init__(self, local: TTLCache, shared: SharedCache | None = None) -> None:
+        self.local = local
+        self.shared = shared
+
+    @property
+    def epoch(self) -> int:
+        """Invalidation counter of the local tier, to be passed back to `set`."""
+        return self.local.epoch
+
+    def generation(self, key: Hashable) -> int | None:
+        """Invalidation count of `key` in the shared tier, to be passed back to `set`."""
+        return self.shared.generation(key) if self.shared is not None else None
+
+    def get(self, key: Hashable) -> Any:
+        value = self.local.get(key)
+        if value is not MISSING or self.shared is None:
+            return value
+        entry = self.shared.get_with_ttl(key)
+        if entry is MISSING:
+            return MISSING
+        value, ttl = entry
+        self.local.set(key, value, ttl=min(ttl, self.local.ttl))
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None, epoch: int | None = None,
+            generation: int | None = None) -> bool:
+        """
+        Store a value in both tiers.
+
+        Args:
+            epoch (int | None): The `epoch` read before the value was loaded; see `TTLCache.set`.
+            generation (int | None): The `generation(key)` read before the value was loaded; see
+                `SharedCache.set`. A guarded fill (`epoch` given) without one skips the shared tier.
+
+        Returns:
+            bool: Whether the value was stored in the local tier.
+        """
+        if not self.local.set(key, value, ttl=ttl, epoch=epoch):
+            return False
+        if self.shared is not None and (epoch is None or generation is not None):
+            self.shared.set(key, value, ttl=self.local.ttl if ttl is None else ttl, generation=generation)
+        return True
+
+    def delete(self, key: Hashable, local_only: bool = False) -> None:
+        if self.shared is not None and not local_only:
+            self.shared.delete(key)
+        self.local.delete(key)
+
+    def clear(self, local_only: bool = False) -> None:
+        if self.shared is not None and not local_only:
+            self.shared.clear()
+        self.local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'local': self.local.stats(),
+            'shared': self.shared.stats() if self.shared is not None else None,
+        }
+
+    __repr__ = auto_repr
@@ -0,0 +1,130 @@
+"""ttl_cache.py
+
+Thread-safe in-process LRU cache with per-entry expiry.
+"""
+
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+# Returned by `get` for keys that are not cached, since `None` is a valid cached value (a negative lookup).
+MISSING = object()
+
+
+class TTLCache:
+    """
+    LRU cache whose entries also expire `ttl` seconds after they were stored.
+
+    Examples:
+        >>> cache = TTLCache(max_size=2, ttl=60)
+        >>> cache.set(1, 'a'); cache.set(2, 'b'); cache.get(1)
+        'a'
+        >>> cache.set(3, 'c')  # Evicts 2, the least recently used
+        >>> cache.get(2) is MISSING
+        True
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 60) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; see `set(..., epoch=)`.
+        self.epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        _caches.add(self)
+
+    def _reset_lock(self) -> None:
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or `MISSING` if the key is absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None, epoch: int | None = None) -> bool:
+        """
+        Store a value for `ttl` seconds (default: the cache's `ttl`).
+
+        Args:
+            epoch (int | None): The `epoch` read before the value was loaded. If an invalidation happened
+                since, the value may be stale and is not stored.
+
+        Returns:
+            bool: Whether the value was stored.
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if epoch is not None and epoch != self.epoch:
+                return False
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self.epoch += 1
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.epoch += 1
+            self.invalidations += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(max_size={self.max_size}, ttl={self.ttl}, size={len(self._entries)})"
+
+
+# Every cache not yet garbage collected, for the fork hook below (weakly, so caches can still be collected).
+_caches: weakref.WeakSet[TTLCache] = weakref.WeakSet()
+
+
+def _reset_caches_after_fork() -> None:
+    """A lock held by another thread at fork() would never be released in the child."""
+    for cache in list(_caches):
+        cache._reset_lock()
+
+
+os.register_at_fork(after_in_child=_reset_caches_after_fork)
@@ -0,0 +1,129 @@
+"""user_cache.py
+
+The user lookup cache (see `app.repository.cached_user_repository`) and the thread that keeps it in step with
+writes made by other workers.
+"""
+
+import logging
+import os
+import threading
+import weakref
+
+from flask import Flask
+
+from app.cache.shared_cache import SharedCache
+from app.cache.tiered_cache import TieredCache
+from app.cache.ttl_cache import TTLCache
+from app.events.broker import EventBroker, Subscription, SubscriptionClosed
+from app.events.event import Event
+from app.repository.user_repository import USERS_TOPIC
+from app.utils.class_helpers import auto_repr
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE = 'user_cache'
+
+
+class CacheInvalidator:
+    """
+    Background thread that evicts a user from both cache tiers whenever a `users` event reaches this
+    process, so writes made by other workers (delivered through the broker's transport) are not served
+    stale until their TTL runs out. A writer on this host has already invalidated both tiers itself, but
+    one elsewhere (or without a cache) has not touched this host's shared tier; evicting again costs a
+    write per worker and bumps the key's generation, which also turns away fills still in flight.
+
+    If the subscription loses events (dropped under backpressure, or closed), both tiers are cleared,
+    since there is no telling which keys changed.
+    """
+
+    def __init__(self, cache: TieredCache, broker: EventBroker, topic: str, poll_timeout: float = 1.0) -> None:
+        self.cache = cache
+        self.broker = broker
+        self.topic = topic
+        self.poll_timeout = poll_timeout
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._subscription: Subscription | None = None
+        self._inherited: Subscription | None = None
+        _invalidators.add(self)
+
+    def _restart_after_fork(self) -> None:
+        self._thread = None
+        # The child's copy of the broker still holds the parent's subscription; the new thread removes it.
+        self._inherited, self._subscription = self._subscription, None
+        if not self._stopped.is_set():
+            self._stopped = threading.Event()
+            self.start()
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='cache-invalidator', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        inherited, self._inherited = self._inherited, None
+        if inherited is not None:
+            self.broker.unsubscribe(inherited)
+        while not self._stopped.is_set():
+            subscription = self._subscription = self.broker.subscribe(self.topic)
+            dropped = 0
+            try:
+                while not self._stopped.is_set():
+                    event = subscription.get(timeout=self.poll_timeout)
+                    if subscription.dropped != dropped:
+                        dropped = subscription.dropped
+                        logger.warning(f"Cache invalidator missed events on '{self.topic}', clearing the cache")
+                        self.cache.clear()
+                    if event is not None:
+                        self.invalidate(event)
+            except SubscriptionClosed as e:
+                logger.warning(f"Cache invalidator subscription closed ({e}), clearing the cache")
+                self.cache.clear()
+            finally:
+                self.broker.unsubscribe(subscription)
+                self._subscription = None
+
+    def invalidate(self, event: Event) -> None:
+        try:
+            key = int(event.key)
+        except (TypeError, ValueError):
+            # Keyless events (e.g. "resync") may stand for any number of changes.
+            self.cache.clear()
+            return
+        self.cache.delete(key)
+
+    __repr__ = auto_repr
+
+
+def init_app(app: Flask) -> TieredCache | None:
+    """Build the user cache into `app.extensions['user_cache']` and start its invalidator."""
+    if not app.config['USER_CACHE_ENABLED']:
+        return None
+    shared_path = app.config['USER_CACHE_SHARED_PATH']
+    cache = TieredCache(
+        TTLCache(max_size=app.config['USER_CACHE_MAX_SIZE'], ttl=app.config['USER_CACHE_TTL']),
+        SharedCache(shared_path, max_size=app.config['USER_CACHE_SHARED_MAX_SIZE']) if shared_path else None,
+    )
+    invalidator = CacheInvalidator(cache, EventBroker(), USERS_TOPIC)
+    invalidator.start()
+    app.extensions[USER_CACHE] = cache
+    app.extensions['user_cache_invalidator'] = invalidator
+    return cache
+
+
+_invalidators: weakref.WeakSet[CacheInvalidator] = weakref.WeakSet()
+
+
+def _restart_invalidators_after_fork() -> None:
+    """Threads do not survive fork(): each child restarts the invalidators that were running."""
+    for invalidator in list(_invalidators):
+        invalidator._restart_after_fork()
+
+
+os.register_at_fork(after_in_child=_restart_invalidators_after_fork)
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from typing import TypeVar, List, Union, Type
 
 from app.core.base_model import BaseModel
+from app.core.converters import converter_registry
 
 DTOClass = TypeVar('DTOClass', bound='BaseDTO')
 
@@ -16,10 +17,16 @@ class BaseDTO(BaseModel):
     @classmethod
     def from_model(cls: Type[DTOClass], model: Union[BaseModel, List[BaseModel]], many: bool = False) \
             -> Union[DTOClass, List[DTOClass]]:
-        """Create a DTO instance or a list of DTO instances from a model or a list of models."""
+        """
+        Create a DTO instance or a list of DTO instances from a model or a list of models.
+        Conversions go through the converter compiled for the model's class and `cls`, see `ConverterRegistry`;
+        a list is expected to hold models of one class.
+        """
         if many:
             if isinstance(model, list):
-                return [cls._from_model(m) for m in model]
+                if not model:
+                    return []
+                return converter_registry.get(type(model[0]), cls).many(model)
             else:
                 raise ValueError("Expected a list of models.")
         else:
@@ -28,4 +35,4 @@ class BaseDTO(BaseModel):
     @classmethod
     def _from_model(cls: Type[DTOClass], model: BaseModel) -> DTOClass:
         """Convert a single model instance to a DTO instance."""
-        return cls.from_dict(model.to_dict())
+        return converter_registry.get(type(model), cls).convert(model)
@@ -6,7 +6,7 @@ from app.utils.class_helpers import auto_repr
 class BaseRepository(metaclass=abc.ABCMeta):
 
     @staticmethod
-    def map_to_model(row, model_cls, many=False):
-        return model_cls.from_row(row=row, many=many)
+    def map_to_model(row, model_cls, many=False, columns=None):
+        return model_cls.from_row(row=row, many=many, columns=columns)
 
     __repr__ = auto_repr
@@ -0,0 +1,77 @@
+import threading
+from dataclasses import fields
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Type
+
+
+class ModelConverter:
+    """
+    Builds instances of one DTO class from instances of one model class.
+
+    The DTO's constructor call is generated once, when the converter is compiled, and reads the fields both
+    classes share straight off the model: the model is neither turned into a dict (`asdict` deep-copies every
+    value) nor filtered against the DTO's fields per object. DTO fields the model lacks keep their defaults,
+    as with `from_dict`. Field values are passed by reference, not copied. Get one from `ConverterRegistry.get`.
+    """
+    __slots__ = ('model', 'dto', 'convert')
+
+    def __init__(self, model: type, dto: type, convert: Callable[[Any], Any] | None = None) -> None:
+        self.model = model
+        self.dto = dto
+        self.convert: Callable[[Any], Any] = convert or self._compile()
+
+    def _compile(self) -> Callable[[Any], Any]:
+        model_fields = {f.name for f in fields(self.model)}
+        shared = [f.name for f in fields(self.dto) if f.init and f.name in model_fields]
+        namespace = {'dto': self.dto}
+        exec(f"def convert(model):\n    return dto({', '.join(f'{name}=model.{name}' for name in shared)})", namespace)
+        return namespace['convert']
+
+    def __call__(self, model: Any) -> Any:
+        return self.convert(model)
+
+    def many(self, models: Sequence[Any]) -> List[Any]:
+        """Convert every model, in one pass."""
+        return list(map(self.convert, models))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(model={self.model.__name__}, dto={self.dto.__name__})"
+
+
+class ConverterRegistry:
+    """
+    Model-to-DTO converters keyed by `(model class, DTO class)`.
+
+    A pair without a registered converter gets one compiled on first use, copying the fields the two classes
+    share; `register` installs a hand-written conversion instead, e.g. for a DTO whose fields are named
+    differently or computed.
+
+    Examples:
+        >>> converter_registry.get(UserModel, UserResponse).many(users)
+        >>> converter_registry.register(UserModel, UserResponse, lambda user: UserResponse(id=user.id))
+    """
+
+    def __init__(self) -> None:
+        self._converters: Dict[Tuple[type, type], ModelConverter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: Type[Any], dto: Type[Any]) -> ModelConverter:
+        converter = self._converters.get((model, dto))
+        if converter is None:
+            with self._lock:
+                converter = self._converters.get((model, dto))
+                if converter is None:
+                    converter = self._converters[(model, dto)] = ModelConverter(model, dto)
+        return converter
+
+    def register(self, model: Type[Any], dto: Type[Any], convert: Callable[[Any], Any]) -> ModelConverter:
+        """Convert `model` instances to `dto` with `convert` from now on."""
+        converter = ModelConverter(model, dto, convert)
+        with self._lock:
+            self._converters[(model, dto)] = converter
+        return converter
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(converters={len(self._converters)})"
+
+
+converter_registry = ConverterRegistry()
@@ -1,31 +1,107 @@
-from dataclasses import fields
-from typing import TypeVar, Type, Dict, Any, Tuple, List
+from dataclasses import fields, MISSING
+from functools import lru_cache
+from itertools import starmap
+from typing import TypeVar, Type, Dict, Any, Tuple, List, Sequence, Iterable, Callable
 
 RowType = Dict[str, Any] | Tuple[Any, ...]
 ModelClass = TypeVar('ModelClass', bound='RowMapperMixin')
 
 
+class RowMapper:
+    """
+    Builds instances of one model from tuple rows whose columns come in a fixed order.
+
+    The constructor call is generated once, when the mapper is compiled, so mapping a row is a single call:
+    no per-row type checks, field lookups or intermediate dict. Get one from `RowMapperMixin.row_mapper`.
+    """
+    __slots__ = ('model', 'columns', 'map_row', '_positional')
+
+    def __init__(self, model: type, columns: Tuple[str, ...]) -> None:
+        model_fields = fields(model)
+        names = {f.name for f in model_fields}
+        unknown = [column for column in columns if column not in names]
+        if unknown:
+            raise ValueError(f"{model.__name__} has no fields {unknown}")
+        missing = [f.name for f in model_fields if f.name not in columns and f.init
+                   and f.default is MISSING and f.default_factory is MISSING]
+        if missing:
+            raise ValueError(f"Columns {columns} do not cover the required fields {missing} of {model.__name__}")
+        self.model = model
+        self.columns = columns
+        # Rows already in field order are passed straight through as positional arguments.
+        self._positional = columns == tuple(f.name for f in model_fields)
+        self.map_row: Callable[[Tuple[Any, ...]], Any] = self._compile()
+
+    def _compile(self) -> Callable[[Tuple[Any, ...]], Any]:
+        if self._positional:
+            model = self.model
+            return lambda row: model(*row)
+        position = {column: index for index, column in enumerate(self.columns)}
+        arguments = ', '.join(f"{f.name}=row[{position[f.name]}]" for f in fields(self.model) if f.name in position)
+        namespace = {'model': self.model}
+        exec(f"def map_row(row):\n    return model({arguments})", namespace)
+        return namespace['map_row']
+
+    def __call__(self, row: Tuple[Any, ...]) -> Any:
+        return self.map_row(row)
+
+    def many(self, rows: Iterable[Tuple[Any, ...]]) -> List[Any]:
+        """Map every row, e.g. the result of `fetch_all(..., as_tuples=True)`."""
+        if self._positional:
+            return list(starmap(self.model, rows))
+        return list(map(self.map_row, rows))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(model={self.model.__name__}, columns={self.columns})"
+
+
+@lru_cache(maxsize=None)
+def _compiled_mapper(model: type, columns: Tuple[str, ...]) -> RowMapper:
+    return RowMapper(model, columns)
+
+
+@lru_cache(maxsize=None)
+def _field_names(model: type) -> Tuple[str, ...]:
+    return tuple(f.name for f in fields(model))
+
+
 class RowMapperMixin:
     """
     Mixin for converting model instances from database rows (tuples/dictionaries).
     """
 
+    @classmethod
+    def row_mapper(cls: Type[ModelClass], columns: Sequence[str] | None = None) -> RowMapper:
+        """
+        The compiled mapper for tuple rows with `columns` (default: the model's fields, in order).
+        Mappers are compiled on first use and cached per model and column order.
+        """
+        return _compiled_mapper(cls, tuple(columns) if columns is not None else _field_names(cls))
+
     @classmethod
     def _from_row(cls: Type[ModelClass], row: RowType) -> ModelClass:
         """Create a model instance from a dictionary or tuple."""
         if isinstance(row, dict):
             return cls(**row)
         elif isinstance(row, tuple):
-            if len(row) != len(fields(cls)):
+            if len(row) != len(_field_names(cls)):
                 raise ValueError("Tuple length does not match the number of model fields.")
             return cls(*row)
         raise TypeError("Unexpected type for row data.")
 
     @classmethod
-    def from_row(cls: Type[ModelClass], row: RowType, many: bool = False) -> ModelClass | List[ModelClass]:
-        """Create a model instance or a list of model instances from row data."""
+    def from_row(cls: Type[ModelClass], row: RowType, many: bool = False,
+                 columns: Sequence[str] | None = None) -> ModelClass | List[ModelClass]:
+        """
+        Create a model instance or a list of model instances from row data.
+        With `columns`, rows are tuples in that column order and go through the compiled `row_mapper`.
+        """
         if many:
-            if isinstance(row, list):
-                return [cls._from_row(r) for r in row]
-            raise ValueError("Expected a list of rows.")
+            if not isinstance(row, list):
+                raise ValueError("Expected a list of rows.")
+            if columns is not None:
+                return cls.row_mapper(columns).many(row)
+            return [cls._from_row(r) for r in row]
+        if columns is not None:
+            return cls.row_mapper(columns).map_row(row)
         return cls._from_row(row)
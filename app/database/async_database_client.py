@@ -0,0 +1,68 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Tuple, List, Union, AsyncContextManager
+
+from app.database.dialect import Dialect
+from app.utils.class_helpers import auto_repr
+
+
+class AsyncDatabaseClient(ABC):
+    """Awaitable counterpart of `DatabaseClient`, for use from `async def` views and services."""
+
+    def __init__(self, connection_str: str, dialect: Dialect | None = None) -> None:
+        self.connection_str = connection_str
+        self.dialect: Dialect = dialect or Dialect()
+
+    @abstractmethod
+    def connect(self) -> None:
+        """Prepare the client. Connections may be opened lazily on first use."""
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        """Close the connections to the database."""
+        pass
+
+    @abstractmethod
+    async def execute(self, query: str, params: Tuple[Any, ...] = ()) -> int:
+        """Execute a query with optional parameters and return the number of affected rows."""
+        pass
+
+    @abstractmethod
+    async def execute_returning(self, query: str, params: Tuple[Any, ...] = ()) -> Union[Dict[str, Any], None]:
+        """Execute a data-modifying statement with a `RETURNING` clause and return the first returned row."""
+        pass
+
+    @abstractmethod
+    async def fetch_all(self, query: str, params: Tuple[Any, ...] = (),
+                        as_tuples: bool = False) -> List[Union[Dict[str, Any], Tuple[Any, ...]]]:
+        """Fetch all rows from a query, as plain tuples in column order with `as_tuples=True`."""
+        pass
+
+    @abstractmethod
+    async def fetch_one(self, query: str, params: Tuple[Any, ...] = (),
+                        as_tuples: bool = False) -> Union[Dict[str, Any], Tuple[Any, ...], None]:
+        """Fetch one row from a query, as a tuple with `as_tuples=True`."""
+        pass
+
+    @abstractmethod
+    def transaction(self) -> AsyncContextManager['AsyncDatabaseClient']:
+        """
+        Run the enclosed statements in a single transaction (`async with db.transaction():`).
+        Statements executed inside the block are committed together on success and rolled back on error.
+        Nested blocks join the outer transaction.
+        """
+        pass
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool statistics, for clients that pool connections."""
+        return {}
+
+    def warm_up(self) -> None:
+        """Open the connections the client keeps ready, so the first request does not pay for them."""
+        self.connect()
+
+    def reset_after_fork(self) -> None:
+        """Forget connections inherited from the parent process, see `DatabaseClient.reset_after_fork`."""
+        pass
+
+    __repr__ = auto_repr
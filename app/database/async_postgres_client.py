@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Tuple, List, Union, Any, Dict, AsyncIterator, Callable, Awaitable, TypeVar
+
+from psycopg import AsyncConnection, DatabaseError
+from psycopg.rows import tuple_row
+from psycopg_pool import AsyncConnectionPool, PoolTimeout, TooManyRequests
+
+from app.aio.background_loop import BackgroundLoop
+from app.database.async_database_client import AsyncDatabaseClient
+from app.database.database_client import PoolExhaustedError
+from app.database.dialect import PostgresDialect
+from app.database.postgres_client import DictRowFactory
+from app.utils.histogram import Histogram
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class AsyncPostgresClient(AsyncDatabaseClient):
+    """
+    PostgreSQL client on top of `psycopg_pool.AsyncConnectionPool`.
+
+    The pool lives on the process-wide `BackgroundLoop` and every statement runs there, so the client can
+    be awaited from any event loop (a Flask worker running an async view, an ASGI server, a script's
+    `asyncio.run`). Async views run on that loop directly (see `BackgroundLoop.async_to_sync`), in which
+    case no hop between loops is needed at all. Like `PostgresClient`, connections run in autocommit mode
+    and `transaction()` pins one connection to the current task. Pool sizing and overload behaviour are
+    configured like `PostgresClient`'s.
+    """
+
+    def __init__(self, connection_str: str, timeout: float = 5, min_size: int = 4, max_size: int | None = None,
+                 max_waiting: int = 0, max_idle: float = 600, max_lifetime: float = 3600,
+                 loop: 'BackgroundLoop | None' = None) -> None:
+        super().__init__(connection_str, dialect=PostgresDialect())
+        self.timeout: float = timeout
+        self.min_size: int = min_size
+        self.max_size: int = max_size or min_size
+        self.max_waiting: int = max_waiting
+        self.max_idle: float = max_idle
+        self.max_lifetime: float = max_lifetime
+        self.wait_histogram: Histogram = Histogram()
+        self.loop = loop or BackgroundLoop()
+        self.pool: AsyncConnectionPool | None = None
+        self._opened: bool = False
+        self._open_lock: asyncio.Lock | None = None
+        # Connection pinned by an open `transaction()` block in the current task.
+        self._transaction_conn: ContextVar[AsyncConnection | None] = ContextVar(
+            f"async_pg_transaction_{id(self)}", default=None)
+
+    def connect(self) -> None:
+        """Create the connection pool. It is opened on the background loop by the first statement."""
+        if self.pool is None:
+            self.pool = AsyncConnectionPool(
+                conninfo=self.connection_str,
+                min_size=self.min_size,
+                max_size=self.max_size,
+                max_waiting=self.max_waiting,
+                max_idle=self.max_idle,
+                max_lifetime=self.max_lifetime,
+                timeout=self.timeout,
+                kwargs={"autocommit": True},
+                open=False,
+            )
+
+    async def _open(self) -> None:
+        # Runs on the background loop only; the lock makes concurrent first statements wait for one open.
+        if self._opened:
+            return
+        if self._open_lock is None:
+            self._open_lock = asyncio.Lock()
+        async with self._open_lock:
+            if self._opened:
+                return
+            if self.pool is None:
+                raise RuntimeError("No connection established.")
+            try:
+                await self.pool.open(wait=True, timeout=self.timeout)
+            except Exception as e:
+                logger.error(f"Failed to initialize async PostgreSQL connection pool: {e}")
+                raise ConnectionError("Could not establish connection to PostgreSQL.")
+            self._opened = True
+            logger.info("Successfully initialized async PostgreSQL connection pool")
+
+    async def _checkout(self) -> AsyncConnection:
+        await self._open()
+        started = time.perf_counter()
+        try:
+            return await self.pool.getconn()
+        except (PoolTimeout, TooManyRequests) as e:
+            raise PoolExhaustedError(str(e)) from e
+        finally:
+            self.wait_histogram.observe((time.perf_counter() - started) * 1000)
+
+    async def _run(self, operation: Callable[[AsyncConnection], Awaitable[T]]) -> T:
+        """Run `operation` on the background loop with the pinned connection or a pooled one."""
+        pinned = self._transaction_conn.get()
+
+        async def run() -> T:
+            if pinned is not None:
+                return await operation(pinned)
+            conn = await self._checkout()
+            try:
+                return await operation(conn)
+            finally:
+                await self.pool.putconn(conn)
+
+        return await self.loop.call(run())
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator['AsyncPostgresClient']:
+        """Pin one pooled connection for the enclosed statements and commit them together."""
+        if self._transaction_conn.get() is not None:
+            yield self
+            return
+
+        async def begin() -> AsyncConnection:
+            conn = await self._checkout()
+            try:
+                await conn.execute("BEGIN")
+            except BaseException:
+                await self.pool.putconn(conn)
+                raise
+            return conn
+
+        async def end(conn: AsyncConnection, statement: str) -> None:
+            try:
+                await conn.execute(statement)
+            finally:
+                await self.pool.putconn(conn)
+
+        conn = await self.loop.call(begin())
+        token = self._transaction_conn.set(conn)
+        try:
+            yield self
+        except BaseException:
+            self._transaction_conn.reset(token)
+            await self.loop.call(end(conn, "ROLLBACK"))
+            raise
+        self._transaction_conn.reset(token)
+        await self.loop.call(end(conn, "COMMIT"))
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._transaction_conn.get() is not None
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Same shape as `PostgresClient.pool_stats()`."""
+        stats: Dict[str, Any] = {'pool_min': self.min_size, 'pool_max': self.max_size,
+                                 'max_waiting': self.max_waiting}
+        if self.pool is not None:
+            stats.update(self.pool.get_stats())
+        stats['wait_ms'] = self.wait_histogram.snapshot()
+        return stats
+
+    def warm_up(self) -> None:
+        """Open the pool on the background loop and wait until its `min_size` connections are established."""
+        self.connect()
+        self.loop.run(self._open())
+
+    def reset_after_fork(self) -> None:
+        # The pool belongs to the parent's background loop, which does not exist in the child.
+        self.pool, self._opened, self._open_lock = None, False, None
+        self._transaction_conn.set(None)
+        self.wait_histogram = Histogram()
+
+    def close(self) -> None:
+        """Close the connection pool."""
+        if self.pool is not None and self._opened:
+            self.loop.run(self.pool.close())
+            self.pool, self._opened = None, False
+            logger.info("Closed all connections in the async PostgreSQL pool")
+
+    async def execute(self, query: str, params: Tuple[Any, ...] = ()) -> int:
+        """Execute a query with optional parameters."""
+
+        async def operation(conn: AsyncConnection) -> int:
+            cursor = await conn.execute(query, params or ())
+            return cursor.rowcount
+
+        try:
+            return await self._run(operation)
+        except DatabaseError as e:
+            logger.error(f"Error executing query: {e}")
+            raise
+
+    async def execute_returning(self, query: str, params: Tuple[Any, ...] = ()) -> Union[Dict[str, Any], None]:
+        """Execute a statement with a RETURNING clause and return its first row."""
+
+        async def operation(conn: AsyncConnection) -> Union[Dict[str, Any], None]:
+            async with conn.cursor(row_factory=DictRowFactory) as cursor:
+                await cursor.execute(query, params or ())
+                return await cursor.fetchone()
+
+        try:
+            return await self._run(operation)
+        except DatabaseError as e:
+            logger.error(f"Error executing query: {e}")
+            raise
+
+    async def fetch_all(self, query: str, params: Tuple[Any, ...] = (),
+                        as_tuples: bool = False) -> List[Union[Dict[str, Any], Tuple[Any, ...]]]:
+        """Fetch all rows from a query."""
+
+        async def operation(conn: AsyncConnection) -> List[Union[Dict[str, Any], Tuple[Any, ...]]]:
+            async with conn.cursor(row_factory=tuple_row if as_tuples else DictRowFactory) as cursor:
+                await cursor.execute(query, params)
+                return await cursor.fetchall()
+
+        try:
+            return await self._run(operation)
+        except DatabaseError as e:
+            logger.error(f"Error fetching all rows: {e}")
+            raise
+
+    async def fetch_one(self, query: str, params: Tuple[Any, ...] = (),
+                        as_tuples: bool = False) -> Union[Dict[str, Any], Tuple[Any, ...], None]:
+        """Fetch one row from a query."""
+
+        async def operation(conn: AsyncConnection) -> Union[Dict[str, Any], Tuple[Any, ...], None]:
+            async with conn.cursor(row_factory=tuple_row if as_tuples else DictRowFactory) as cursor:
+                await cursor.execute(query, params)
+                return await cursor.fetchone()
+
+        try:
+            return await self._run(operation)
+        except DatabaseError as e:
+            logger.error(f"Error fetching one row: {e}")
+            raise
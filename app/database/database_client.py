@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from enum import Enum
-from typing import Any, Dict, Tuple, List, Union
+from typing import Any, Dict, Tuple, List, Union, ContextManager, Iterator, Iterable, Sequence
 
+from app.database.dialect import Dialect
 from app.utils.class_helpers import auto_repr
 
 
@@ -11,11 +13,18 @@ class DatabaseType(Enum):
     ORACLE = 'oracle'
 
 
+class PoolExhaustedError(Exception):
+    """
+    No connection could be handed out in time: the pool's wait queue is full, or the wait timed out.
+    Driver-neutral, so callers can shed load without importing any driver.
+    """
+
+
 class DatabaseClient(ABC):
-    def __init__(self, connection_str: str) -> None:
+    def __init__(self, connection_str: str, dialect: Dialect | None = None) -> None:
         self.connection_str = connection_str
-        self.connection = None
-        self.cursor = None
+        # Statements are written with `%s` placeholders; the dialect adapts them to the driver.
+        self.dialect: Dialect = dialect or Dialect()
 
     @abstractmethod
     def connect(self) -> None:
@@ -33,13 +42,84 @@ class DatabaseClient(ABC):
         pass
 
     @abstractmethod
-    def fetch_all(self, query: str, params: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
-        """Fetch all rows from a query."""
+    def execute_returning(self, query: str, params: Tuple[Any, ...] = ()) -> Union[Dict[str, Any], None]:
+        """
+        Execute a data-modifying statement with a `RETURNING` clause and return the first returned row.
+        Commits unless called inside `transaction()`, so the write and its result take a single round trip.
+        """
+        pass
+
+    @abstractmethod
+    def bulk_insert(self, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Insert many rows into `table` using the fastest path the backend offers.
+        Commits unless called inside `transaction()`.
+
+        Returns:
+            int: The number of rows written.
+        """
+        pass
+
+    @abstractmethod
+    def fetch_all(self, query: str, params: Tuple[Any, ...] = (),
+                  as_tuples: bool = False) -> List[Union[Dict[str, Any], Tuple[Any, ...]]]:
+        """
+        Fetch all rows from a query.
+        With `as_tuples=True` rows are plain tuples in column order, e.g. for a compiled `RowMapper`.
+        """
+        pass
+
+    @abstractmethod
+    def fetch_one(self, query: str, params: Tuple[Any, ...] = (),
+                  as_tuples: bool = False) -> Union[Dict[str, Any], Tuple[Any, ...], None]:
+        """Fetch one row from a query, as a tuple with `as_tuples=True`."""
+        pass
+
+    @abstractmethod
+    def stream(self, query: str, params: Tuple[Any, ...] = (), chunk_size: int = 1000,
+               as_tuples: bool = False) -> Iterator[Union[Dict[str, Any], Tuple[Any, ...]]]:
+        """
+        Lazily iterate over the rows of a query, fetching `chunk_size` rows at a time,
+        so memory stays bounded however large the result is.
+        The connection is held until the iterator is exhausted or closed.
+        With `as_tuples=True` rows are yielded as plain tuples in column order, skipping the per-row dict.
+        """
         pass
 
     @abstractmethod
-    def fetch_one(self, query: str, params: Tuple[Any, ...] = ()) -> Union[Dict[str, Any], None]:
-        """Fetch one row from a query."""
+    def transaction(self) -> ContextManager['DatabaseClient']:
+        """
+        Run the enclosed statements in a single transaction.
+        Statements executed inside the block are committed together on success and rolled back on error.
+        Nested blocks join the outer transaction.
+        """
+        pass
+
+    def execute_script(self, script: str) -> None:
+        """Execute several `;`-separated statements without parameters, e.g. a schema file."""
+        self.execute(script)
+
+    @contextmanager
+    def session(self) -> Iterator['DatabaseClient']:
+        """
+        Scope a unit of work, e.g. one HTTP request: clients with a connection pool reuse a single
+        connection for every statement in the block instead of checking one out per statement.
+        """
+        yield self
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool statistics, for clients that pool connections."""
+        return {}
+
+    def warm_up(self) -> None:
+        """Open the connections the client keeps ready, so the first request does not pay for them."""
+        self.connect()
+
+    def reset_after_fork(self) -> None:
+        """
+        Forget connections inherited from the parent process, without closing them (that would close them
+        for the parent too). The next `connect()` opens the child's own.
+        """
         pass
 
     def __enter__(self):
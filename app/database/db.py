@@ -1,30 +1,113 @@
+import importlib
+import os
+import threading
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, Sequence, Tuple
+
 import click
-from flask import g, current_app
+from flask import g, current_app, has_request_context, Flask
 from werkzeug.local import LocalProxy
 
+from app.database.async_database_client import AsyncDatabaseClient
 from app.database.database_client import DatabaseClient, DatabaseType
-from app.database.postgres_client import PostgresClient
-from app.database.sqlite_client import SQLiteClient
+from app.utils.startup import register_warm_up_hook
+
+# Client classes by database type, imported on first use so that only the drivers of the databases
+# actually used are loaded (psycopg alone adds tens of milliseconds to start-up).
+CLIENT_CLASSES = {
+    DatabaseType.POSTGRES: 'app.database.postgres_client.PostgresClient',
+    DatabaseType.SQLITE: 'app.database.sqlite_client.SQLiteClient',
+    # DatabaseType.ORACLE: 'app.database.oracle_client.OracleClient',  # Uncomment when OracleClient is implemented
+}
+ASYNC_CLIENT_CLASSES = {
+    DatabaseType.POSTGRES: 'app.database.async_postgres_client.AsyncPostgresClient',
+}
+
+# One client per (client class, connection string) in this process, shared by every thread.
+_clients: Dict[Tuple[str, ...], Any] = {}
+_clients_lock = threading.RLock()  # Reentrant: a routing client creates its member clients
+
+
+def _client_class(path: str) -> type:
+    module_name, _, class_name = path.rpartition('.')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _get_or_create_client(key: Tuple[str, ...], factory: Callable[[], Any]) -> Any:
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = factory()
+    return client
 
 
-# from app.database.oracle_client import OracleClient
+def _reset_clients_after_fork() -> None:
+    """Pools opened before a pre-forking server forks must not be shared: each child opens its own."""
+    global _clients_lock
+    _clients_lock = threading.RLock()
+    for client in _clients.values():
+        client.reset_after_fork()
 
 
-def create_database_client(db_type: DatabaseType, connection_str: str) -> DatabaseClient:
-    """Factory method to get the appropriate database client based on the database type."""
-    if db_type == DatabaseType.POSTGRES:
-        return PostgresClient(connection_str=connection_str)
-    elif db_type == DatabaseType.SQLITE:
-        return SQLiteClient(connection_str=connection_str)
-    # elif db_type == DatabaseType.ORACLE:
-    #     return OracleClient(connection_str=connection_str)
-    else:
+os.register_at_fork(after_in_child=_reset_clients_after_fork)
+
+
+def create_database_client(db_type: DatabaseType, connection_str: str, **options) -> DatabaseClient:
+    """
+    Factory method to get the appropriate database client based on the database type.
+    Clients are shared per connection string, so every call for the same database returns the same pool.
+    `options` are passed on to the client when it is created, see `Config.DATABASE_OPTIONS`.
+    """
+    if db_type not in CLIENT_CLASSES:
         raise ValueError(f"Unsupported database type: {db_type}")
+    path = CLIENT_CLASSES[db_type]
+    return _get_or_create_client((path, connection_str),
+                                 lambda: _client_class(path)(connection_str=connection_str, **options))
+
+
+def create_routing_client(db_type: DatabaseType, connection_str: str, replica_strs: Sequence[str],
+                          strategy: str = 'round_robin', **options) -> DatabaseClient:
+    """
+    Wrap the primary `connection_str` and its replicas in a `RoutingDatabaseClient`
+    (writes to the primary, reads to the replicas). Each pool is shared like `create_database_client`'s.
+    """
+    from app.database.routing_client import RoutingDatabaseClient
+
+    def factory() -> RoutingDatabaseClient:
+        return RoutingDatabaseClient(
+            primary=create_database_client(db_type, connection_str, **options),
+            replicas=[create_database_client(db_type, replica_str, **options) for replica_str in replica_strs],
+            strategy=strategy,
+        )
+
+    return _get_or_create_client(('routing', connection_str, *replica_strs, strategy), factory)
+
+
+def create_async_database_client(db_type: DatabaseType, connection_str: str, **options) -> AsyncDatabaseClient:
+    """Factory method for the awaitable clients used by `DATA_ACCESS_MODE = "async"`."""
+    if db_type not in ASYNC_CLIENT_CLASSES:
+        raise ValueError(f"No async client for database type: {db_type}")
+    path = ASYNC_CLIENT_CLASSES[db_type]
+    return _get_or_create_client((path, connection_str),
+                                 lambda: _client_class(path)(connection_str=connection_str, **options))
 
 
 def init_app(app):
     # app.teardown_appcontext(close_db)
+    app.teardown_request(end_db_sessions)
     app.cli.add_command(init_db_command)
+    register_warm_up_hook(app, warm_up_databases)
+
+
+def warm_up_databases(app: Flask) -> None:
+    """Import the drivers and open the pools the repositories use, in the calling (worker) process."""
+    with app.app_context():
+        db_type = DatabaseType(app.config['REPOSITORY_DATABASE'])
+        get_db(db_type).warm_up()
+        if app.config['DATA_ACCESS_MODE'] == 'async':
+            get_async_db(db_type).warm_up()
 
 
 def get_db(db_type: DatabaseType) -> DatabaseClient:
@@ -34,13 +117,46 @@ def get_db(db_type: DatabaseType) -> DatabaseClient:
 
     if db_type.value not in g.db_clients:
         conn_str = current_app.config['DATABASES'][db_type.value]
-        db_client = create_database_client(db_type, conn_str)
+        options = current_app.config.get('DATABASE_OPTIONS', {}).get(db_type.value, {})
+        replica_strs = current_app.config.get('DATABASE_REPLICAS', {}).get(db_type.value)
+        if replica_strs:
+            db_client = create_routing_client(db_type, conn_str, replica_strs,
+                                              strategy=current_app.config['DATABASE_READ_ROUTING'], **options)
+        else:
+            db_client = create_database_client(db_type, conn_str, **options)
         g.db_clients[db_type.value] = db_client
         db_client.connect()
+        if has_request_context():
+            # Unit of work: the request reuses one connection per database, released in `end_db_sessions`.
+            if 'db_sessions' not in g:
+                g.db_sessions = ExitStack()
+            g.db_sessions.enter_context(db_client.session())
 
     return g.db_clients[db_type.value]
 
 
+def get_async_db(db_type: DatabaseType) -> AsyncDatabaseClient:
+    """Retrieve the async database client based on the database type, creating it if necessary."""
+    if 'async_db_clients' not in g:
+        g.async_db_clients = {}
+
+    if db_type.value not in g.async_db_clients:
+        conn_str = current_app.config['DATABASES'][db_type.value]
+        options = current_app.config.get('DATABASE_OPTIONS', {}).get(db_type.value, {})
+        db_client = create_async_database_client(db_type, conn_str, **options)
+        g.async_db_clients[db_type.value] = db_client
+        db_client.connect()
+
+    return g.async_db_clients[db_type.value]
+
+
+def end_db_sessions(error=None):
+    """Return the connections pinned by the request to their pools."""
+    db_sessions = g.pop('db_sessions', None)
+    if db_sessions is not None:
+        db_sessions.close()
+
+
 def close_db(error=None):
     """Closes all database connections."""
     db_clients = g.pop('db_clients', {})
@@ -49,23 +165,32 @@ def close_db(error=None):
 
 
 @click.command('init-db')
-def init_db_command():
-    """Initialize the databases with the schema defined in schema.sql."""
-    init_db()
+@click.option('--replicas', is_flag=True,
+              help="Also load the schema into DATABASE_REPLICAS (local setups without real replication).")
+def init_db_command(replicas):
+    """Initialize the databases with the schema defined in <db_type>_schema.sql."""
+    init_db(replicas=replicas)
     click.echo('Initialized the databases.')
 
 
-def init_db():
-    """Initialize all databases with the schema defined in schema.sql."""
-    for db_type in DatabaseType:
-        db = get_db(db_type)
-        schema_path = f'{db_type.value}_schema.sql'
-        if current_app.open_resource(schema_path, mode='r').read():
-            with current_app.open_resource(schema_path, mode='r') as f:
-                db.execute(f.read())  # Adjust method based on how schema is applied
+def init_db(replicas: bool = False):
+    """Initialize every configured database with the schema defined in <db_type>_schema.sql."""
+    for db_name in current_app.config['DATABASES']:
+        db = get_db(DatabaseType(db_name))
+        with current_app.open_resource(f'{db_name}_schema.sql', mode='r') as f:
+            script = f.read()
+        db.execute_script(script)
+        if replicas:
+            options = current_app.config.get('DATABASE_OPTIONS', {}).get(db_name, {})
+            for replica_str in current_app.config.get('DATABASE_REPLICAS', {}).get(db_name, ()):
+                replica = create_database_client(DatabaseType(db_name), replica_str, **options)
+                replica.connect()
+                replica.execute_script(script)
 
 
 # Direct access proxies
+repository_db = LocalProxy(lambda: get_db(DatabaseType(current_app.config['REPOSITORY_DATABASE'])))
+async_repository_db = LocalProxy(lambda: get_async_db(DatabaseType(current_app.config['REPOSITORY_DATABASE'])))
 pg_db = LocalProxy(lambda: get_db(DatabaseType.POSTGRES))
 sqlite_db = LocalProxy(lambda: get_db(DatabaseType.SQLITE))
 # ora_db = LocalProxy(lambda: get_db(DatabaseType.ORACLE))  # Uncomment when OracleClient is implemented
@@ -0,0 +1,88 @@
+"""dialect.py
+
+SQL differences between the supported backends.
+
+Repositories write their statements once, in the `%s` placeholder style, and stick to SQL both backends
+understand; each `DatabaseClient` carries a `Dialect` that rewrites statements for its driver and tells the
+repositories which optional clauses (row locks, RETURNING) are available. Translations are cached per
+query string, so after the first call a statement costs one dictionary lookup.
+"""
+
+import re
+import sqlite3
+from functools import lru_cache
+from typing import Mapping, Sequence
+
+# Quoted literals and identifiers are matched first so placeholders inside them are left alone.
+_PLACEHOLDER_TOKENS = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|%%|%s")
+
+
+class Dialect:
+    name: str = 'generic'
+    placeholder: str = '%s'
+    supports_returning: bool = True
+    # Appended to a SELECT that claims rows, so concurrent workers skip rows another one holds.
+    skip_locked: str = ''
+
+    def __init__(self, cache_size: int = 1024) -> None:
+        self.translate = lru_cache(maxsize=cache_size)(self._translate)
+
+    def _translate(self, query: str) -> str:
+        """Rewrite a `%s`-style statement for this backend's driver."""
+        return query
+
+    def placeholders(self, count: int) -> str:
+        """Comma-separated placeholders for an `IN (...)` list or a VALUES row."""
+        return ', '.join(['%s'] * count)
+
+    def upsert(self, table: str, columns: Sequence[str], conflict_columns: Sequence[str],
+               update_columns: Sequence[str] | Mapping[str, str] | None = None) -> str:
+        """
+        Build an `INSERT ... ON CONFLICT` statement (`%s` style).
+
+        Args:
+            table (str): Target table.
+            columns (Sequence[str]): Inserted columns, in parameter order.
+            conflict_columns (Sequence[str]): Columns of the unique constraint that detects the conflict.
+            update_columns (Sequence[str] | Mapping[str, str] | None): Columns overwritten on conflict with the
+                inserted value, or a mapping of column to the SQL expression assigned to it (e.g. a counter
+                increment). Defaults to every inserted column outside the conflict target; an empty value
+                means `DO NOTHING`.
+        """
+        if update_columns is None:
+            update_columns = [column for column in columns if column not in conflict_columns]
+        if not isinstance(update_columns, Mapping):
+            update_columns = {column: f"excluded.{column}" for column in update_columns}
+        action = ("DO UPDATE SET " + ', '.join(f"{column} = {expression}"
+                                               for column, expression in update_columns.items())
+                  if update_columns else "DO NOTHING")
+        return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({self.placeholders(len(columns))}) "
+                f"ON CONFLICT ({', '.join(conflict_columns)}) {action}")
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(name={self.name!r})"
+
+
+class PostgresDialect(Dialect):
+    name = 'postgres'
+    skip_locked = 'FOR UPDATE SKIP LOCKED'
+
+
+class SQLiteDialect(Dialect):
+    name = 'sqlite'
+    placeholder = '?'
+    supports_returning = sqlite3.sqlite_version_info >= (3, 35, 0)
+    # SQLite locks the whole database for the writer (BEGIN IMMEDIATE), so claims never overlap anyway.
+    skip_locked = ''
+
+    def _translate(self, query: str) -> str:
+        return _PLACEHOLDER_TOKENS.sub(_sqlite_token, query)
+
+
+def _sqlite_token(match: re.Match) -> str:
+    token = match.group()
+    if token == '%s':
+        return '?'
+    if token == '%%':
+        return '%'
+    return token
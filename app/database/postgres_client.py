@@ -1,14 +1,18 @@
 import logging
-from contextlib import contextmanager
-from typing import Tuple, List, Union, Any, Dict, Sequence
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Tuple, List, Union, Any, Dict, Sequence, Iterator, Iterable
 
-from psycopg import OperationalError, DatabaseError, Cursor
-from psycopg.rows import RowFactory
-from psycopg_pool import ConnectionPool
+from psycopg import OperationalError, DatabaseError, Cursor, Connection, sql
+from psycopg.rows import RowFactory, tuple_row
+from psycopg_pool import ConnectionPool, PoolTimeout, TooManyRequests
 
-from app.database.database_client import DatabaseClient
-from app.utils.logging_utils import log
-from app.utils.singleton_decorator import singleton
+from app.database.database_client import DatabaseClient, PoolExhaustedError
+from app.database.dialect import PostgresDialect
+from app.utils.histogram import Histogram
 
 logger = logging.getLogger(__name__)
 
@@ -25,73 +29,254 @@ class DictRowFactory(RowFactory[Any]):
         return dict(zip(self.fields, values))
 
 
-@singleton
+class _Session:
+    """Connection pinned to a `session()` block; checked out of the pool on first use only."""
+    __slots__ = ('conn',)
+
+    def __init__(self) -> None:
+        self.conn: Connection | None = None
+
+
 class PostgresClient(DatabaseClient):
-    def __init__(self, connection_str: str, timeout: int = 5, pool_size: int = 10) -> None:
-        super().__init__(connection_str)
-        self.timeout: int = timeout
-        self.pool_size: int = pool_size
+    """
+    Pooled PostgreSQL client, shared by every thread of the process.
+
+    The client itself holds no connection. Pooled connections run in autocommit mode, so a lone statement
+    is committed without an extra round trip; a connection is pinned to the current thread/task by an open
+    `transaction()` block (statements committed together) or `session()` block (one checkout reused by
+    every statement, e.g. for the length of a request).
+
+    The pool grows from `min_size` to `max_size` under load. A checkout waits at most `timeout` seconds
+    (`psycopg_pool.PoolTimeout`), and once `max_waiting` requests are queued further ones are refused at
+    once (`psycopg_pool.TooManyRequests`); both surface as `PoolExhaustedError`, answered with a 503.
+    """
+
+    def __init__(self, connection_str: str, timeout: float = 5, min_size: int = 4, max_size: int | None = None,
+                 max_waiting: int = 0, max_idle: float = 600, max_lifetime: float = 3600) -> None:
+        super().__init__(connection_str, dialect=PostgresDialect())
+        self.timeout: float = timeout
+        self.min_size: int = min_size
+        self.max_size: int = max_size or min_size
+        self.max_waiting: int = max_waiting  # 0: unbounded queue
+        self.max_idle: float = max_idle
+        self.max_lifetime: float = max_lifetime
         self.pool: ConnectionPool | None = None
+        self._connect_lock = threading.Lock()
+        # Time spent waiting for a connection, in ms, failed waits included.
+        self.wait_histogram: Histogram = Histogram()
+        # Connection pinned by an open `transaction()` block in the current thread/task.
+        self._transaction_conn: ContextVar[Connection | None] = ContextVar(f"pg_transaction_{id(self)}",
+                                                                           default=None)
+        # Connection pinned by an open `session()` block in the current thread/task.
+        self._session: ContextVar[_Session | None] = ContextVar(f"pg_session_{id(self)}", default=None)
 
     def connect(self) -> None:
         """Initialize connection pool if not already initialized."""
-        if self.pool is None:
+        if self.pool is not None:
+            return
+        # Background threads (e.g. the outbox dispatcher) may race the first request to open the pool.
+        with self._connect_lock:
+            if self.pool is not None:
+                return
             try:
                 self.pool = ConnectionPool(
                     conninfo=self.connection_str,
-                    min_size=self.pool_size,
-                    timeout=self.timeout
+                    min_size=self.min_size,
+                    max_size=self.max_size,
+                    max_waiting=self.max_waiting,
+                    max_idle=self.max_idle,
+                    max_lifetime=self.max_lifetime,
+                    timeout=self.timeout,
+                    kwargs={"autocommit": True},
                 )
                 logger.info("Successfully initialized PostgreSQL connection pool")
             except OperationalError as e:
                 logger.error(f"Failed to initialize PostgreSQL connection pool: {e}")
                 raise ConnectionError("Could not establish connection to PostgreSQL.") from e
 
+    def _checkout(self) -> Connection:
+        started = time.perf_counter()
+        try:
+            return self.pool.getconn()
+        except (PoolTimeout, TooManyRequests) as e:
+            raise PoolExhaustedError(str(e)) from e
+        finally:
+            self.wait_histogram.observe((time.perf_counter() - started) * 1000)
+
+    @contextmanager
+    def _pooled(self) -> Iterator[Connection]:
+        """Check a connection out of the pool for the duration of the block."""
+        conn = self._checkout()
+        try:
+            yield conn
+        finally:
+            self.pool.putconn(conn)
+
+    @contextmanager
+    def _connection(self) -> Iterator[Connection]:
+        """
+        Yield the connection pinned to the current transaction or session,
+        or check one out of the pool for the duration of the block.
+        """
+        conn = self._transaction_conn.get()
+        if conn is not None:
+            yield conn
+            return
+        session = self._session.get()
+        if session is not None:
+            if session.conn is None:
+                session.conn = self._checkout()
+            yield session.conn
+            return
+        with self._pooled() as conn:
+            yield conn
+
     @contextmanager
     def _get_cursor(self, row_factory: RowFactory[Any] = DictRowFactory) -> Cursor[Any]:
         """Context manager for acquiring and releasing a database cursor."""
-        self.connection = self.pool.getconn()
+        with self._connection() as conn, conn.cursor(row_factory=row_factory) as cursor:
+            yield cursor
+
+    @contextmanager
+    def session(self) -> Iterator['PostgresClient']:
+        """
+        Reuse a single pooled connection for every statement in the block.
+        The connection is checked out lazily, so a block that never touches the database costs nothing.
+        """
+        if self._session.get() is not None:
+            yield self
+            return
+        session = _Session()
+        self._session.set(session)
         try:
-            yield self.connection.cursor(row_factory=row_factory)
+            yield self
         finally:
-            self.pool.putconn(self.connection)
+            self._session.set(None)
+            if session.conn is not None:
+                self.pool.putconn(session.conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator['PostgresClient']:
+        """Pin one pooled connection for the enclosed statements and commit them together."""
+        if self._transaction_conn.get() is not None:
+            yield self
+            return
+        with self._connection() as conn, conn.transaction():
+            token = self._transaction_conn.set(conn)
+            try:
+                yield self
+            finally:
+                self._transaction_conn.reset(token)
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._transaction_conn.get() is not None
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Pool gauges and counters from `ConnectionPool.get_stats()`, plus the checkout wait histogram."""
+        stats: Dict[str, Any] = {'pool_min': self.min_size, 'pool_max': self.max_size,
+                                 'max_waiting': self.max_waiting}
+        if self.pool is not None:
+            stats.update(self.pool.get_stats())
+        stats['wait_ms'] = self.wait_histogram.snapshot()
+        return stats
+
+    def warm_up(self) -> None:
+        """Open the pool and wait until its `min_size` connections are established."""
+        self.connect()
+        self.pool.wait(timeout=self.timeout)
+
+    def reset_after_fork(self) -> None:
+        # The inherited pool's worker threads do not exist in the child and its sockets belong to the parent.
+        self.pool = None
+        self._connect_lock = threading.Lock()
+        self._session.set(None)
+        self._transaction_conn.set(None)
+        self.wait_histogram = Histogram()
 
     def close(self) -> None:
         """Close the connection pool."""
         if self.pool:
             self.pool.close()
+            self.pool = None
             logger.info("Closed all connections in the PostgreSQL pool")
 
-    @log(include_time=True)
-    def execute(self, query: str, params: Tuple[Any, ...] = ()) -> None:
+    def execute(self, query: str, params: Tuple[Any, ...] = ()) -> int:
         """Execute a query with optional parameters."""
         try:
             with self._get_cursor() as cursor:
                 res = cursor.execute(query, params or ())
                 logger.debug(f"inserted {res.rowcount} rows")
-                cursor.connection.commit()
                 return res.rowcount
         except DatabaseError as e:
             logger.error(f"Error executing query: {e}")
-            cursor.connection.rollback()
             raise
 
-    def fetch_all(self, query: str, params: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
-        """Fetch all rows from a query."""
+    def execute_returning(self, query: str, params: Tuple[Any, ...] = ()) -> Union[Dict[str, Any], None]:
+        """Execute a statement with a RETURNING clause and return its first row."""
         try:
             with self._get_cursor() as cursor:
+                cursor.execute(query, params or ())
+                return cursor.fetchone()
+        except DatabaseError as e:
+            logger.error(f"Error executing query: {e}")
+            raise
+
+    def bulk_insert(self, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+        """Insert rows with `COPY ... FROM STDIN`, streamed over the connection instead of one INSERT per row."""
+        query = sql.SQL("COPY {} ({}) FROM STDIN").format(
+            sql.Identifier(table), sql.SQL(', ').join(map(sql.Identifier, columns)))
+        try:
+            with self._get_cursor() as cursor:
+                with cursor.copy(query) as copy:
+                    for row in rows:
+                        copy.write_row(row)
+                return cursor.rowcount
+        except DatabaseError as e:
+            logger.error(f"Error copying rows into {table}: {e}")
+            raise
+
+    def fetch_all(self, query: str, params: Tuple[Any, ...] = (),
+                  as_tuples: bool = False) -> List[Union[Dict[str, Any], Tuple[Any, ...]]]:
+        """Fetch all rows from a query."""
+        try:
+            with self._get_cursor(tuple_row if as_tuples else DictRowFactory) as cursor:
                 cursor.execute(query, params)
                 return cursor.fetchall()
         except DatabaseError as e:
             logger.error(f"Error fetching all rows: {e}")
             raise
 
-    def fetch_one(self, query: str, params: Tuple[Any, ...] = ()) -> Union[Dict[str, Any], None]:
+    def fetch_one(self, query: str, params: Tuple[Any, ...] = (),
+                  as_tuples: bool = False) -> Union[Dict[str, Any], Tuple[Any, ...], None]:
         """Fetch one row from a query."""
         try:
-            with self._get_cursor() as cursor:
+            with self._get_cursor(tuple_row if as_tuples else DictRowFactory) as cursor:
                 cursor.execute(query, params)
                 return cursor.fetchone()
         except DatabaseError as e:
             logger.error(f"Error fetching one row: {e}")
             raise
+
+    def stream(self, query: str, params: Tuple[Any, ...] = (), chunk_size: int = 1000,
+               as_tuples: bool = False) -> Iterator[Union[Dict[str, Any], Tuple[Any, ...]]]:
+        """Iterate over a query through a server-side (named) cursor, `chunk_size` rows per round trip."""
+        pinned = self._transaction_conn.get()
+        try:
+            # Outside a transaction the stream takes a connection of its own rather than the session's:
+            # response bodies are iterated after the request (and its session) has ended.
+            with (nullcontext(pinned) if pinned is not None else self._pooled()) as conn, \
+                    (nullcontext() if pinned is not None else conn.transaction()), \
+                    conn.cursor(name=f"stream_{uuid.uuid4().hex}",
+                                row_factory=tuple_row if as_tuples else DictRowFactory) as cursor:
+                # Named cursors only live inside a transaction; outside `transaction()` a read-only one is
+                # opened here and committed when the iterator is exhausted or closed.
+                if pinned is None:
+                    conn.execute("SET TRANSACTION READ ONLY")
+                cursor.itersize = chunk_size
+                cursor.execute(query, params)
+                while rows := cursor.fetchmany(chunk_size):
+                    yield from rows
+        except DatabaseError as e:
+            logger.error(f"Error streaming rows: {e}")
+            raise
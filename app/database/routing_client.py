@@ -0,0 +1,159 @@
+import itertools
+import threading
+from contextlib import contextmanager, ExitStack
+from contextvars import ContextVar
+from typing import Tuple, List, Union, Any, Dict, Iterator, Iterable, Sequence
+
+from app.database.database_client import DatabaseClient
+
+ROUND_ROBIN = 'round_robin'
+LEAST_LOADED = 'least_loaded'
+
+
+class _RequestState:
+    """Read routing state of one `session()` block (one request)."""
+    __slots__ = ('wrote',)
+
+    def __init__(self) -> None:
+        self.wrote = False
+
+
+class RoutingDatabaseClient(DatabaseClient):
+    """
+    Sends writes to a primary and reads to a set of replicas.
+
+    Statements that modify data (`execute`, `execute_returning`, `bulk_insert`, `execute_script`) and everything
+    inside `transaction()` run on the primary. Reads (`fetch_one`, `fetch_all`, `stream`) run on a replica picked
+    round-robin or by the fewest reads in flight, unless the current `session()` (the request) has written:
+    from then on its reads stay on the primary, so a request always sees its own writes despite replica lag.
+    """
+
+    def __init__(self, primary: DatabaseClient, replicas: Sequence[DatabaseClient],
+                 strategy: str = ROUND_ROBIN) -> None:
+        if strategy not in (ROUND_ROBIN, LEAST_LOADED):
+            raise ValueError(f"Unsupported read routing strategy: {strategy}")
+        super().__init__(primary.connection_str, dialect=primary.dialect)
+        self.primary: DatabaseClient = primary
+        self.replicas: List[DatabaseClient] = list(replicas)
+        self.strategy: str = strategy
+        self._next = itertools.count()
+        self._in_flight: List[int] = [0] * len(self.replicas)
+        self._in_flight_lock = threading.Lock()
+        self._in_transaction: ContextVar[bool] = ContextVar(f"routing_transaction_{id(self)}", default=False)
+        self._request: ContextVar[_RequestState | None] = ContextVar(f"routing_request_{id(self)}", default=None)
+
+    def connect(self) -> None:
+        for client in (self.primary, *self.replicas):
+            client.connect()
+
+    def close(self) -> None:
+        for client in (self.primary, *self.replicas):
+            client.close()
+
+    def warm_up(self) -> None:
+        for client in (self.primary, *self.replicas):
+            client.warm_up()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return {
+            'strategy': self.strategy,
+            'primary': self.primary.pool_stats(),
+            'replicas': [{**replica.pool_stats(), 'reads_in_flight': in_flight}
+                         for replica, in_flight in zip(self.replicas, self._in_flight)],
+        }
+
+    @property
+    def reads_from_primary(self) -> bool:
+        """Whether reads in the current context must see the primary's latest writes."""
+        if not self.replicas or self._in_transaction.get():
+            return True
+        request = self._request.get()
+        return request is not None and request.wrote
+
+    def _wrote(self) -> None:
+        request = self._request.get()
+        if request is not None:
+            request.wrote = True
+
+    def _pick_replica(self) -> int:
+        if self.strategy == LEAST_LOADED:
+            # Fewest reads in flight; the rotating start spreads ties instead of always picking the first.
+            start = next(self._next)
+            count = len(self.replicas)
+            return min(((start + i) % count for i in range(count)), key=self._in_flight.__getitem__)
+        return next(self._next) % len(self.replicas)
+
+    @contextmanager
+    def _reader(self) -> Iterator[DatabaseClient]:
+        """Yield the client that serves a read in the current context, counting reads in flight."""
+        if self.reads_from_primary:
+            yield self.primary
+            return
+        with self._in_flight_lock:
+            index = self._pick_replica()
+            self._in_flight[index] += 1
+        try:
+            yield self.replicas[index]
+        finally:
+            with self._in_flight_lock:
+                self._in_flight[index] -= 1
+
+    @contextmanager
+    def session(self) -> Iterator['RoutingDatabaseClient']:
+        """Open a session on every pool and track whether the block writes, see the class docstring."""
+        if self._request.get() is not None:
+            yield self
+            return
+        self._request.set(_RequestState())
+        try:
+            with ExitStack() as sessions:
+                for client in (self.primary, *self.replicas):
+                    sessions.enter_context(client.session())
+                yield self
+        finally:
+            self._request.set(None)
+
+    @contextmanager
+    def transaction(self) -> Iterator['RoutingDatabaseClient']:
+        """Run the block on the primary in one transaction; reads inside it see its writes."""
+        if self._in_transaction.get():
+            yield self
+            return
+        with self.primary.transaction():
+            token = self._in_transaction.set(True)
+            try:
+                yield self
+            finally:
+                self._in_transaction.reset(token)
+        self._wrote()
+
+    def execute(self, query: str, params: Tuple[Any, ...] = ()) -> Any:
+        self._wrote()
+        return self.primary.execute(query, params)
+
+    def execute_returning(self, query: str, params: Tuple[Any, ...] = ()) -> Union[Dict[str, Any], None]:
+        self._wrote()
+        return self.primary.execute_returning(query, params)
+
+    def execute_script(self, script: str) -> None:
+        self._wrote()
+        self.primary.execute_script(script)
+
+    def bulk_insert(self, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+        self._wrote()
+        return self.primary.bulk_insert(table, columns, rows)
+
+    def fetch_all(self, query: str, params: Tuple[Any, ...] = (),
+                  as_tuples: bool = False) -> List[Union[Dict[str, Any], Tuple[Any, ...]]]:
+        with self._reader() as client:
+            return client.fetch_all(query, params, as_tuples=as_tuples)
+
+    def fetch_one(self, query: str, params: Tuple[Any, ...] = (),
+                  as_tuples: bool = False) -> Union[Dict[str, Any], Tuple[Any, ...], None]:
+        with self._reader() as client:
+            return client.fetch_one(query, params, as_tuples=as_tuples)
+
+    def stream(self, query: str, params: Tuple[Any, ...] = (), chunk_size: int = 1000,
+               as_tuples: bool = False) -> Iterator[Union[Dict[str, Any], Tuple[Any, ...]]]:
+        with self._reader() as client:
+            yield from client.stream(query, params, chunk_size=chunk_size, as_tuples=as_tuples)
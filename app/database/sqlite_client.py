@@ -1,79 +1,292 @@
 import logging
+import os
+import threading
 from contextlib import contextmanager
-from sqlite3 import Connection, Cursor, Row, connect, PARSE_DECLTYPES
-from typing import Tuple, List, Union, Any, Dict
+from contextvars import ContextVar
+from queue import LifoQueue, Empty
+from sqlite3 import Connection, Cursor, Row, connect, register_converter, sqlite_version, PARSE_DECLTYPES
+from typing import Tuple, List, Union, Any, Dict, Iterator, Iterable, Sequence
+from urllib.request import pathname2url
 
-from app.database.database_client import DatabaseClient
-from app.utils.singleton_decorator import singleton
+from app.database.database_client import DatabaseClient, PoolExhaustedError
+from app.database.dialect import SQLiteDialect
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PRAGMAS = {
+    "journal_mode": "wal",  # Readers never block the writer and vice versa
+    "synchronous": "normal",  # Durable at checkpoints; safe against corruption in WAL mode
+    "cache_size": -64000,  # Negative values are KiB
+    "mmap_size": 268435456,
+    "temp_store": "memory",
+}
+
+# SQLite stores booleans as integers; read columns declared BOOLEAN back as bool, like psycopg does.
+register_converter("BOOLEAN", lambda value: value not in (b"0", b""))
+
+# Readers wait on I/O and locks as much as on the CPU, so the pool is not sized by core count.
+DEFAULT_READ_POOL_SIZE = 8
+
+# Pragmas that only make sense on (or are rejected by) a connection that writes.
+WRITER_ONLY_PRAGMAS = {"journal_mode", "synchronous", "auto_vacuum", "wal_autocheckpoint"}
+
 
-@singleton
 class SQLiteClient(DatabaseClient):
-    def __init__(self, connection_str: str, timeout: int = 5) -> None:
-        super().__init__(connection_str)
+    """
+    SQLite client that can be shared by every thread of the process.
+
+    SQLite allows one writer at a time, so all writes go through a single writer connection guarded by a lock
+    (waiting on a lock is cheaper than retrying on SQLITE_BUSY). Reads outside a transaction are served by a
+    small pool of read-only connections which, in WAL mode, run concurrently with each other and the writer.
+    `stream()` reads through a read-only connection of its own, so a slow (or abandoned) consumer never holds a
+    pooled reader.
+    Connections run in autocommit mode; `transaction()` wraps its block in `BEGIN IMMEDIATE ... COMMIT`.
+    """
+
+    def __init__(self, connection_str: str, timeout: int = 5, pragmas: Dict[str, Any] | None = None,
+                 read_pool_size: int | None = None) -> None:
+        super().__init__(connection_str, dialect=SQLiteDialect())
         self.timeout: int = timeout
-        self.connection: Connection | None = None
+        self.pragmas: Dict[str, Any] = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.read_pool_size: int = read_pool_size or DEFAULT_READ_POOL_SIZE
+        # In-memory databases are private to their connection, so every query goes through the writer.
+        self.in_memory: bool = connection_str in ('', ':memory:') or 'mode=memory' in connection_str
+        self._writer: Connection | None = None
+        self._write_lock = threading.Lock()
+        self._readers: LifoQueue[Connection] = LifoQueue()
+        self._reader_count = 0
+        self._readers_lock = threading.Lock()
+        self._in_transaction: ContextVar[bool] = ContextVar(f"sqlite_transaction_{id(self)}", default=False)
 
     def connect(self) -> None:
-        """Establish a connection to the SQLite database."""
-        self.connection = connect(
-            self.connection_str,
+        """
+        Open the writer connection (creating the database file and applying pragmas) if not already open.
+
+        Raises:
+            RuntimeError: If the SQLite library is older than 3.35, which lacks the RETURNING clause the
+                repositories' writes and the outbox claim rely on.
+        """
+        if not self.dialect.supports_returning:
+            raise RuntimeError(f"SQLite {sqlite_version} does not support RETURNING; SQLite 3.35 or newer is required")
+        if self._writer is None:
+            self._writer = self._open(self.connection_str, read_only=False)
+            logger.debug("Connected to SQLiteClient")
+
+    def _open(self, target: str, read_only: bool) -> Connection:
+        conn = connect(
+            target,
             timeout=self.timeout,
-            detect_types=PARSE_DECLTYPES
+            detect_types=PARSE_DECLTYPES,
+            isolation_level=None,
+            check_same_thread=False,  # Each connection is only ever used by one thread at a time
+            uri=target.startswith('file:'),
         )
-        self.connection.row_factory = Row
-        logger.debug("Connected to SQLiteClient")
+        conn.row_factory = Row
+        for name, value in self.pragmas.items():
+            if not (read_only and name in WRITER_ONLY_PRAGMAS):
+                conn.execute(f"PRAGMA {name}={value}")
+        return conn
+
+    def _reader_uri(self) -> str:
+        if self.connection_str.startswith('file:'):
+            return f"{self.connection_str}{'&' if '?' in self.connection_str else '?'}mode=ro"
+        return f"file:{pathname2url(os.path.abspath(self.connection_str))}?mode=ro"
 
     def close(self) -> None:
-        """Close the connection to the SQLite database."""
-        if self.connection:
-            self.connection.close()
+        """Close the writer and all reader connections."""
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except Empty:
+                break
+        self._reader_count = 0
+        if self._writer:
+            self._writer.close()
             logger.debug("Closed SQLiteClient connection")
-            self.connection = None
+            self._writer = None
 
     @contextmanager
-    def _get_cursor(self) -> Cursor:
-        """Context manager for acquiring and releasing a database cursor."""
-        if not self.connection:
+    def _write_connection(self) -> Iterator[Connection]:
+        if self._writer is None:
             raise RuntimeError("No connection established.")
-        cursor = self.connection.cursor()
+        if self._in_transaction.get():
+            yield self._writer
+            return
+        with self._write_lock:
+            yield self._writer
+
+    @contextmanager
+    def _read_connection(self) -> Iterator[Connection]:
+        if self._in_transaction.get() or self.in_memory:
+            # Reads inside a transaction must see its uncommitted writes.
+            with self._write_connection() as conn:
+                yield conn
+            return
+        conn = self._checkout_reader()
         try:
-            yield cursor
+            yield conn
         finally:
-            cursor.close()
+            self._readers.put(conn)
+
+    @contextmanager
+    def _stream_connection(self) -> Iterator[Connection]:
+        """A read-only connection outside the pool, closed after the block; see `_read_connection`."""
+        if self._in_transaction.get() or self.in_memory:
+            with self._write_connection() as conn:
+                yield conn
+            return
+        conn = self._open(self._reader_uri(), read_only=True)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _checkout_reader(self) -> Connection:
+        try:
+            return self._readers.get_nowait()
+        except Empty:
+            pass
+        with self._readers_lock:
+            if self._reader_count < self.read_pool_size:
+                self._reader_count += 1
+                return self._open(self._reader_uri(), read_only=True)
+        try:
+            return self._readers.get(timeout=self.timeout)
+        except Empty:
+            raise PoolExhaustedError(f"No SQLite reader connection available after {self.timeout}s")
+
+    def warm_up(self) -> None:
+        """Open the writer and one reader, so the first request skips opening files and applying pragmas."""
+        self.connect()
+        if not self.in_memory:
+            with self._read_connection() as conn:
+                conn.execute("SELECT 1")
+
+    def reset_after_fork(self) -> None:
+        # SQLite connections must not be used across fork(); locks may have been held by a parent thread.
+        self._writer = None
+        self._write_lock = threading.Lock()
+        self._readers = LifoQueue()
+        self._reader_count = 0
+        self._readers_lock = threading.Lock()
+        self._in_transaction.set(False)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Reader pool gauges; writes are serialized on the single writer connection."""
+        return {'pool_max': self.read_pool_size, 'pool_size': self._reader_count,
+                'pool_available': self._readers.qsize(), 'writer_busy': self._write_lock.locked()}
 
-    def execute(self, query: str, params: Tuple[Any, ...] = ()) -> None:
+    @contextmanager
+    def _get_cursor(self, write: bool = True, as_tuples: bool = False, stream: bool = False) -> Cursor:
+        """Context manager for acquiring and releasing a database cursor; `stream` reads off the pool."""
+        if write:
+            connection = self._write_connection()
+        else:
+            connection = self._stream_connection() if stream else self._read_connection()
+        with connection as conn:
+            cursor = conn.cursor()
+            if as_tuples:
+                cursor.row_factory = None  # Overrides the connection's Row factory for this cursor only
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator['SQLiteClient']:
+        """Hold the writer for the enclosed statements and commit them together."""
+        if self._in_transaction.get():
+            yield self
+            return
+        with self._write_connection() as conn:
+            # IMMEDIATE takes the write lock up front, so the transaction cannot fail later on upgrade.
+            conn.execute("BEGIN IMMEDIATE")
+            token = self._in_transaction.set(True)
+            try:
+                yield self
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                self._in_transaction.reset(token)
+
+    def execute(self, query: str, params: Tuple[Any, ...] = ()) -> int:
         """Execute a query with optional parameters."""
         try:
             with self._get_cursor() as cursor:
-                cursor.execute(query, params)
-                self.connection.commit()
+                cursor.execute(self.dialect.translate(query), params)
+                return cursor.rowcount
         except Exception as e:
             logger.error(f"Error executing query: {e}")
             raise
 
-    def fetch_all(self, query: str, params: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
-        """Fetch all rows from a query."""
+    def execute_returning(self, query: str, params: Tuple[Any, ...] = ()) -> Union[Dict[str, Any], None]:
+        """Execute a statement with a RETURNING clause and return its first row."""
         try:
             with self._get_cursor() as cursor:
-                cursor.execute(query, params)
+                cursor.execute(self.dialect.translate(query), params)
+                row = cursor.fetchone()
+                # Drain the statement so SQLite finishes it before the commit.
+                cursor.fetchall()
+                return dict(row) if row else None
+        except Exception as e:
+            logger.error(f"Error executing query: {e}")
+            raise
+
+    def execute_script(self, script: str) -> None:
+        """Execute a schema or migration script (commits any open transaction first)."""
+        with self._write_connection() as conn:
+            conn.executescript(script)
+
+    def bulk_insert(self, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+        """Insert rows with a single `executemany` (SQLite has no COPY) in one transaction."""
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        try:
+            with self.transaction(), self._get_cursor() as cursor:
+                cursor.executemany(query, rows)
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Error bulk inserting into {table}: {e}")
+            raise
+
+    def fetch_all(self, query: str, params: Tuple[Any, ...] = (),
+                  as_tuples: bool = False) -> List[Union[Dict[str, Any], Tuple[Any, ...]]]:
+        """Fetch all rows from a query. Outside a transaction this runs on a read-only connection."""
+        try:
+            with self._get_cursor(write=False, as_tuples=as_tuples) as cursor:
+                cursor.execute(self.dialect.translate(query), params)
                 rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+                return rows if as_tuples else [dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error fetching all rows: {e}")
             raise
 
-    def fetch_one(self, query: str, params: Tuple[Any, ...] = ()) -> Union[Dict[str, Any], None]:
-        """Fetch one row from a query."""
+    def fetch_one(self, query: str, params: Tuple[Any, ...] = (),
+                  as_tuples: bool = False) -> Union[Dict[str, Any], Tuple[Any, ...], None]:
+        """Fetch one row from a query. Outside a transaction this runs on a read-only connection."""
         try:
-            with self._get_cursor() as cursor:
-                cursor.execute(query, params)
+            with self._get_cursor(write=False, as_tuples=as_tuples) as cursor:
+                cursor.execute(self.dialect.translate(query), params)
                 row = cursor.fetchone()
                 if row:
-                    return dict(row)
+                    return row if as_tuples else dict(row)
                 return None
         except Exception as e:
             logger.error(f"Error fetching one row: {e}")
             raise
+
+    def stream(self, query: str, params: Tuple[Any, ...] = (), chunk_size: int = 1000,
+               as_tuples: bool = False) -> Iterator[Union[Dict[str, Any], Tuple[Any, ...]]]:
+        """Iterate over a query, fetching `chunk_size` rows at a time."""
+        try:
+            with self._get_cursor(write=False, as_tuples=as_tuples, stream=True) as cursor:
+                cursor.execute(self.dialect.translate(query), params)
+                while rows := cursor.fetchmany(chunk_size):
+                    if as_tuples:
+                        yield from rows
+                    else:
+                        yield from (dict(row) for row in rows)
+        except Exception as e:
+            logger.error(f"Error streaming rows: {e}")
+            raise
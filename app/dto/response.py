@@ -18,3 +18,20 @@ class Response(BaseDTO, ABC):
 @dataclass
 class ErrorResponse(Response):
     details: str | None = None
+
+
+@dataclass
+class PageResponse(BaseDTO):
+    items: list = field(default_factory=list)
+    next_page_token: str | None = None
+
+
+@dataclass
+class BulkImportResponse(BaseDTO):
+    received: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)  # [{"row": index, "errors": [{"field": ..., "error": ...}]}]
+    errors_truncated: bool = False
+    elapsed_ms: float = 0.0
+    rows_per_second: float = 0.0
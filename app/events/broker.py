@@ -0,0 +1,381 @@
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import deque, defaultdict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Iterator
+
+import click
+from flask import current_app
+
+from app.events.event import Event
+from app.events.transport import EventTransport, LocalTransport, UnixSocketHub, create_transport
+from app.utils.class_helpers import auto_repr
+from app.utils.singleton_decorator import singleton
+
+logger = logging.getLogger(__name__)
+
+
+class BackpressurePolicy(Enum):
+    """What to do when a subscriber's queue is full."""
+    DROP_OLDEST = 'drop_oldest'
+    DISCONNECT = 'disconnect'
+
+
+class SubscriptionClosed(Exception):
+    """Raised by `Subscription.get` once the subscription has been closed and drained."""
+
+
+@dataclass(frozen=True)
+class SubscriptionFilter:
+    """
+    Server-side subscription filter. `None` accepts everything; otherwise only events whose
+    key (e.g. the user id) / event name is in the set are delivered.
+    """
+    keys: frozenset[str] | None = None
+    events: frozenset[str] | None = None
+
+    def accepts(self, event: Event) -> bool:
+        return (self.keys is None or event.key in self.keys) and \
+            (self.events is None or event.event in self.events)
+
+    def index_keys(self) -> Iterator[tuple[str | None, str | None]]:
+        """The (key, event) buckets this filter is registered under; `None` is the wildcard bucket."""
+        for key in self.keys if self.keys is not None else (None,):
+            for event in self.events if self.events is not None else (None,):
+                yield key, event
+
+
+MATCH_ALL = SubscriptionFilter()
+
+
+class Subscription:
+    """
+    A bounded, thread-safe event queue for a single subscriber.
+
+    With a `coalesce_window`, events are held for up to that many seconds and only the latest
+    event per key is delivered, so a burst of changes to one record collapses into a single frame.
+    """
+
+    def __init__(self, topic: str, max_queue_size: int, policy: BackpressurePolicy,
+                 filter: SubscriptionFilter = MATCH_ALL, coalesce_window: float = 0) -> None:
+        self.topic = topic
+        self.max_queue_size = max_queue_size
+        self.policy = policy
+        self.filter = filter
+        self.coalesce_window = coalesce_window
+        self.dropped = 0
+        self.coalesced = 0
+        self.closed = False
+        self.close_reason: str | None = None
+        self._queue: deque[Event] = deque()
+        self._pending: dict[Any, Event] = {}
+        self._flush_at: float | None = None
+        self._cond = threading.Condition()
+        self._waker: Callable[[], None] | None = None
+
+    def set_waker(self, waker: Callable[[], None] | None) -> None:
+        """
+        Register a callback invoked (from the publishing thread) whenever the subscription changes,
+        so non-threaded consumers such as an asyncio loop can wait without blocking on `get`.
+        """
+        with self._cond:
+            self._waker = waker
+
+    def put(self, event: Event) -> bool:
+        """
+        Enqueue an event, applying the backpressure policy when the queue is full.
+
+        Returns:
+            bool: False if the subscription is (now) closed and should be removed from the broker.
+        """
+        with self._cond:
+            if self.closed:
+                return False
+            if self.coalesce_window:
+                # Keyless events are never merged, but still go through the window to keep ids ordered.
+                pending_key = event.key if event.key is not None else ('#', event.id)
+                if pending_key in self._pending:
+                    self.coalesced += 1
+                    del self._pending[pending_key]
+                elif not self._make_room():
+                    return False
+                self._pending[pending_key] = event
+                if self._flush_at is None:
+                    self._flush_at = time.monotonic() + self.coalesce_window
+            else:
+                if not self._make_room():
+                    return False
+                self._queue.append(event)
+            self._notify()
+        return True
+
+    def _make_room(self) -> bool:
+        if len(self._queue) + len(self._pending) < self.max_queue_size:
+            return True
+        if self.policy is BackpressurePolicy.DISCONNECT:
+            self._close("slow consumer")
+            return False
+        if self._queue:
+            self._queue.popleft()
+        else:
+            del self._pending[next(iter(self._pending))]
+        self.dropped += 1
+        return True
+
+    def prime(self, events: list[Event]) -> None:
+        """Enqueue replayed events ahead of live ones, bypassing the backpressure policy."""
+        with self._cond:
+            self._queue.extend(events)
+            self._notify()
+
+    def next_flush_in(self) -> float | None:
+        """Seconds until coalesced events become available, or None if nothing is pending."""
+        with self._cond:
+            return None if self._flush_at is None else max(0.0, self._flush_at - time.monotonic())
+
+    def get(self, timeout: float | None = None) -> Event | None:
+        """
+        Wait for the next event.
+
+        Returns:
+            Event | None: The next event, or None if the timeout elapsed first.
+
+        Raises:
+            SubscriptionClosed: If the subscription was closed and no events are left.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                self._flush_due()
+                if self._queue:
+                    return self._queue.popleft()
+                if self.closed:
+                    raise SubscriptionClosed(self.close_reason)
+                now = time.monotonic()
+                remaining = None if deadline is None else deadline - now
+                if remaining is not None and remaining <= 0:
+                    return None
+                if self._flush_at is not None:
+                    until_flush = self._flush_at - now
+                    remaining = until_flush if remaining is None else min(remaining, until_flush)
+                self._cond.wait(remaining)
+
+    def _flush_due(self) -> None:
+        if self._flush_at is not None and time.monotonic() >= self._flush_at:
+            self._queue.extend(sorted(self._pending.values(), key=lambda e: e.id))
+            self._pending.clear()
+            self._flush_at = None
+
+    def close(self, reason: str | None = None) -> None:
+        with self._cond:
+            self._close(reason)
+
+    def _close(self, reason: str | None) -> None:
+        if not self.closed:
+            self.closed = True
+            self.close_reason = reason
+            self._queue.clear()
+            self._pending.clear()
+            self._flush_at = None
+            self._notify()
+
+    def _notify(self) -> None:
+        self._cond.notify_all()
+        if self._waker is not None:
+            self._waker()
+
+    __repr__ = auto_repr
+
+
+@singleton
+class EventBroker:
+    """
+    In-process publish/subscribe broker. Every subscriber gets its own bounded queue,
+    so a slow consumer can only ever hold `max_queue_size` events in memory.
+
+    Each topic numbers its events with a monotonically increasing id and keeps the last
+    `replay_buffer_size` of them, so a reconnecting client only receives what it missed.
+
+    Subscriptions are indexed by (topic, key, event name), so publishing an event only
+    touches the subscribers whose filters accept it.
+
+    Published events travel through a pluggable `EventTransport`, which decides which processes
+    deliver them; the default `LocalTransport` keeps them inside this process.
+    """
+
+    def __init__(self, max_queue_size: int = 100,
+                 policy: BackpressurePolicy = BackpressurePolicy.DROP_OLDEST,
+                 replay_buffer_size: int = 1000,
+                 transport: EventTransport | None = None) -> None:
+        self.max_queue_size = max_queue_size
+        self.policy = policy
+        self.replay_buffer_size = replay_buffer_size
+        self._lock = threading.Lock()
+        self._subscriber_counts: dict[str, int] = defaultdict(int)
+        self._index: dict[tuple[str, str | None, str | None], set[Subscription]] = defaultdict(set)
+        self._history: dict[str, deque[Event]] = {}
+        self._last_ids: dict[str, int] = defaultdict(int)
+        self.transport: EventTransport = transport or LocalTransport()
+        self.transport.start(self._deliver)
+        _brokers.add(self)
+
+    def _reset_after_fork(self) -> None:
+        # A parent thread may have held the lock at fork(); only then may the transport deliver again.
+        self._lock = threading.Lock()
+        self.transport.resume_after_fork()
+
+    def set_transport(self, transport: EventTransport) -> None:
+        """Replace the fan-out transport, closing the previous one."""
+        previous, self.transport = self.transport, transport
+        previous.close()
+        transport.start(self._deliver)
+
+    def configure(self, max_queue_size: int | None = None, policy: BackpressurePolicy | str | None = None,
+                  replay_buffer_size: int | None = None) -> None:
+        """Update the defaults applied to new subscriptions."""
+        if max_queue_size is not None:
+            self.max_queue_size = max_queue_size
+        if policy is not None:
+            self.policy = BackpressurePolicy(policy)
+        if replay_buffer_size is not None:
+            with self._lock:
+                self.replay_buffer_size = replay_buffer_size
+                self._history = {topic: deque(history, maxlen=replay_buffer_size)
+                                 for topic, history in self._history.items()}
+
+    def subscribe(self, topic: str, last_event_id: int | None = None, filter: SubscriptionFilter = MATCH_ALL,
+                  coalesce_window: float = 0) -> Subscription:
+        """
+        Subscribe to a topic.
+
+        Args:
+            topic (str): The topic to subscribe to.
+            last_event_id (int | None): The id of the last event the client saw. Events after it are
+                replayed; if some of them were already evicted, a single "resync" event is sent instead.
+            filter (SubscriptionFilter): Only events accepted by the filter are delivered.
+            coalesce_window (float): Seconds to hold events so that updates to the same key are merged.
+        """
+        subscription = Subscription(topic, self.max_queue_size, self.policy, filter=filter,
+                                    coalesce_window=coalesce_window)
+        with self._lock:
+            if last_event_id is not None:
+                subscription.prime(self._replay(topic, last_event_id, filter))
+            for key, event in filter.index_keys():
+                self._index[(topic, key, event)].add(subscription)
+            self._subscriber_counts[topic] += 1
+        logger.debug(f"New subscription on topic '{topic}' ({last_event_id=}, {filter=})")
+        return subscription
+
+    def _replay(self, topic: str, last_event_id: int, filter: SubscriptionFilter) -> list[Event]:
+        """Events published after `last_event_id`. Must be called with the lock held."""
+        current_id = self._last_ids[topic]
+        if last_event_id == current_id:
+            return []
+
+        history = self._history.get(topic)
+        oldest_id = history[0].id if history else current_id + 1
+        if last_event_id > current_id or last_event_id + 1 < oldest_id:
+            # Unknown id (e.g. from before a restart) or already evicted from the buffer.
+            return [Event(topic=topic, event="resync", data={"last_event_id": current_id}, id=current_id)]
+
+        # Ids within a topic are contiguous, so the offset into the buffer is direct.
+        start = last_event_id + 1 - oldest_id
+        return [history[i] for i in range(start, len(history)) if filter.accepts(history[i])]
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.close()
+        topic = subscription.topic
+        with self._lock:
+            removed = False
+            for key, event in subscription.filter.index_keys():
+                bucket = self._index.get((topic, key, event))
+                if bucket is not None and subscription in bucket:
+                    removed = True
+                    bucket.discard(subscription)
+                    if not bucket:
+                        del self._index[(topic, key, event)]
+            if removed:
+                self._subscriber_counts[topic] -= 1
+                if not self._subscriber_counts[topic]:
+                    del self._subscriber_counts[topic]
+
+    def publish(self, topic: str, event: str, data: Any = None, key: str | None = None) -> Event:
+        """Publish an event to every subscriber of a topic, in every process the transport reaches."""
+        return self.publish_event(Event(topic=topic, event=event, data=data, key=key))
+
+    def publish_event(self, message: Event) -> Event:
+        self.transport.publish(message)
+        return message
+
+    def _deliver(self, message: Event) -> None:
+        """Number, buffer and enqueue an event that reached this process through the transport."""
+        topic = message.topic
+        with self._lock:
+            history = self._history.get(topic)
+            if history is None:
+                history = self._history[topic] = deque(maxlen=self.replay_buffer_size)
+            if message.id is None:
+                message.id = self._last_ids[topic] + 1
+            elif message.id != self._last_ids[topic] + 1:
+                # The id source restarted or events were lost; older ids can no longer be replayed.
+                history.clear()
+            self._last_ids[topic] = message.id
+            history.append(message)
+
+            # A subscriber is registered in exactly one of these buckets for any given event.
+            rejected = []
+            index_keys = [(topic, None, None), (topic, None, message.event)]
+            if message.key is not None:
+                index_keys += [(topic, message.key, None), (topic, message.key, message.event)]
+            for index_key in index_keys:
+                bucket = self._index.get(index_key)
+                if bucket:
+                    # Delivered under the lock so every subscriber sees ids in order; `put` never blocks.
+                    rejected.extend(sub for sub in bucket if not sub.put(message))
+
+        for subscription in rejected:
+            logger.warning(f"Disconnecting subscriber on topic '{topic}': {subscription.close_reason}")
+            self.unsubscribe(subscription)
+
+    def subscriber_count(self, topic: str) -> int:
+        with self._lock:
+            return self._subscriber_counts.get(topic, 0)
+
+    __repr__ = auto_repr
+
+
+# Live brokers, reset in a forked child after their transports (`transport` registers its hook first).
+_brokers: weakref.WeakSet[EventBroker] = weakref.WeakSet()
+
+
+def _reset_brokers_after_fork() -> None:
+    for broker in list(_brokers):
+        broker._reset_after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_brokers_after_fork)
+
+
+def init_app(app):
+    broker = EventBroker()
+    broker.configure(
+        max_queue_size=app.config['SSE_MAX_QUEUE_SIZE'],
+        policy=app.config['SSE_BACKPRESSURE_POLICY'],
+        replay_buffer_size=app.config['SSE_REPLAY_BUFFER_SIZE'],
+    )
+    transport = app.config['SSE_TRANSPORT']
+    if transport != 'local':
+        broker.set_transport(create_transport(transport, **app.config['SSE_TRANSPORT_OPTIONS']))
+    app.cli.add_command(sse_hub_command)
+
+
+@click.command('sse-hub')
+def sse_hub_command():
+    """Run a standalone event hub for the 'unix' SSE transport."""
+    path = current_app.config['SSE_TRANSPORT_OPTIONS']['path']
+    click.echo(f'Event hub listening on {path}')
+    UnixSocketHub(path).serve_forever()
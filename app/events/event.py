@@ -0,0 +1,43 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.middlewares.json_provider import ComplexJSONEncoder
+
+
+@dataclass
+class Event:
+    """A single message published to a broker topic."""
+    topic: str
+    event: str
+    data: Any = None
+    id: int | None = None
+    key: str | None = None  # Identity of the record the event is about, used for filtering and coalescing
+    _payload: bytes | None = field(default=None, init=False, repr=False, compare=False)
+    _frame: bytes | None = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_payload(cls, topic: str, event: str, payload: bytes, id: int | None = None,
+                     key: str | None = None) -> 'Event':
+        """Rebuild an event from its already-encoded JSON payload, e.g. one received from another process."""
+        message = cls(topic=topic, event=event, data=json.loads(payload), id=id, key=key)
+        message._payload = payload
+        return message
+
+    @property
+    def payload(self) -> bytes:
+        """The JSON encoding of `data`, computed once."""
+        if self._payload is None:
+            self._payload = json.dumps(self.data, cls=ComplexJSONEncoder, separators=(',', ':')).encode()
+        return self._payload
+
+    @property
+    def frame(self) -> bytes:
+        """
+        The Server-Sent Events wire representation of this event.
+        Rendered on first access and shared by every subscriber.
+        """
+        if self._frame is None:
+            id_line = b"id: %d\n" % self.id if self.id is not None else b""
+            self._frame = b"%bevent: %b\ndata: %b\n\n" % (id_line, self.event.encode(), self.payload)
+        return self._frame
@@ -0,0 +1,133 @@
+import logging
+import os
+import threading
+import weakref
+
+from flask import Flask
+
+from app.events.broker import EventBroker
+from app.events.event import Event
+from app.repository.outbox_repository import OutboxRepository
+from app.utils.class_helpers import auto_repr
+from app.utils.startup import register_warm_up_hook
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF = 30.0
+
+
+class OutboxDispatcher:
+    """
+    Background thread that drains the outbox table into the event broker.
+
+    Each batch is claimed, published and deleted in one transaction, so an event is only removed
+    once it has been handed to the broker: delivery is at-least-once.
+
+    It starts with the first request the application serves, with `warm_up(app)`, or when the asyncio server
+    starts (whose SSE streams bypass Flask's request hooks), so processes that never serve (`flask init-db`,
+    the `sse-hub` command, scripts and benchmarks calling `create_app`) never poll.
+    """
+
+    def __init__(self, app: Flask, outbox_repository: OutboxRepository, broker: EventBroker,
+                 batch_size: int = 100, poll_interval: float = 0.5) -> None:
+        self.app = app
+        self.outbox_repository = outbox_repository
+        self.broker = broker
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        _dispatchers.add(self)
+
+    def _restart_after_fork(self) -> None:
+        started, self._thread = self._thread is not None, None
+        self._start_lock = threading.Lock()
+        if started and not self._stopped.is_set():
+            self._stopped = threading.Event()
+            self.start()
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='outbox-dispatcher', daemon=True)
+            self._thread.start()
+
+    def start_once(self) -> None:
+        """Start the dispatcher unless it was already started (and maybe stopped since). Cheap once started."""
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        backoff = self.poll_interval
+        while not self._stopped.is_set():
+            try:
+                with self.app.app_context():
+                    dispatched = self.dispatch_batch()
+                backoff = self.poll_interval
+            except Exception as e:
+                logger.error(f"Outbox dispatch failed, retrying in {backoff:.1f}s: {e}")
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF)
+                continue
+            # A full batch means there is probably more waiting.
+            if dispatched < self.batch_size:
+                self._stopped.wait(self.poll_interval)
+
+    def dispatch_batch(self) -> int:
+        """Publish one batch of pending events. Requires an application context."""
+        with self.outbox_repository.db.transaction():
+            rows = self.outbox_repository.claim_batch(self.batch_size)
+            for row in rows:
+                message = Event.from_payload(row.topic, row.event_type, row.payload.encode(), key=row.event_key)
+                self.broker.publish_event(message)
+        if rows:
+            logger.debug(f"Dispatched {len(rows)} outbox events")
+        return len(rows)
+
+    __repr__ = auto_repr
+
+
+_dispatchers: weakref.WeakSet[OutboxDispatcher] = weakref.WeakSet()
+
+
+def _restart_dispatchers_after_fork() -> None:
+    """
+    Threads do not survive fork(): the workers of a server that forks after a dispatcher started each restart
+    their own. Dispatchers that never started are left to start in the child.
+    """
+    for dispatcher in list(_dispatchers):
+        dispatcher._restart_after_fork()
+
+
+os.register_at_fork(after_in_child=_restart_dispatchers_after_fork)
+
+
+def init_app(app: Flask) -> OutboxDispatcher | None:
+    """Build the dispatcher into `app.extensions['outbox_dispatcher']`, to be started once the app serves."""
+    if not app.config['OUTBOX_DISPATCHER_ENABLED']:
+        return None
+    dispatcher = OutboxDispatcher(
+        app,
+        outbox_repository=OutboxRepository(),
+        broker=EventBroker(),
+        batch_size=app.config['OUTBOX_BATCH_SIZE'],
+        poll_interval=app.config['OUTBOX_POLL_INTERVAL'],
+    )
+    app.before_request(dispatcher.start_once)
+    register_warm_up_hook(app, start_dispatcher)
+    app.extensions['outbox_dispatcher'] = dispatcher
+    return dispatcher
+
+
+def start_dispatcher(app: Flask) -> None:
+    """Warm-up hook: start polling in the worker that is about to serve."""
+    app.extensions['outbox_dispatcher'].start_once()
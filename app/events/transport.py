@@ -0,0 +1,380 @@
+"""transport.py
+
+Fan-out transports for the event broker.
+
+A transport carries published events to every broker that should deliver them. `LocalTransport`
+keeps everything inside the current process; `UnixSocketTransport` forwards events through a
+`UnixSocketHub` so that all worker processes on the same host see every event.
+
+Events cross process boundaries as a single length-prefixed message: the publisher encodes the
+JSON payload once, the hub stamps the topic-wide event id in place and forwards the same bytes to
+every worker with one write each, queued per worker so that a slow one holds up no other.
+"""
+
+import fcntl
+import logging
+import os
+import queue
+import socket
+import struct
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from typing import Callable, BinaryIO
+
+from app.events.event import Event
+from app.utils.class_helpers import auto_repr
+
+logger = logging.getLogger(__name__)
+
+# payload length, event id (0 = unassigned), topic length, event name length, key length (0 = no key)
+HEADER = struct.Struct('!IQHHH')
+ID_OFFSET = 4
+
+Deliver = Callable[[Event], None]
+
+
+def encode(event: Event) -> bytearray:
+    topic, name = event.topic.encode(), event.event.encode()
+    key = event.key.encode() if event.key is not None else b''
+    payload = event.payload
+    message = bytearray(HEADER.pack(len(payload), event.id or 0, len(topic), len(name), len(key)))
+    message += topic
+    message += name
+    message += key
+    message += payload
+    return message
+
+
+def read_message(stream: BinaryIO) -> bytearray | None:
+    """Read one raw message from a stream, or return None at EOF."""
+    header = stream.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    payload_len, _, topic_len, name_len, key_len = HEADER.unpack(header)
+    size = topic_len + name_len + key_len + payload_len
+    body = stream.read(size)
+    if len(body) < size:
+        return None
+    return bytearray(header) + body
+
+
+def decode(message: bytes) -> Event:
+    payload_len, event_id, topic_len, name_len, key_len = HEADER.unpack_from(message)
+    view = memoryview(message)[HEADER.size:]
+    topic = bytes(view[:topic_len]).decode()
+    name = bytes(view[topic_len:topic_len + name_len]).decode()
+    key = bytes(view[topic_len + name_len:topic_len + name_len + key_len]).decode() if key_len else None
+    payload = bytes(view[topic_len + name_len + key_len:])
+    return Event.from_payload(topic, name, payload, id=event_id or None, key=key)
+
+
+class EventTransport(ABC):
+    @abstractmethod
+    def start(self, deliver: Deliver) -> None:
+        """Start receiving; `deliver` is called once for every event that reaches this process."""
+        ...
+
+    @abstractmethod
+    def publish(self, event: Event) -> None:
+        """Send an event to every process attached to the transport, including this one."""
+        ...
+
+    def resume_after_fork(self) -> None:
+        """Resume delivery in a forked child, once the owner of `deliver` is safe to call again."""
+        pass
+
+    def close(self) -> None:
+        """Stop the transport and release its resources."""
+        pass
+
+    __repr__ = auto_repr
+
+
+class LocalTransport(EventTransport):
+    """Delivers events synchronously within the current process."""
+
+    def __init__(self) -> None:
+        self._deliver: Deliver | None = None
+
+    def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    def publish(self, event: Event) -> None:
+        self._deliver(event)
+
+
+class _HubClient:
+    """A worker connected to the hub, with the queue of messages waiting to be sent to it."""
+
+    def __init__(self, sock: socket.socket, max_pending: int) -> None:
+        self.sock = sock
+        self.pending: queue.Queue[bytes | None] = queue.Queue(max_pending)
+
+
+class UnixSocketHub:
+    """
+    Relays messages between the worker processes connected to a Unix domain socket.
+    The hub is the single source of event ids, so ids stay consistent across workers.
+
+    Each worker has its own send queue, written by its own thread, so a worker that stops reading only
+    delays itself: once `max_pending` messages are queued for it, or a send blocks for `send_timeout`
+    seconds, it is disconnected and reconnects; its broker sees the gap in event ids.
+    """
+
+    def __init__(self, path: str, max_pending: int = 1000, send_timeout: float = 5.0) -> None:
+        self.path = path
+        self.max_pending = max_pending
+        self.send_timeout = send_timeout
+        self._server: socket.socket | None = None
+        self._clients: set[_HubClient] = set()
+        self._lock = threading.Lock()
+        self._last_ids: dict[bytes, int] = {}
+
+    def bind(self) -> None:
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # Stale socket; callers hold the hub lock.
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.path)
+        self._server.listen(128)
+        logger.info(f"Event hub listening on {self.path}")
+
+    def start(self) -> None:
+        """Bind and serve from a background thread."""
+        self.bind()
+        threading.Thread(target=self.serve_forever, name='sse-hub', daemon=True).start()
+
+    def serve_forever(self) -> None:
+        if self._server is None:
+            self.bind()
+        while True:
+            try:
+                sock, _ = self._server.accept()
+            except OSError:
+                return
+            # Blocking sends give up after the timeout (reads stay blocking: an idle worker is fine).
+            seconds = int(self.send_timeout)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDTIMEO,
+                            struct.pack('ll', seconds, int((self.send_timeout - seconds) * 1e6)))
+            client = _HubClient(sock, self.max_pending)
+            with self._lock:
+                self._clients.add(client)
+            threading.Thread(target=self._relay, args=(client,), name='sse-hub-client', daemon=True).start()
+            threading.Thread(target=self._send_loop, args=(client,), name='sse-hub-sender', daemon=True).start()
+
+    def _relay(self, client: _HubClient) -> None:
+        stream = client.sock.makefile('rb')
+        try:
+            while (message := read_message(stream)) is not None:
+                self._broadcast(message)
+        except OSError:
+            pass
+        finally:
+            self._drop(client)
+
+    def _send_loop(self, client: _HubClient) -> None:
+        try:
+            while (message := client.pending.get()) is not None:
+                client.sock.sendall(message)
+        except OSError as e:
+            logger.warning(f"Event hub dropping a worker: {e}")
+        finally:
+            self._drop(client)
+
+    def _broadcast(self, message: bytearray) -> None:
+        topic_len = HEADER.unpack_from(message)[2]
+        topic = bytes(message[HEADER.size:HEADER.size + topic_len])
+        slow = []
+        # Ids are assigned and queued under the lock, so every worker receives them in order.
+        with self._lock:
+            event_id = self._last_ids.get(topic, 0) + 1
+            self._last_ids[topic] = event_id
+            struct.pack_into('!Q', message, ID_OFFSET, event_id)
+            message = bytes(message)
+            for client in self._clients:
+                try:
+                    client.pending.put_nowait(message)
+                except queue.Full:
+                    slow.append(client)
+        for client in slow:
+            logger.warning(f"Event hub dropping a worker with {self.max_pending} messages pending")
+            self._drop(client)
+
+    def _drop(self, client: _HubClient) -> None:
+        with self._lock:
+            if client not in self._clients:
+                return
+            self._clients.discard(client)
+        try:
+            client.pending.put_nowait(None)  # Wakes an idle sender
+        except queue.Full:
+            pass
+        try:
+            # Unblocks the relay's read and a sender stuck in sendall.
+            client.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        client.sock.close()
+
+    def close_inherited(self) -> None:
+        """
+        Close a forked child's copies of the hub's sockets. The hub keeps running in the parent; the child has
+        none of its threads, and must not take `_lock`, which one of them may have held at fork().
+        """
+        for sock in [self._server, *(client.sock for client in self._clients)]:
+            if sock is not None:
+                sock.close()
+        self._server = None
+        self._clients = set()
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            self._drop(client)
+
+    __repr__ = auto_repr
+
+
+class UnixSocketTransport(EventTransport):
+    """
+    Fans events out to every worker on this host through a `UnixSocketHub`.
+
+    With `embedded=True` the first worker to take the hub lock (`<path>.lock`) also runs the hub;
+    if that worker dies the others reconnect and one of them takes over.
+    """
+
+    def __init__(self, path: str, embedded: bool = True, reconnect_interval: float = 1.0) -> None:
+        self.path = path
+        self.embedded = embedded
+        self.reconnect_interval = reconnect_interval
+        self.hub: UnixSocketHub | None = None
+        self._sock: socket.socket | None = None
+        self._send_lock = threading.Lock()
+        self._connected = threading.Event()
+        self._closed = threading.Event()
+        self._deliver: Deliver | None = None
+        self._lock_file = None
+        self._resume = False
+        _transports.add(self)
+
+    def _reset_after_fork(self) -> None:
+        # The child's copies of the parent's connection, hub and lock file: writing to the shared socket would
+        # interleave frames with the parent's, and holding the lock file would keep the hub lock taken after
+        # the parent exits, so that no worker takes the hub over.
+        if self._sock is not None:
+            self._sock.close()
+        if self.hub is not None:
+            self.hub.close_inherited()
+        if self._lock_file is not None:
+            self._lock_file.close()
+        self._sock = None
+        self.hub = None
+        self._lock_file = None
+        self._send_lock = threading.Lock()
+        self._connected = threading.Event()
+        closed, self._closed = self._closed.is_set(), threading.Event()
+        if closed:
+            self._closed.set()
+        # The reader is restarted by `resume_after_fork`: it calls `_deliver`, whose broker may hold a lock
+        # taken by one of the parent's threads until the broker has reset it.
+        self._resume = not closed and self._deliver is not None
+
+    def resume_after_fork(self) -> None:
+        if self._resume:
+            self._resume = False
+            self._start_reader()
+
+    def _start_reader(self) -> None:
+        threading.Thread(target=self._run, name='sse-transport', daemon=True).start()
+
+    def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+        self._start_reader()
+        if not self._connected.wait(timeout=5):
+            logger.warning(f"Event hub at {self.path} not reachable yet; publishing locally until it is")
+
+    def publish(self, event: Event) -> None:
+        if self._connected.is_set():
+            message = encode(event)
+            try:
+                with self._send_lock:
+                    self._sock.sendall(message)
+                return
+            except OSError as e:
+                logger.error(f"Failed to forward event to hub: {e}")
+        # Degraded mode: at least reach the subscribers of this process.
+        self._deliver(event)
+
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            try:
+                self._maybe_become_hub()
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.connect(self.path)
+            except OSError as e:
+                logger.debug(f"Event hub connection failed: {e}")
+                self._closed.wait(self.reconnect_interval)
+                continue
+
+            self._sock = sock
+            self._connected.set()
+            logger.info(f"Connected to event hub at {self.path}")
+            stream = sock.makefile('rb')
+            try:
+                while (message := read_message(stream)) is not None:
+                    self._deliver(decode(message))
+            except OSError:
+                pass
+            finally:
+                self._connected.clear()
+                sock.close()
+            if not self._closed.is_set():
+                logger.warning("Lost connection to event hub, reconnecting")
+
+    def _maybe_become_hub(self) -> None:
+        if not self.embedded or self.hub is not None:
+            return
+        lock_file = open(f"{self.path}.lock", 'w')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return
+        self._lock_file = lock_file  # Held for the life of the process.
+        self.hub = UnixSocketHub(self.path)
+        self.hub.start()
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._sock is not None:
+            self._sock.close()
+        if self.hub is not None:
+            self.hub.close()
+        if self._lock_file is not None:
+            self._lock_file.close()
+
+
+# Live transports, reset in a forked child; the set holds no reference that would keep one alive.
+_transports: weakref.WeakSet[UnixSocketTransport] = weakref.WeakSet()
+
+
+def _reset_transports_after_fork() -> None:
+    """Threads do not survive fork(): a pre-forking server's workers each open their own hub connection."""
+    for transport in list(_transports):
+        transport._reset_after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_transports_after_fork)
+
+
+def create_transport(name: str, **options) -> EventTransport:
+    """Factory method to get the transport configured by `SSE_TRANSPORT`."""
+    if name == 'local':
+        return LocalTransport()
+    elif name == 'unix':
+        return UnixSocketTransport(**options)
+    else:
+        raise ValueError(f"Unsupported event transport: {name}")
@@ -19,6 +19,13 @@ class APIException(Exception):
         self.details = details
         super().__init__(self.message)
 
+    @property
+    def headers(self) -> dict[str, str]:
+        """
+        Extra response headers for this error.
+        """
+        return {}
+
     @staticmethod
     def get_default_message() -> str:
         """
@@ -96,6 +103,24 @@ class ConflictException(APIException):
         super().__init__(code=409, message=message)
 
 
+class ServiceUnavailableException(APIException):
+    """
+    Exception for temporary overload, e.g. no database connection available in time.
+
+    Args:
+        message (Optional[str]): Description of the unavailable service.
+        retry_after (Optional[int]): Seconds after which the client may retry, sent as `Retry-After`.
+    """
+
+    def __init__(self, message: Optional[str] = None, retry_after: Optional[int] = None, details=None):
+        self.retry_after = retry_after
+        super().__init__(code=503, message=message or "Service temporarily unavailable.", details=details)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {} if self.retry_after is None else {"Retry-After": str(self.retry_after)}
+
+
 class BadValueError(BadRequestException):
     def __init__(self, message: Optional[str] = None, details=None):
         super().__init__(message=message or "Bad request.", details=details)
@@ -0,0 +1,41 @@
+from datetime import datetime
+from http import HTTPStatus
+
+from flask import Response, request
+from werkzeug.http import http_date, is_resource_modified, quote_etag
+
+
+class ConditionalHandler:
+    """HTTP conditional GET: validators for a representation, and 304 responses when the client's copy is current."""
+
+    @staticmethod
+    def validators(etag: str, last_modified: datetime | None = None) -> dict:
+        """
+        Build the `ETag` (strong) and `Last-Modified` headers of a representation.
+
+        Args:
+            etag (str): Unquoted entity tag; it must change whenever the representation does.
+            last_modified (datetime | None): Time of the last change. Naive datetimes are taken as UTC.
+
+        Returns:
+            dict: Headers to add to the 200 response.
+        """
+        headers = {'ETag': quote_etag(etag)}
+        if last_modified is not None:
+            headers['Last-Modified'] = http_date(last_modified)
+        return headers
+
+    @staticmethod
+    def not_modified(etag: str, last_modified: datetime | None = None) -> Response | None:
+        """
+        Evaluate the request's `If-None-Match` (which takes precedence) and `If-Modified-Since` headers.
+
+        Returns:
+            Response | None: An empty 304 response carrying the validators if the client's copy is current,
+            otherwise None and the caller builds the full response.
+        """
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+            return None
+        return Response(status=HTTPStatus.NOT_MODIFIED, headers=ConditionalHandler.validators(etag, last_modified))
@@ -20,7 +20,7 @@ class ResponseHandler:
         Returns:
             tuple: A tuple containing the JSON response and the status code.
         """
-        # Create a Response instance
+        # Create a Response instance, encoded as is: no intermediate dict of the envelope and its data
         response = Response(
             message=message,
             status=status,
@@ -28,7 +28,7 @@ class ResponseHandler:
             timestamp=DateUtils.get_dttm_local(serialized=True)
         )
 
-        return jsonify(response.to_dict()), status
+        return jsonify(response), status
 
     @staticmethod
     def error(message: str, status: int = HTTPStatus.INTERNAL_SERVER_ERROR, response_obj: object = None,
@@ -56,4 +56,4 @@ class ResponseHandler:
             timestamp=DateUtils.get_dttm_local(serialized=True), details=details
         )
 
-        return jsonify(response.to_dict()), status
+        return jsonify(response), status
@@ -0,0 +1,102 @@
+import logging
+from typing import Iterator, Callable, Mapping
+
+from flask import Response, stream_with_context, current_app
+
+from app.events.broker import EventBroker, Subscription, SubscriptionClosed, SubscriptionFilter
+from app.exceptions.api_exception import BadRequestException
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_FRAME = b": keep-alive\n\n"
+
+
+class SSEHandler:
+    @staticmethod
+    def endpoint(topic: str, key_param: str | None = None) -> Callable:
+        """
+        Mark a view as an SSE stream of a broker topic, so the asyncio server
+        (`app.aio.server`) can serve it on its event loop instead of a worker thread.
+
+        Args:
+            topic (str): The broker topic streamed by the view.
+            key_param (str | None): Query parameter that filters the stream by event key, e.g. `user_id`.
+        """
+
+        def decorator(view: Callable) -> Callable:
+            view.sse_topic = topic
+            view.sse_key_param = key_param
+            return view
+
+        return decorator
+
+    @staticmethod
+    def subscribe(broker: EventBroker, topic: str, args: Mapping[str, str], last_event_id: str | None = None,
+                  key_param: str | None = None) -> Subscription:
+        """
+        Subscribe to a topic using the filters given on the stream URL. Requires an application context.
+
+        Supported query parameters:
+            <key_param>: Comma-separated event keys to receive, e.g. `?user_id=1,2,3`.
+            event: Comma-separated event names to receive, e.g. `?event=created`.
+            coalesce: Window in milliseconds during which updates to the same key are merged.
+        """
+        keys = SSEHandler._csv(args.get(key_param)) if key_param else None
+        events = SSEHandler._csv(args.get('event'))
+
+        coalesce = args.get('coalesce', current_app.config['SSE_COALESCE_WINDOW'])
+        try:
+            coalesce_ms = int(coalesce)
+        except (TypeError, ValueError):
+            raise BadRequestException(f"Invalid coalesce window: {coalesce!r}")
+        if not 0 <= coalesce_ms <= current_app.config['SSE_MAX_COALESCE_WINDOW']:
+            raise BadRequestException(
+                f"Coalesce window must be between 0 and {current_app.config['SSE_MAX_COALESCE_WINDOW']} ms")
+
+        return broker.subscribe(
+            topic,
+            last_event_id=int(last_event_id) if last_event_id and last_event_id.isdigit() else None,
+            filter=SubscriptionFilter(keys=keys, events=events),
+            coalesce_window=coalesce_ms / 1000,
+        )
+
+    @staticmethod
+    def _csv(value: str | None) -> frozenset[str] | None:
+        if value is None:
+            return None
+        return frozenset(item.strip() for item in value.split(',') if item.strip())
+
+    @staticmethod
+    def stream(broker: EventBroker, subscription: Subscription, heartbeat_interval: float) -> Response:
+        """
+        Generate a streaming `text/event-stream` response for a subscription.
+
+        Args:
+            broker (EventBroker): The broker the subscription belongs to.
+            subscription (Subscription): The subscription to drain.
+            heartbeat_interval (float): Seconds of inactivity after which a comment frame is sent.
+
+        Returns:
+            Response: A streaming Flask response.
+        """
+        return Response(
+            stream_with_context(SSEHandler._frames(broker, subscription, heartbeat_interval)),
+            mimetype='text/event-stream',
+            headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no',
+            }
+        )
+
+    @staticmethod
+    def _frames(broker: EventBroker, subscription: Subscription, heartbeat_interval: float) -> Iterator[bytes]:
+        try:
+            # Flush headers right away so the client sees the stream as open.
+            yield HEARTBEAT_FRAME
+            while True:
+                event = subscription.get(timeout=heartbeat_interval)
+                yield HEARTBEAT_FRAME if event is None else event.frame
+        except SubscriptionClosed as e:
+            logger.info(f"SSE stream closed by broker: {e}")
+        finally:
+            broker.unsubscribe(subscription)
@@ -0,0 +1,181 @@
+import csv
+import io
+import itertools
+import json
+from datetime import datetime
+from typing import Iterable, Iterator, Any, Sequence, Callable
+
+from flask import Response, current_app, stream_with_context
+
+from app.exceptions.api_exception import BadRequestException
+from app.utils.dttm_utils import DateUtils
+from app.utils.gzip_utils import gzip_stream
+
+_END = object()
+
+Encoder = Callable[[Sequence[str], Iterator[tuple], int], Iterator[str]]
+
+
+def _json_value(value: Any) -> str:
+    if isinstance(value, datetime):
+        return f'"{DateUtils.serialize_to_iso(value)}"'
+    return json.dumps(value)
+
+
+def encode_ndjson(columns: Sequence[str], rows: Iterator[tuple], batch_size: int) -> Iterator[str]:
+    """Encode tuple rows as newline-delimited JSON objects, `batch_size` lines per chunk."""
+    # One %-template per export: only the values are encoded per row.
+    template = '{' + ','.join(f'{json.dumps(column)}:%s' for column in columns) + '}\n'
+    batch = []
+    for row in rows:
+        batch.append(template % tuple(map(_json_value, row)))
+        if len(batch) >= batch_size:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def encode_csv(columns: Sequence[str], rows: Iterator[tuple], batch_size: int) -> Iterator[str]:
+    """Encode tuple rows as CSV with a header line, `batch_size` lines per chunk."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow([DateUtils.serialize_to_iso(value) if isinstance(value, datetime) else value
+                         for value in row])
+        count += 1
+        if count >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+EXPORT_FORMATS: dict[str, tuple[Encoder, str]] = {
+    'ndjson': (encode_ndjson, 'application/x-ndjson'),
+    'csv': (encode_csv, 'text/csv'),
+}
+
+
+def _gzip(chunks: Iterator[str], level: int) -> Iterator[bytes]:
+    return gzip_stream((chunk.encode() for chunk in chunks), level)
+
+
+class SegmentedResponse(Response):
+    """
+    A response whose body is the concatenation of `(data, deflated)` segments, where `deflated` is the data
+    already compressed with `deflate_segment` (or None), for the compression middleware to reuse.
+    """
+
+    def __init__(self, segments: Sequence[tuple[bytes, bytes | None]], **kwargs: Any) -> None:
+        super().__init__(b''.join(data for data, _ in segments), **kwargs)
+        self.segments = segments
+
+
+class StreamHandler:
+    @staticmethod
+    def ok(message: str, status: int, items: Iterable[Any], batch_size: int = 100) -> Response:
+        """
+        Generate a streaming JSON response with the same envelope as `ResponseHandler.ok`,
+        writing the `data` array element by element as `items` produces them.
+
+        The first item is pulled before the response starts, so errors raised while running
+        the underlying query still turn into regular error responses.
+
+        Args:
+            message (str): A message to include in the response.
+            status (int): The HTTP status code for the response.
+            items (Iterable): The elements of the `data` array.
+            batch_size (int): Number of encoded elements written per chunk.
+
+        Returns:
+            Response: A streaming Flask response.
+        """
+        items = iter(items)
+        first = next(items, _END)
+
+        dumps = current_app.json.dumps_bytes
+        head = StreamHandler._envelope_head(message, status)
+
+        def generate() -> Iterator[bytes]:
+            yield head
+            if first is not _END:
+                batch = [dumps(first)]
+                separator = b''
+                for item in items:
+                    batch.append(dumps(item))
+                    if len(batch) >= batch_size:
+                        yield separator + b','.join(batch)
+                        batch, separator = [], b','
+                if batch:
+                    yield separator + b','.join(batch)
+            yield b']}'
+
+        return Response(stream_with_context(generate()), status=status, mimetype='application/json')
+
+    @staticmethod
+    def _envelope_head(message: str, status: int) -> bytes:
+        """The envelope of `ResponseHandler.ok` up to and including the opening bracket of `data`."""
+        envelope = current_app.json.dumps_bytes({
+            "timestamp": DateUtils.get_dttm_local(serialized=True),
+            "status": status,
+            "message": message,
+        })
+        return envelope[:-1] + b',"data":['
+
+    @staticmethod
+    def encode_items(items: Iterable[Any]) -> bytes:
+        """Encode the elements of a `data` array exactly as `ok` writes them, for `prebuilt`."""
+        return b','.join(map(current_app.json.dumps_bytes, items))
+
+    @staticmethod
+    def prebuilt(message: str, status: int, data: bytes, headers: dict | None = None,
+                 deflated: bytes | None = None) -> Response:
+        """
+        Generate the same response as `ok` from elements already encoded by `encode_items`:
+        only the envelope (and its timestamp) is built per request. `deflated`, the elements
+        compressed with `deflate_segment`, spares the compression middleware from compressing them again.
+        """
+        segments = [(StreamHandler._envelope_head(message, status), None), (data, deflated), (b']}', None)]
+        return SegmentedResponse(segments, status=status, mimetype='application/json', headers=headers)
+
+    @staticmethod
+    def export(rows: Iterable[tuple], columns: Sequence[str], fmt: str, filename: str,
+               gzip: bool = False, gzip_level: int = 6, batch_size: int = 1000) -> Response:
+        """
+        Generate a streaming file download from tuple rows, encoded as they are read.
+
+        Args:
+            rows (Iterable[tuple]): Row values in `columns` order.
+            columns (Sequence[str]): Column names, used as NDJSON keys and the CSV header.
+            fmt (str): One of `EXPORT_FORMATS` (`ndjson` or `csv`).
+            filename (str): Base name of the downloaded file, without extension.
+            gzip (bool): Whether to gzip the body on the fly.
+            gzip_level (int): zlib compression level.
+            batch_size (int): Number of rows written per chunk.
+
+        Returns:
+            Response: A streaming Flask response.
+
+        Raises:
+            BadRequestException: If the format is not supported.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise BadRequestException(f"Unsupported export format {fmt!r}, expected one of {list(EXPORT_FORMATS)}")
+        encoder, mimetype = EXPORT_FORMATS[fmt]
+
+        rows = iter(rows)
+        first = next(rows, _END)
+        if first is not _END:
+            rows = itertools.chain((first,), rows)
+
+        chunks = encoder(columns, rows, batch_size)
+        headers = {'Content-Disposition': f'attachment; filename="{filename}.{fmt}"'}
+        if gzip:
+            chunks = _gzip(chunks, gzip_level)
+            headers['Content-Encoding'] = 'gzip'
+        return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
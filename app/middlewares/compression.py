@@ -0,0 +1,83 @@
+"""compression.py
+
+gzip response compression, negotiated through `Accept-Encoding`.
+"""
+
+import zlib
+from typing import Collection
+
+from flask import Flask, Response, request
+
+from app.handlers.stream_handler import SegmentedResponse
+from app.utils.gzip_utils import gzip_segments, gzip_stream
+
+
+def _accepts_gzip() -> bool:
+    return request.accept_encodings.quality('gzip') > 0
+
+
+def _weaken_etag(response: Response) -> None:
+    # A strong ETag identifies exact bytes, and the gzipped bytes differ from the identity ones.
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def _compress_stream(response: Response, level: int) -> None:
+    chunks = response.iter_encoded()
+    original = response.response
+
+    def generate():
+        try:
+            yield from gzip_stream(chunks, level)
+        finally:
+            # The server closes our generator; pass that on, e.g. to release a cursor or a request context.
+            if hasattr(original, 'close'):
+                original.close()
+
+    response.response = generate()
+    response.headers.pop('Content-Length', None)
+
+
+def compress(response: Response, level: int, min_size: int, mimetypes: Collection[str]) -> Response:
+    """
+    gzip `response` if it is a successful response of a compressible type and the client accepts gzip.
+
+    Buffered bodies are compressed when at least `min_size` bytes long; a `SegmentedResponse` reuses its
+    precompressed segments. Streamed bodies (whose size is unknown) are compressed incrementally as they are
+    sent. Types outside `mimetypes`, such as `text/event-stream`, are never compressed: an SSE frame must reach
+    the client when it is written, not when the compressor fills a block.
+    """
+    if response.mimetype not in mimetypes:
+        return response
+    response.vary.add('Accept-Encoding')
+    if (response.status_code < 200 or response.status_code in (204, 304) or request.method == 'HEAD'
+            or 'Content-Encoding' in response.headers or response.direct_passthrough or not _accepts_gzip()):
+        return response
+
+    if response.is_streamed:
+        _compress_stream(response, level)
+    else:
+        size = response.calculate_content_length()
+        if size is None or size < min_size:
+            return response
+        if isinstance(response, SegmentedResponse):
+            body = gzip_segments(response.segments, level)
+        else:
+            body = zlib.compress(response.get_data(), level, wbits=zlib.MAX_WBITS | 16)
+        response.set_data(body)
+    response.headers['Content-Encoding'] = 'gzip'
+    _weaken_etag(response)
+    return response
+
+
+def init_app(app: Flask) -> None:
+    if not app.config['COMPRESSION_ENABLED']:
+        return
+    level = app.config['COMPRESSION_LEVEL']
+    min_size = app.config['COMPRESSION_MIN_SIZE']
+    mimetypes = frozenset(app.config['COMPRESSION_MIMETYPES'])
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        return compress(response, level, min_size, mimetypes)
@@ -1,10 +1,12 @@
 import logging
 
 import werkzeug
-from flask import request
+from flask import request, current_app
 
-from app.exceptions.api_exception import APIException
+from app.database.database_client import PoolExhaustedError
+from app.exceptions.api_exception import APIException, ServiceUnavailableException
 from app.handlers.response_handler import ResponseHandler
+from app.utils.single_flight import SingleFlightTimeout
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +24,22 @@ def init_app(app):
         else:
             logger.error(ex, exc_info=False)
 
-        return ResponseHandler.error(message=ex.message, status=ex.code, details=ex.details)
+        response, status = ResponseHandler.error(message=ex.message, status=ex.code, details=ex.details)
+        return response, status, ex.headers
+
+    @app.errorhandler(PoolExhaustedError)
+    @app.errorhandler(SingleFlightTimeout)
+    def handle_pool_exhausted(ex: PoolExhaustedError | SingleFlightTimeout):
+        """
+        Handles database pool exhaustion: waited `timeout` for a connection,
+        or refused at once because `max_waiting` requests are already queued.
+        Also handles a coalesced read that waited too long for the identical query in flight.
+        """
+        return handle_api_exception(ServiceUnavailableException(
+            "The service is overloaded, please retry later.",
+            retry_after=current_app.config['DB_OVERLOAD_RETRY_AFTER'],
+            details=str(ex),
+        ))
 
     @app.errorhandler(werkzeug.exceptions.HTTPException)
     def handle_http_exception(ex: werkzeug.exceptions.HTTPException):
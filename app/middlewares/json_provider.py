@@ -1,34 +1,48 @@
 import json
-from datetime import datetime
 from typing import Any
 
+from flask import Flask, Response
 from flask.json.provider import DefaultJSONProvider
 
-from app.core.base_model import BaseModel
-from app.utils.dttm_utils import DateUtils
+from app.serialization.encoders import to_json_native
+from app.serialization.json_codec import JSONCodec, AUTO
 
 
 class ComplexJSONEncoder(json.JSONEncoder):
     """
-    Custom JSON encoder to handle complex types like datetime, custom objects,
-    and nested structures (lists and dictionaries).
+    Custom JSON encoder to handle complex types like datetime, models and DTOs, and other custom objects,
+    see `to_json_native`.
     """
 
     def default(self, obj: Any) -> Any:
-        # print(f"{obj=}, {type(obj)=}")
-        if isinstance(obj, BaseModel):
-            return obj.to_dict()
-        elif isinstance(obj, datetime):
-            return DateUtils.serialize_to_iso(obj)
-        elif hasattr(obj, '__dict__'):
-            return {k: self.default(v) for k, v in vars(obj).items()}
-        elif isinstance(obj, list):
-            return [self.default(item) for item in obj]
-        elif isinstance(obj, dict):
-            return {k: self.default(v) for k, v in obj.items()}
-        return super().default(obj)
+        return to_json_native(obj)
 
 
 class AppJSONProvider(DefaultJSONProvider):
-    def dumps(self, obj, **kwargs):
-        return json.dumps(obj, **kwargs, cls=ComplexJSONEncoder)
+    """
+    Flask JSON provider backed by `JSONCodec` (orjson when installed, see the `JSON_ENCODER` setting).
+    Responses are encoded straight to bytes; debug responses are indented, as with Flask's provider.
+    """
+
+    def __init__(self, app: Flask) -> None:
+        super().__init__(app)
+        self.codec = JSONCodec(app.config.get('JSON_ENCODER', AUTO))
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return json.dumps(obj, **kwargs, cls=ComplexJSONEncoder)
+        return self.codec.dumps(obj).decode()
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """Encode `obj` as compact UTF-8 JSON."""
+        return self.codec.dumps(obj)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return self.codec.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self.codec.dumps(obj, indent=indent) + b"\n", mimetype=self.mimetype)
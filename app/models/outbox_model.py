@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.core.base_model import BaseModel
+
+
+@dataclass
+class OutboxModel(BaseModel):
+    id: int
+    topic: str
+    event_type: str
+    event_key: str | None
+    payload: str
+    created_at: datetime
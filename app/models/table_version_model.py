@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.core.base_model import BaseModel
+
+
+@dataclass
+class TableVersionModel(BaseModel):
+    table_name: str
+    version: int
+    updated_at: datetime
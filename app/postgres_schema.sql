@@ -11,6 +11,36 @@ CREATE TABLE users
     created_at TIMESTAMP        DEFAULT NOW() -- Timestamp when the user was created
 );
 
+-- Drop the outbox table if it already exists
+DROP TABLE IF EXISTS outbox;
+
+-- Create the outbox table: events written in the same transaction as the change they describe,
+-- drained by the outbox dispatcher (app/events/outbox_dispatcher.py)
+CREATE TABLE outbox
+(
+    id         BIGSERIAL PRIMARY KEY,       -- Dispatch order
+    topic      TEXT NOT NULL,               -- Broker topic, e.g. 'users'
+    event_type TEXT NOT NULL,               -- SSE event name, e.g. 'created'
+    event_key  TEXT,                        -- Identity of the changed record, used for filtering
+    payload    TEXT NOT NULL,               -- JSON-encoded event data
+    created_at TIMESTAMP DEFAULT NOW()      -- Timestamp when the event was recorded
+);
+
+-- Drop the table_versions table if it already exists
+DROP TABLE IF EXISTS table_versions;
+
+-- Create the table_versions table: a counter per table, bumped by every transaction that writes the table;
+-- the source of the ETag / Last-Modified validators of collection responses
+CREATE TABLE table_versions
+(
+    table_name TEXT PRIMARY KEY,   -- e.g. 'users'
+    version    BIGINT    NOT NULL, -- Incremented on every write
+    updated_at TIMESTAMP NOT NULL  -- Time of the last write (UTC)
+);
+
+INSERT INTO table_versions (table_name, version, updated_at)
+VALUES ('users', 1, NOW() AT TIME ZONE 'UTC');
+
 -- Insert sample data into the users table
 INSERT INTO users (username, email, is_active)
 VALUES ('alice_smith', 'alice.smith@example.com', TRUE),
@@ -0,0 +1,94 @@
+import logging
+
+from app.core.base_repository import BaseRepository
+from ..database.async_database_client import AsyncDatabaseClient
+from ..database.db import async_repository_db
+from ..dto.user_dto import UserRequest
+from ..models.user_model import UserModel
+from .outbox_repository import AsyncOutboxRepository
+from .table_version_repository import AsyncTableVersionRepository
+from .user_repository import USERS_TOPIC, USERS_TABLE, USER_COLUMNS, USER_SELECT
+from ..utils.logging_utils import log
+from ..utils.singleton_decorator import singleton
+
+logger = logging.getLogger(__name__)
+
+
+@singleton
+class AsyncUserRepository(BaseRepository):
+    """Awaitable counterpart of `UserRepository`, used when `DATA_ACCESS_MODE` is `async`."""
+
+    class Meta:
+        __model__ = UserModel
+
+    def __init__(self, db_client: AsyncDatabaseClient = None, outbox_repository: AsyncOutboxRepository = None,
+                 table_version_repository: AsyncTableVersionRepository = None):
+        self.db: AsyncDatabaseClient = async_repository_db if db_client is None else db_client
+        self.outbox: AsyncOutboxRepository = AsyncOutboxRepository(self.db) if outbox_repository is None \
+            else outbox_repository
+        self.versions: AsyncTableVersionRepository = AsyncTableVersionRepository(self.db) \
+            if table_version_repository is None else table_version_repository
+
+    @log(include_time=True)
+    async def get_all_users(self) -> list[UserModel]:
+        try:
+            result = await self.db.fetch_all(USER_SELECT, as_tuples=True)
+            return self.map_to_model(result, model_cls=self.Meta.__model__, many=True, columns=USER_COLUMNS)
+        except Exception as e:
+            logger.error(f"Error fetching all users: {e}")
+            raise
+
+    @log(include_time=True)
+    async def get_users_page(self, after_id: int | None, limit: int) -> list[UserModel]:
+        """Keyset pagination: the first `limit` users with an id greater than `after_id`."""
+        query = f"{USER_SELECT} WHERE id > %s ORDER BY id LIMIT %s"
+        try:
+            result = await self.db.fetch_all(query, (after_id or 0, limit), as_tuples=True)
+            return self.map_to_model(result, model_cls=self.Meta.__model__, many=True, columns=USER_COLUMNS)
+        except Exception as e:
+            logger.error(f"Error fetching users page after ID {after_id}: {e}")
+            raise
+
+    @log(include_time=True)
+    async def get_user_by_id(self, user_id: int) -> UserModel | None:
+        try:
+            result = await self.db.fetch_one(f"{USER_SELECT} WHERE id = %s", (user_id,), as_tuples=True)
+            return self.map_to_model(result, model_cls=self.Meta.__model__, columns=USER_COLUMNS) if result else None
+        except Exception as e:
+            logger.error(f"Error fetching user by ID {user_id}: {e}")
+            raise
+
+    @log(include_time=True)
+    async def create_user(self, new_user: UserRequest) -> UserModel | None:
+        username, email = new_user
+        query = """
+            INSERT INTO users (username, email, is_active) VALUES (%s, %s, %s)
+            RETURNING id, username, email, is_active, created_at
+        """
+        try:
+            async with self.db.transaction():
+                new_user = await self.db.execute_returning(query, (username, email, True))
+
+                if not new_user:
+                    raise ValueError(f"Insert returned no row for {username=}, {email=}")
+
+                user = self.map_to_model(new_user, model_cls=self.Meta.__model__)
+                await self.outbox.add(USERS_TOPIC, "created", user, key=user.id)
+                await self.versions.bump(USERS_TABLE)
+            return user
+        except Exception as e:
+            logger.error(f"Error creating user {username}: {e}")
+            raise
+
+    @log(include_time=True)
+    async def delete_user(self, user_id: int) -> bool:
+        query = "DELETE FROM users WHERE id = %s"
+        try:
+            async with self.db.transaction():
+                if await self.db.execute(query, (user_id,)):
+                    await self.outbox.add(USERS_TOPIC, "deleted", {"id": user_id}, key=user_id)
+                    await self.versions.bump(USERS_TABLE)
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting user with ID {user_id}: {e}")
+            raise
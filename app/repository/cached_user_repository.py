@@ -0,0 +1,74 @@
+import logging
+from typing import Iterator, Sequence, Tuple
+
+from ..cache.tiered_cache import TieredCache
+from ..cache.ttl_cache import MISSING
+from ..dto.user_dto import UserRequest
+from ..models.table_version_model import TableVersionModel
+from ..models.user_model import UserModel
+from .user_repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+class CachedUserRepository:
+    """
+    Read-through cache in front of `UserRepository`.
+
+    `get_user_by_id` is answered from the cache when possible. Lookups that find no user are cached as well, for
+    `negative_ttl` seconds, so repeated requests for unknown ids do not reach the database. Writes go straight to
+    the repository and then invalidate the ids they touched; a lookup that raced with an invalidation, in this
+    process or another, is not stored (see `TieredCache.set`). Listing, paging and export always read the database.
+    """
+
+    def __init__(self, repository: UserRepository, cache: TieredCache, negative_ttl: float = 5) -> None:
+        self.repository = repository
+        self.cache = cache
+        self.negative_ttl = negative_ttl
+
+    def get_all_users(self) -> list[UserModel]:
+        return self.repository.get_all_users()
+
+    def get_users_page(self, after_id: int | None, limit: int) -> list[UserModel]:
+        return self.repository.get_users_page(after_id, limit)
+
+    def iter_all_users(self, chunk_size: int = 1000) -> Iterator[UserModel]:
+        return self.repository.iter_all_users(chunk_size=chunk_size)
+
+    def iter_user_rows(self, chunk_size: int = 1000) -> Iterator[tuple]:
+        return self.repository.iter_user_rows(chunk_size=chunk_size)
+
+    def get_version(self) -> TableVersionModel | None:
+        return self.repository.get_version()
+
+    def get_user_by_id(self, user_id: int) -> UserModel | None:
+        user = self.cache.get(user_id)
+        if user is not MISSING:
+            return user
+        epoch, generation = self.cache.epoch, self.cache.generation(user_id)
+        user = self.repository.get_user_by_id(user_id)
+        self.cache.set(user_id, user, ttl=None if user is not None else self.negative_ttl,
+                       epoch=epoch, generation=generation)
+        return user
+
+    def create_user(self, new_user: UserRequest) -> UserModel | None:
+        user = self.repository.create_user(new_user)
+        if user is not None:
+            # Drops a cached "not found" for the new id.
+            self.cache.delete(user.id)
+        return user
+
+    def bulk_create_users(self, new_users: Sequence[UserRequest]) -> Tuple[list[UserModel], set[str]]:
+        users, existing = self.repository.bulk_create_users(new_users)
+        for user in users:
+            self.cache.delete(user.id)
+        return users, existing
+
+    def delete_user(self, user_id: int) -> bool:
+        try:
+            return self.repository.delete_user(user_id)
+        finally:
+            self.cache.delete(user_id)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(repository={self.repository!r}, cache={self.cache!r})"
@@ -0,0 +1,72 @@
+import json
+import logging
+from typing import Any, Iterable, Tuple
+
+from app.core.base_repository import BaseRepository
+from ..database.async_database_client import AsyncDatabaseClient
+from ..database.database_client import DatabaseClient
+from ..database.db import repository_db, async_repository_db
+from ..middlewares.json_provider import ComplexJSONEncoder
+from ..models.outbox_model import OutboxModel
+from ..utils.singleton_decorator import singleton
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_INSERT = "INSERT INTO outbox (topic, event_type, event_key, payload) VALUES (%s, %s, %s, %s)"
+OUTBOX_COLUMNS = ("id", "topic", "event_type", "event_key", "payload", "created_at")
+
+
+def _outbox_row(topic: str, event_type: str, data: Any, key: Any) -> Tuple[str, str, str | None, str]:
+    payload = json.dumps(data, cls=ComplexJSONEncoder, separators=(',', ':'))
+    return topic, event_type, None if key is None else str(key), payload
+
+
+@singleton
+class OutboxRepository(BaseRepository):
+    class Meta:
+        __model__ = OutboxModel
+
+    def __init__(self, db_client: DatabaseClient = None):
+        self.db: DatabaseClient = repository_db if db_client is None else db_client
+
+    def add(self, topic: str, event_type: str, data: Any, key: Any = None) -> None:
+        """
+        Record an event. Call inside the transaction that makes the change the event describes,
+        so the two are committed (or lost) together.
+        """
+        self.db.execute(OUTBOX_INSERT, _outbox_row(topic, event_type, data, key))
+
+    def add_many(self, topic: str, event_type: str, events: Iterable[Tuple[Any, Any]]) -> int:
+        """Record one event per `(key, data)` pair with a single bulk write. Same transaction rules as `add`."""
+        rows = (_outbox_row(topic, event_type, data, key) for key, data in events)
+        return self.db.bulk_insert("outbox", ("topic", "event_type", "event_key", "payload"), rows)
+
+    def claim_batch(self, limit: int) -> list[OutboxModel]:
+        """
+        Remove and return up to `limit` pending events, oldest first. Must run inside a transaction:
+        the rows come back if it rolls back, and rows claimed by a concurrent dispatcher are skipped.
+        """
+        query = f"""
+            DELETE FROM outbox
+            WHERE id IN (SELECT id FROM outbox ORDER BY id LIMIT %s {self.db.dialect.skip_locked})
+            RETURNING {', '.join(OUTBOX_COLUMNS)}
+        """
+        try:
+            result = self.db.fetch_all(query, (limit,), as_tuples=True)
+            rows = self.map_to_model(result, model_cls=self.Meta.__model__, many=True, columns=OUTBOX_COLUMNS)
+            return sorted(rows, key=lambda row: row.id)
+        except Exception as e:
+            logger.error(f"Error claiming outbox batch: {e}")
+            raise
+
+
+@singleton
+class AsyncOutboxRepository(BaseRepository):
+    """Write side of the outbox for the async data-access path; the dispatcher keeps using `OutboxRepository`."""
+
+    def __init__(self, db_client: AsyncDatabaseClient = None):
+        self.db: AsyncDatabaseClient = async_repository_db if db_client is None else db_client
+
+    async def add(self, topic: str, event_type: str, data: Any, key: Any = None) -> None:
+        """Record an event. Same transaction rules as `OutboxRepository.add`."""
+        await self.db.execute(OUTBOX_INSERT, _outbox_row(topic, event_type, data, key))
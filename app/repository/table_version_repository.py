@@ -0,0 +1,64 @@
+import logging
+from datetime import datetime, timezone
+from typing import Tuple
+
+from app.core.base_repository import BaseRepository
+from ..database.async_database_client import AsyncDatabaseClient
+from ..database.database_client import DatabaseClient
+from ..database.db import repository_db, async_repository_db
+from ..database.dialect import Dialect
+from ..models.table_version_model import TableVersionModel
+from ..utils.singleton_decorator import singleton
+
+logger = logging.getLogger(__name__)
+
+TABLE_VERSION_COLUMNS = ("table_name", "version", "updated_at")
+# Both backends share the ON CONFLICT syntax; the client's dialect translates the placeholders.
+TABLE_VERSION_BUMP = Dialect().upsert(
+    "table_versions", TABLE_VERSION_COLUMNS, ("table_name",),
+    {"version": "table_versions.version + 1", "updated_at": "excluded.updated_at"})
+
+
+def _bump_params(table: str) -> Tuple[str, int, datetime]:
+    # Stored as naive UTC, like the other TIMESTAMP columns are read back.
+    return table, 1, datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@singleton
+class TableVersionRepository(BaseRepository):
+    """
+    Per-table change counters. Every transaction that writes a table calls `bump` for it, so the version and
+    `updated_at` identify the table's contents: a cheap, single-row read that tells whether anything changed.
+    """
+
+    class Meta:
+        __model__ = TableVersionModel
+
+    def __init__(self, db_client: DatabaseClient = None):
+        self.db: DatabaseClient = repository_db if db_client is None else db_client
+
+    def bump(self, table: str) -> None:
+        """Record a write to `table`. Call inside the transaction that writes it, so both commit together."""
+        self.db.execute(TABLE_VERSION_BUMP, _bump_params(table))
+
+    def get(self, table: str) -> TableVersionModel | None:
+        query = f"SELECT {', '.join(TABLE_VERSION_COLUMNS)} FROM table_versions WHERE table_name = %s"
+        try:
+            result = self.db.fetch_one(query, (table,), as_tuples=True)
+            return self.map_to_model(result, model_cls=self.Meta.__model__, columns=TABLE_VERSION_COLUMNS) \
+                if result else None
+        except Exception as e:
+            logger.error(f"Error fetching the version of table {table}: {e}")
+            raise
+
+
+@singleton
+class AsyncTableVersionRepository(BaseRepository):
+    """Write side of the table versions for the async data-access path."""
+
+    def __init__(self, db_client: AsyncDatabaseClient = None):
+        self.db: AsyncDatabaseClient = async_repository_db if db_client is None else db_client
+
+    async def bump(self, table: str) -> None:
+        """Record a write to `table`. Same transaction rules as `TableVersionRepository.bump`."""
+        await self.db.execute(TABLE_VERSION_BUMP, _bump_params(table))
@@ -1,40 +1,85 @@
 import logging
+from typing import Any, Callable, Iterator, Sequence, Tuple
 
 from app.core.base_repository import BaseRepository
 from ..database.database_client import DatabaseClient
-from ..database.db import pg_db
+from ..database.db import repository_db
 from ..dto.user_dto import UserRequest
 from ..models.user_model import UserModel
+from ..models.table_version_model import TableVersionModel
+from .outbox_repository import OutboxRepository
+from .table_version_repository import TableVersionRepository
 from ..utils.logging_utils import log
-from ..utils.singleton_decorator import singleton
+from ..utils.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+USERS_TOPIC = "users"
+USERS_TABLE = "users"
+# Column order of every users SELECT below, which their rows are fetched as tuples in.
+USER_COLUMNS = ("id", "username", "email", "is_active", "created_at")
+USER_SELECT = f"SELECT {', '.join(USER_COLUMNS)} FROM users"
+
 
-@singleton
 class UserRepository(BaseRepository):
     class Meta:
         __model__ = UserModel
 
-    def __init__(self, db_client: DatabaseClient = None):
-        self.db: DatabaseClient = pg_db if db_client is None else db_client
+    def __init__(self, db_client: DatabaseClient = None, outbox_repository: OutboxRepository = None,
+                 single_flight: SingleFlight = None, table_version_repository: TableVersionRepository = None):
+        self.db: DatabaseClient = repository_db if db_client is None else db_client
+        self.outbox: OutboxRepository = OutboxRepository(self.db) if outbox_repository is None else outbox_repository
+        self.versions: TableVersionRepository = TableVersionRepository(self.db) if table_version_repository is None \
+            else table_version_repository
+        # Coalesces identical concurrent lookups into one query; None runs every lookup.
+        self.single_flight: SingleFlight | None = single_flight
+
+    def _coalesced(self, fetch: Callable[..., Any], query: str, params: tuple, **options: Any) -> Any:
+        """Run a read, sharing it with concurrent callers running the same statement with the same parameters."""
+        if self.single_flight is None:
+            return fetch(query, params, **options)
+        key = (fetch.__name__, query, params, tuple(sorted(options.items())))
+        return self.single_flight.do(key, lambda: fetch(query, params, **options))
 
     @log(include_time=True)
     def get_all_users(self) -> list[UserModel]:
-        query = "SELECT id, username, email, is_active, created_at FROM users"
         try:
-            result = self.db.fetch_all(query)
-            return self.map_to_model(result, model_cls=self.Meta.__model__, many=True)
+            result = self.db.fetch_all(USER_SELECT, as_tuples=True)
+            return self.map_to_model(result, model_cls=self.Meta.__model__, many=True, columns=USER_COLUMNS)
         except Exception as e:
             logger.error(f"Error fetching all users: {e}")
             raise
 
+    @log(include_time=True)
+    def get_users_page(self, after_id: int | None, limit: int) -> list[UserModel]:
+        """Keyset pagination: the first `limit` users with an id greater than `after_id`."""
+        query = f"{USER_SELECT} WHERE id > %s ORDER BY id LIMIT %s"
+        try:
+            result = self._coalesced(self.db.fetch_all, query, (after_id or 0, limit), as_tuples=True)
+            return self.map_to_model(result, model_cls=self.Meta.__model__, many=True, columns=USER_COLUMNS)
+        except Exception as e:
+            logger.error(f"Error fetching users page after ID {after_id}: {e}")
+            raise
+
+    def iter_all_users(self, chunk_size: int = 1000) -> Iterator[UserModel]:
+        """Stream every user in id order, holding at most `chunk_size` rows in memory."""
+        map_row = self.Meta.__model__.row_mapper(USER_COLUMNS).map_row
+        for row in self.iter_user_rows(chunk_size=chunk_size):
+            yield map_row(row)
+
+    def iter_user_rows(self, chunk_size: int = 1000) -> Iterator[tuple]:
+        """Stream every user as a raw tuple in `USER_COLUMNS` order, without building models."""
+        return self.db.stream(f"{USER_SELECT} ORDER BY id", chunk_size=chunk_size, as_tuples=True)
+
+    def get_version(self) -> TableVersionModel | None:
+        """The change counter of the users table, bumped by every write below."""
+        return self.versions.get(USERS_TABLE)
+
     @log(include_time=True)
     def get_user_by_id(self, user_id: int) -> UserModel | None:
-        query = "SELECT id, username, email, is_active, created_at FROM users WHERE id = %s"
         try:
-            result = self.db.fetch_one(query, (user_id,))
-            return self.map_to_model(result, model_cls=self.Meta.__model__) if result else None
+            result = self._coalesced(self.db.fetch_one, f"{USER_SELECT} WHERE id = %s", (user_id,), as_tuples=True)
+            return self.map_to_model(result, model_cls=self.Meta.__model__, columns=USER_COLUMNS) if result else None
         except Exception as e:
             logger.error(f"Error fetching user by ID {user_id}: {e}")
             raise
@@ -42,31 +87,65 @@ class UserRepository(BaseRepository):
     @log(include_time=True)
     def create_user(self, new_user: UserRequest) -> UserModel | None:
         username, email = new_user
-        query = "INSERT INTO users (username, email, is_active) VALUES (%s, %s, %s)  RETURNING id"
+        query = """
+            INSERT INTO users (username, email, is_active) VALUES (%s, %s, %s)
+            RETURNING id, username, email, is_active, created_at
+        """
         try:
-            self.db.execute(query, (username, email, True))
+            with self.db.transaction():
+                new_user = self.db.execute_returning(query, (username, email, True))
 
-            get_user_q = "SELECT id, username, email, is_active, created_at FROM users WHERE username = %s AND email = %s"
+                if not new_user:
+                    raise ValueError(f"Insert returned no row for {username=}, {email=}")
 
-            new_user = self.db.fetch_one(get_user_q, (username, email))
+                user = self.map_to_model(new_user, model_cls=self.Meta.__model__)
+                self.outbox.add(USERS_TOPIC, "created", user, key=user.id)
+                self.versions.bump(USERS_TABLE)
+            return user
+        except Exception as e:
+            logger.error(f"Error creating user {username}: {e}")
+            raise
 
-            if not new_user:
-                raise ValueError(f"Could not retrieve user ID after insertion for {username=}, {email=}")
+    @log(include_time=True)
+    def bulk_create_users(self, new_users: Sequence[UserRequest]) -> Tuple[list[UserModel], set[str]]:
+        """
+        Insert a batch of users in one transaction, together with their `created` outbox events.
+        Users whose email is already taken are skipped instead of failing the whole batch.
 
-            return self.map_to_model(new_user, model_cls=self.Meta.__model__) if new_user else None
+        Returns:
+            Tuple[list[UserModel], set[str]]: The created users, and the emails that already existed.
+        """
+        try:
+            with self.db.transaction():
+                existing = {email for email, in self.db.fetch_all(
+                    f"SELECT email FROM users WHERE email IN ({self.db.dialect.placeholders(len(new_users))})",
+                    tuple(user.email for user in new_users), as_tuples=True)}
+                pending = [user for user in new_users if user.email not in existing]
+                if not pending:
+                    return [], existing
+
+                self.db.bulk_insert("users", ("username", "email", "is_active"),
+                                    ((user.username, user.email, True) for user in pending))
+                placeholders = self.db.dialect.placeholders(len(pending))
+                result = self.db.fetch_all(f"{USER_SELECT} WHERE email IN ({placeholders}) ORDER BY id",
+                                           tuple(user.email for user in pending), as_tuples=True)
+                users = self.map_to_model(result, model_cls=self.Meta.__model__, many=True, columns=USER_COLUMNS)
+                self.outbox.add_many(USERS_TOPIC, "created", ((user.id, user) for user in users))
+                self.versions.bump(USERS_TABLE)
+            return users, existing
         except Exception as e:
-            logger.error(f"Error creating user {username}: {e}")
+            logger.error(f"Error bulk creating {len(new_users)} users: {e}")
             raise
 
     @log(include_time=True)
     def delete_user(self, user_id: int) -> bool:
         query = "DELETE FROM users WHERE id = %s"
         try:
-            self.db.execute(query, (user_id,))
-            self.db.connection.commit()
+            with self.db.transaction():
+                if self.db.execute(query, (user_id,)):
+                    self.outbox.add(USERS_TOPIC, "deleted", {"id": user_id}, key=user_id)
+                    self.versions.bump(USERS_TABLE)
             return True
         except Exception as e:
             logger.error(f"Error deleting user with ID {user_id}: {e}")
-            self.db.connection.rollback()
-
             raise
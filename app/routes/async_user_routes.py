@@ -0,0 +1,69 @@
+"""async_user_routes.py
+
+`async def` versions of the single-row user endpoints, installed by `init_app` when `DATA_ACCESS_MODE` is
+`async`. They keep the URLs and endpoint names of `user_routes`; listing, export, SSE and bulk import are
+streaming or COPY-bound and stay on the sync path.
+
+There is no user cache or single-flight in front of `AsyncUserRepository`: every lookup is a query. Writes
+still invalidate this worker's users snapshot, which the sync listing serves.
+"""
+
+import logging
+from http import HTTPStatus
+
+from flask import request
+from werkzeug.local import LocalProxy
+
+from ..aio.background_loop import BackgroundLoop
+from ..dto.user_dto import UserRequest
+from ..handlers.conditional_handler import ConditionalHandler
+from ..handlers.response_handler import ResponseHandler
+from ..repository.async_user_repository import AsyncUserRepository
+from ..services.async_user_service import AsyncUserService
+from ..utils.logging_utils import log
+from .user_routes import _invalidate_users_snapshot, _user_validators
+
+user_service = LocalProxy(lambda: AsyncUserService(user_repository=AsyncUserRepository()))
+
+
+@log(level=logging.INFO, include_time=True)
+async def get_user(user_id):
+    user = await user_service.get_user(user_id)
+    validators = _user_validators(user)
+    if not_modified := ConditionalHandler.not_modified(*validators):
+        return not_modified
+    response, status = ResponseHandler.ok("OK", status=HTTPStatus.OK, response_obj=user)
+    return response, status, ConditionalHandler.validators(*validators)
+
+
+@log(level=logging.INFO, include_time=True)
+async def create_user():
+    data = request.get_json()
+    user = UserRequest(**data)
+    user_out = await user_service.create_user(user)
+    _invalidate_users_snapshot()
+    return ResponseHandler.ok("CREATED", status=HTTPStatus.CREATED, response_obj=user_out)
+
+
+@log(level=logging.INFO, include_time=True)
+async def delete_user(user_id):
+    success = await user_service.delete_user(user_id)
+    _invalidate_users_snapshot()
+    return ResponseHandler.ok("ACCEPTED", status=HTTPStatus.ACCEPTED, response_obj=success)
+
+
+ASYNC_VIEWS = {
+    'api.users.get_user': get_user,
+    'api.users.create_user': create_user,
+    'api.users.delete_user': delete_user,
+}
+
+
+def init_app(app):
+    """Swap the sync views for the async ones. Call after the blueprints are registered."""
+    for endpoint, view in ASYNC_VIEWS.items():
+        if endpoint not in app.view_functions:
+            raise RuntimeError(f"Endpoint {endpoint} is not registered; register the user blueprint first")
+        app.view_functions[endpoint] = view
+    # Run async views on the loop that owns the async connection pool (no asgiref, no loop per request).
+    app.async_to_sync = BackgroundLoop().async_to_sync
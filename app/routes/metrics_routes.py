@@ -0,0 +1,44 @@
+from http import HTTPStatus
+
+from flask import Blueprint, current_app
+
+from ..cache.user_cache import USER_CACHE
+from ..database.db import repository_db, async_repository_db
+from ..handlers.response_handler import ResponseHandler
+from .user_routes import USERS_SNAPSHOT
+from ..utils.single_flight import SINGLE_FLIGHT
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/pool', methods=['GET'])
+def get_pool_stats():
+    """
+    Live connection-pool statistics of the repository database: size, idle (`pool_available`), queued
+    checkouts (`requests_waiting`), counters since start-up and a histogram of checkout waits in ms.
+    """
+    stats = {repository_db.dialect.name: repository_db.pool_stats()}
+    if current_app.config['DATA_ACCESS_MODE'] == 'async':
+        stats[f"{async_repository_db.dialect.name}_async"] = async_repository_db.pool_stats()
+    return ResponseHandler.ok("OK", status=HTTPStatus.OK, response_obj=stats)
+
+
+@metrics_bp.route('/cache', methods=['GET'])
+def get_cache_stats():
+    """
+    User cache counters per tier (size, hits, misses, evictions, expirations and invalidations), and the state
+    of the user listing snapshot.
+    """
+    stats = {}
+    for name in (USER_CACHE, USERS_SNAPSHOT):
+        cache = current_app.extensions.get(name)
+        stats[name] = cache.stats() if cache is not None else None
+    return ResponseHandler.ok("OK", status=HTTPStatus.OK, response_obj=stats)
+
+
+@metrics_bp.route('/single-flight', methods=['GET'])
+def get_single_flight_stats():
+    """Read coalescing counters: calls, queries actually run (`executions`), `coalesced` calls and timeouts."""
+    single_flight = current_app.extensions.get(SINGLE_FLIGHT)
+    stats = single_flight.stats() if single_flight is not None else None
+    return ResponseHandler.ok("OK", status=HTTPStatus.OK, response_obj={SINGLE_FLIGHT: stats})
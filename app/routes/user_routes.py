@@ -1,32 +1,172 @@
 import logging
+from datetime import datetime
 from http import HTTPStatus
 
-from flask import Blueprint, request
+from flask import Blueprint, request, current_app
+from werkzeug.local import LocalProxy
 
-from ..dto.user_dto import UserRequest
+from ..cache.snapshot_cache import SnapshotCache
+from ..cache.user_cache import USER_CACHE
+from ..dto.user_dto import UserRequest, UserResponse
+from ..exceptions.api_exception import BadRequestException
+from ..events.broker import EventBroker
+from ..handlers.conditional_handler import ConditionalHandler
 from ..handlers.response_handler import ResponseHandler
-from ..repository.user_repository import UserRepository
+from ..handlers.sse_handler import SSEHandler
+from ..handlers.stream_handler import StreamHandler
+from ..models.table_version_model import TableVersionModel
+from ..repository.cached_user_repository import CachedUserRepository
+from ..repository.user_repository import UserRepository, USERS_TOPIC, USER_COLUMNS
 from ..services.user_service import UserService
 from ..utils.logging_utils import log
+from ..utils.pagination import decode_page_token
+from ..utils.single_flight import SINGLE_FLIGHT
+from ..utils.startup import register_warm_up_hook
+from ..utils.request_utils import iter_json_records
 
 user_bp = Blueprint('users', __name__, '/users')
 
-user_repository = UserRepository()
-user_service = UserService(user_repository=user_repository)
+USERS_SNAPSHOT = 'users_snapshot'
+USER_SERVICE = 'user_service'
+
+
+def _build_user_service(app) -> UserService:
+    """The application's user service, wired to its own single-flight group and user cache (if enabled)."""
+    repository = UserRepository(single_flight=app.extensions.get(SINGLE_FLIGHT))
+    cache = app.extensions.get(USER_CACHE)
+    if cache is not None:
+        repository = CachedUserRepository(repository, cache, negative_ttl=app.config['USER_CACHE_NEGATIVE_TTL'])
+    return UserService(user_repository=repository)
+
+
+# Built on first use rather than at import, so importing the blueprint stays cheap (see `warm_up_routes`).
+event_broker = LocalProxy(EventBroker)
+# The current application's service, built once by `init_app`.
+user_service = LocalProxy(lambda: current_app.extensions[USER_SERVICE])
+
+
+def warm_up_routes(app):
+    """Warm-up hook: build the event broker behind its lazy proxy and load the listing snapshot."""
+    with app.app_context():
+        event_broker._get_current_object()
+        if USERS_SNAPSHOT in app.extensions:
+            app.extensions[USERS_SNAPSHOT].get()
+
+
+def _load_users_snapshot() -> tuple[bytes, TableVersionModel | None]:
+    # Read the version first: if a write lands during the scan, the snapshot is tagged older than its data,
+    # which only costs a client one unnecessary full response.
+    version = user_service.get_users_version()
+    users = user_service.iter_all_users(chunk_size=current_app.config['DB_STREAM_CHUNK_SIZE'])
+    return StreamHandler.encode_items(users), version
+
+
+def _invalidate_users_snapshot() -> None:
+    """After a write: this worker's next full listing is reloaded (other workers' snapshots expire by TTL)."""
+    snapshot_cache = current_app.extensions.get(USERS_SNAPSHOT)
+    if snapshot_cache is not None:
+        snapshot_cache.invalidate()
+
+
+def _listing_validators(version: TableVersionModel | None) -> tuple[str, datetime] | None:
+    """ETag and Last-Modified of any user listing: they change with every write to the users table."""
+    if version is None:
+        return None
+    return f"users-v{version.version}", version.updated_at
+
+
+def _user_validators(user: UserResponse) -> tuple[str, datetime]:
+    """ETag and Last-Modified of a single user: users are never updated, so id and creation time identify it."""
+    return f"user-{user.id}-{user.created_at:%Y%m%d%H%M%S%f}", user.created_at
+
+
+def init_app(app):
+    """Set up the user routes' extensions. Call after the blueprint, user cache and single-flight are set up."""
+    app.extensions[USER_SERVICE] = _build_user_service(app)
+    if app.config['USERS_SNAPSHOT_ENABLED']:
+        app.extensions[USERS_SNAPSHOT] = SnapshotCache(app, _load_users_snapshot,
+                                                       soft_ttl=app.config['USERS_SNAPSHOT_SOFT_TTL'],
+                                                       hard_ttl=app.config['USERS_SNAPSHOT_HARD_TTL'],
+                                                       name=USERS_SNAPSHOT,
+                                                       deflate_level=app.config['COMPRESSION_LEVEL']
+                                                       if app.config['COMPRESSION_ENABLED'] else None)
+    register_warm_up_hook(app, warm_up_routes)
 
 
 @log(level=logging.INFO, include_time=True)
 @user_bp.route('/', methods=['GET'])
 def get_all_users():
-    users = user_service.get_all_users()
-    return ResponseHandler.ok("OK", status=HTTPStatus.OK, response_obj=users)
+    full_listing = not {'limit', 'after_id', 'page_token'} & request.args.keys()
+    snapshot_cache = current_app.extensions.get(USERS_SNAPSHOT) if full_listing else None
+    if snapshot_cache is not None:
+        # Pre-encoded listing, possibly up to USERS_SNAPSHOT_HARD_TTL seconds old (see its Age header).
+        # Validated against the version the snapshot was built from: no database access at all.
+        snapshot = snapshot_cache.get()
+        validators = _listing_validators(snapshot.version)
+        if validators and (not_modified := ConditionalHandler.not_modified(*validators)):
+            return not_modified
+        headers = {'Age': str(int(snapshot.age)), **(ConditionalHandler.validators(*validators) if validators else {})}
+        return StreamHandler.prebuilt("OK", status=HTTPStatus.OK, data=snapshot.data, headers=headers,
+                                      deflated=snapshot.deflated)
+
+    # One single-row read decides whether the client's copy is current, before any user is read.
+    validators = _listing_validators(user_service.get_users_version())
+    if validators and (not_modified := ConditionalHandler.not_modified(*validators)):
+        return not_modified
+    headers = ConditionalHandler.validators(*validators) if validators else {}
+
+    if full_listing:
+        # Full listing: streamed from a server-side cursor so memory stays bounded by the chunk size.
+        users = user_service.iter_all_users(chunk_size=current_app.config['DB_STREAM_CHUNK_SIZE'])
+        response = StreamHandler.ok("OK", status=HTTPStatus.OK, items=users)
+        response.headers.update(headers)
+        return response
+
+    limit = request.args.get('limit', current_app.config['USERS_PAGE_SIZE'], type=int)
+    if not 1 <= limit <= current_app.config['USERS_MAX_PAGE_SIZE']:
+        raise BadRequestException(f"limit must be between 1 and {current_app.config['USERS_MAX_PAGE_SIZE']}")
+    page_token = request.args.get('page_token')
+    after_id = decode_page_token(page_token) if page_token else request.args.get('after_id', type=int)
+
+    page = user_service.get_users_page(after_id, limit)
+    response, status = ResponseHandler.ok("OK", status=HTTPStatus.OK, response_obj=page)
+    return response, status, headers
+
+
+@log(level=logging.INFO, include_time=True)
+@user_bp.route('/export', methods=['GET'])
+def export_users():
+    rows = user_service.iter_user_rows(chunk_size=current_app.config['DB_STREAM_CHUNK_SIZE'])
+    return StreamHandler.export(
+        rows,
+        columns=USER_COLUMNS,
+        fmt=request.args.get('format', 'ndjson'),
+        filename='users',
+        gzip=request.args.get('gzip', 'false').lower() in ('1', 'true'),
+        gzip_level=current_app.config['EXPORT_GZIP_LEVEL'],
+        batch_size=current_app.config['DB_STREAM_CHUNK_SIZE'],
+    )
+
+
+@log(level=logging.INFO, include_time=True)
+@user_bp.route('/stream', methods=['GET'])
+@SSEHandler.endpoint(USERS_TOPIC, key_param='user_id')
+def stream_users():
+    subscription = SSEHandler.subscribe(event_broker, USERS_TOPIC, request.args,
+                                        last_event_id=request.headers.get('Last-Event-ID'), key_param='user_id')
+    return SSEHandler.stream(event_broker, subscription,
+                             heartbeat_interval=current_app.config['SSE_HEARTBEAT_INTERVAL'])
 
 
 @log(level=logging.INFO, include_time=True)
 @user_bp.route('/<int:user_id>', methods=['GET'])
 def get_user(user_id):
     user = user_service.get_user(user_id)
-    return ResponseHandler.ok("OK", status=HTTPStatus.OK, response_obj=user)
+    validators = _user_validators(user)
+    if not_modified := ConditionalHandler.not_modified(*validators):
+        return not_modified
+    response, status = ResponseHandler.ok("OK", status=HTTPStatus.OK, response_obj=user)
+    return response, status, ConditionalHandler.validators(*validators)
 
 
 @log(level=logging.INFO, include_time=True)
@@ -35,11 +175,27 @@ def create_user():
     data = request.get_json()
     user = UserRequest(**data)
     user_out = user_service.create_user(user)
+    _invalidate_users_snapshot()
     return ResponseHandler.ok("CREATED", status=HTTPStatus.CREATED, response_obj=user_out)
 
 
+@log(level=logging.INFO, include_time=True)
+@user_bp.route('/bulk', methods=['POST'])
+def bulk_create_users():
+    records = iter_json_records(request)
+    result = user_service.import_users(records,
+                                       chunk_size=current_app.config['BULK_IMPORT_CHUNK_SIZE'],
+                                       max_errors=current_app.config['BULK_IMPORT_MAX_ERRORS'])
+    if result.inserted:
+        _invalidate_users_snapshot()
+    if result.failed and not result.inserted:
+        raise BadRequestException("No users were imported.", details=result.to_dict())
+    return ResponseHandler.ok("CREATED", status=HTTPStatus.CREATED, response_obj=result)
+
+
 @log(level=logging.INFO, include_time=True)
 @user_bp.route('/<int:user_id>', methods=['DELETE'])
 def delete_user(user_id):
     success = user_service.delete_user(user_id)
+    _invalidate_users_snapshot()
     return ResponseHandler.ok("ACCEPTED", status=HTTPStatus.ACCEPTED, response_obj=success)
@@ -0,0 +1,52 @@
+"""encoders.py
+
+Conversion of application objects (models, DTOs, datetimes) into values the JSON encoders write natively,
+resolved once per type.
+"""
+
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict
+
+from app.utils.dttm_utils import DateUtils
+
+Encoder = Callable[[Any], Any]
+
+
+def _compile_dataclass_encoder(cls: type) -> Encoder:
+    """
+    A function returning the fields of a `cls` instance as a dict, one level deep: unlike `asdict`, nested values
+    are neither converted nor copied here, but left for the JSON encoder to reach as it writes them.
+    """
+    items = ', '.join(f"{f.name!r}: obj.{f.name}" for f in fields(cls))
+    namespace: Dict[str, Any] = {}
+    exec(f"def encode(obj):\n    return {{{items}}}", namespace)
+    return namespace['encode']
+
+
+def _resolve(cls: type) -> Encoder | None:
+    if issubclass(cls, datetime):
+        return DateUtils.serialize_to_iso
+    if is_dataclass(cls):
+        return _compile_dataclass_encoder(cls)
+    return None
+
+
+# Exact type -> encoder, filled on first sight of each type.
+_encoders: Dict[type, Encoder] = {datetime: DateUtils.serialize_to_iso}
+
+
+def to_json_native(obj: Any) -> Any:
+    """
+    `default` hook for `json.dumps` and `orjson.dumps`: datetimes become ISO 8601 strings, dataclasses the dict of
+    their fields and other objects their `__dict__`. Anything else raises `TypeError`, like the encoders do.
+    """
+    encoder = _encoders.get(type(obj))
+    if encoder is None:
+        encoder = _resolve(type(obj))
+        if encoder is None:
+            if hasattr(obj, '__dict__'):
+                return vars(obj)
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+        _encoders[type(obj)] = encoder
+    return encoder(obj)
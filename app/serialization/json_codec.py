@@ -0,0 +1,66 @@
+"""json_codec.py
+
+JSON encoding of response bodies, through orjson when it is installed and the standard library otherwise.
+"""
+
+import json
+from typing import Any
+
+from app.serialization.encoders import to_json_native
+
+try:
+    import orjson
+except ImportError:  # Optional: the standard library backend is used instead
+    orjson = None
+
+AUTO = 'auto'
+ORJSON = 'orjson'
+STDLIB = 'stdlib'
+
+
+class JSONCodec:
+    """
+    Encodes objects to UTF-8 JSON in one pass over the object graph: dataclasses (models, DTOs, the response
+    envelope) are written as the encoder reaches them, never first turned into a tree of dicts with `asdict`.
+
+    orjson writes dataclasses natively and hands datetimes back to `to_json_native`, so they keep the
+    application's format (`DateUtils.serialize_to_iso`). The standard library backend converts each dataclass
+    through an encoder compiled for its class. Both produce the same JSON, except that orjson leaves non-ASCII
+    characters unescaped; objects orjson refuses (e.g. dicts with non-string keys) are encoded by the standard
+    library.
+
+    Args:
+        backend (str): `orjson`, `stdlib`, or `auto` (orjson if installed).
+
+    Raises:
+        ValueError: If the backend is unknown, or is `orjson` and orjson is not installed.
+    """
+
+    def __init__(self, backend: str = AUTO) -> None:
+        if backend == AUTO:
+            backend = ORJSON if orjson is not None else STDLIB
+        if backend not in (ORJSON, STDLIB):
+            raise ValueError(f"Unknown JSON backend {backend!r}, expected one of {[AUTO, ORJSON, STDLIB]}")
+        if backend == ORJSON and orjson is None:
+            raise ValueError("The orjson JSON backend was requested, but orjson is not installed")
+        self.backend = backend
+
+    def dumps(self, obj: Any, indent: bool = False) -> bytes:
+        """Encode `obj` compactly, or indented by 2 spaces with `indent`."""
+        if self.backend == ORJSON:
+            option = orjson.OPT_PASSTHROUGH_DATETIME | (orjson.OPT_INDENT_2 if indent else 0)
+            try:
+                return orjson.dumps(obj, default=to_json_native, option=option)
+            except orjson.JSONEncodeError:
+                pass
+        if indent:
+            return json.dumps(obj, default=to_json_native, indent=2).encode()
+        return json.dumps(obj, default=to_json_native, separators=(',', ':')).encode()
+
+    def loads(self, data: str | bytes) -> Any:
+        if self.backend == ORJSON:
+            return orjson.loads(data)
+        return json.loads(data)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(backend={self.backend!r})"
@@ -0,0 +1,52 @@
+import logging
+
+from app.core.base_service import BaseService
+from app.dto.response import PageResponse
+from app.dto.user_dto import UserResponse, UserRequest
+from app.exceptions.api_exception import NotFoundException
+from app.repository.async_user_repository import AsyncUserRepository
+from app.utils.logging_utils import log
+from app.utils.pagination import encode_page_token
+from app.utils.singleton_decorator import singleton
+
+logger = logging.getLogger(__name__)
+
+
+@singleton
+class AsyncUserService(BaseService):
+    """Awaitable counterpart of `UserService`, used when `DATA_ACCESS_MODE` is `async`."""
+
+    def __init__(self, user_repository: AsyncUserRepository):
+        self.user_repository = user_repository
+
+    @log()
+    async def get_all_users(self) -> list[UserResponse]:
+        users = await self.user_repository.get_all_users()
+        return UserResponse.from_model(users, many=True)
+
+    @log()
+    async def get_users_page(self, after_id: int | None, limit: int) -> PageResponse:
+        # Fetch one extra row to learn whether another page exists without a COUNT query.
+        users = await self.user_repository.get_users_page(after_id, limit + 1)
+        has_more = len(users) > limit
+        users = users[:limit]
+        next_page_token = encode_page_token(users[-1].id) if has_more else None
+        return PageResponse(items=UserResponse.from_model(users, many=True), next_page_token=next_page_token)
+
+    @log()
+    async def get_user(self, user_id) -> UserResponse | None:
+        user = await self.user_repository.get_user_by_id(user_id)
+
+        if not user:
+            raise NotFoundException(resource="User", identifier=user_id)
+
+        return UserResponse.from_model(user, many=False)
+
+    @log()
+    async def create_user(self, new_user: UserRequest) -> UserResponse:
+        user = await self.user_repository.create_user(new_user)
+        return UserResponse.from_model(user)
+
+    @log()
+    async def delete_user(self, user_id) -> bool:
+        return await self.user_repository.delete_user(user_id)
@@ -1,13 +1,22 @@
+import logging
+import time
+from typing import Iterator, Iterable, Any
+
 from app.core.base_service import BaseService
+from app.dto.response import PageResponse, BulkImportResponse
 from app.dto.user_dto import UserResponse, UserRequest
-from app.exceptions.api_exception import NotFoundException
+from app.models.table_version_model import TableVersionModel
+from app.exceptions.api_exception import NotFoundException, BadRequestException
 from app.repository.user_repository import UserRepository
 from app.utils.logging_utils import log
-from app.utils.singleton_decorator import singleton
+from app.utils.pagination import encode_page_token
+from app.utils.request_utils import MalformedRecord
+
+logger = logging.getLogger(__name__)
 
 
-@singleton
 class UserService(BaseService):
+    """User use cases. One per application, built by `user_routes.init_app` on that application's repositories."""
 
     def __init__(self, user_repository: UserRepository):
         self.user_repository = user_repository
@@ -18,6 +27,25 @@ class UserService(BaseService):
         response = UserResponse.from_model(users, many=True)
         return response
 
+    @log()
+    def get_users_page(self, after_id: int | None, limit: int) -> PageResponse:
+        # Fetch one extra row to learn whether another page exists without a COUNT query.
+        users = self.user_repository.get_users_page(after_id, limit + 1)
+        has_more = len(users) > limit
+        users = users[:limit]
+        next_page_token = encode_page_token(users[-1].id) if has_more else None
+        return PageResponse(items=UserResponse.from_model(users, many=True), next_page_token=next_page_token)
+
+    def iter_all_users(self, chunk_size: int = 1000) -> Iterator[UserResponse]:
+        for user in self.user_repository.iter_all_users(chunk_size=chunk_size):
+            yield UserResponse.from_model(user)
+
+    def iter_user_rows(self, chunk_size: int = 1000) -> Iterator[tuple]:
+        return self.user_repository.iter_user_rows(chunk_size=chunk_size)
+
+    def get_users_version(self) -> TableVersionModel | None:
+        return self.user_repository.get_version()
+
     @log()
     def get_user(self, user_id) -> UserResponse | None:
         user = self.user_repository.get_user_by_id(user_id)
@@ -36,3 +64,84 @@ class UserService(BaseService):
     @log()
     def delete_user(self, user_id) -> bool:
         return self.user_repository.delete_user(user_id)
+
+    @log()
+    def import_users(self, records: Iterable[Any], chunk_size: int = 1000, max_errors: int = 1000) \
+            -> BulkImportResponse:
+        """
+        Validate and insert users in chunks of `chunk_size`, each committed on its own.
+        Invalid or duplicate rows are reported individually and do not stop the import.
+
+        Args:
+            records (Iterable[Any]): Decoded request records, expected to be `UserRequest` dicts.
+            chunk_size (int): Number of valid rows written per transaction.
+            max_errors (int): Number of row errors listed in the response; the rest are only counted.
+
+        Returns:
+            BulkImportResponse: Row counts, row errors and throughput.
+        """
+        started = time.perf_counter()
+        result = BulkImportResponse()
+        chunk: list[tuple[int, UserRequest]] = []
+
+        for row, record in enumerate(records):
+            result.received += 1
+            try:
+                chunk.append((row, self._parse_user(record)))
+            except BadRequestException as e:
+                self._reject(result, row, e.details or [{"field": None, "error": e.message}], max_errors)
+                continue
+            if len(chunk) >= chunk_size:
+                self._import_chunk(chunk, result, max_errors)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk, result, max_errors)
+
+        result.errors.sort(key=lambda error: error["row"])
+        elapsed = time.perf_counter() - started
+        result.elapsed_ms = round(elapsed * 1000, 3)
+        result.rows_per_second = round(result.inserted / elapsed, 1) if elapsed else 0.0
+        logger.info(f"Imported {result.inserted}/{result.received} users in {result.elapsed_ms} ms "
+                    f"({result.rows_per_second} rows/s)")
+        return result
+
+    @staticmethod
+    def _parse_user(record: Any) -> UserRequest:
+        if isinstance(record, MalformedRecord):
+            raise BadRequestException(record.error)
+        if not isinstance(record, dict):
+            raise BadRequestException("Expected a JSON object.")
+        try:
+            return UserRequest(**record)
+        except TypeError as e:
+            raise BadRequestException(f"Invalid user record: {e}")
+
+    def _import_chunk(self, chunk: list[tuple[int, UserRequest]], result: BulkImportResponse,
+                      max_errors: int) -> None:
+        unique: dict[str, tuple[int, UserRequest]] = {}
+        for row, user in chunk:
+            if user.email in unique:
+                self._reject(result, row, [{"field": "email", "error": "Duplicate email in this import."}],
+                             max_errors)
+            else:
+                unique[user.email] = (row, user)
+
+        try:
+            created, existing = self.user_repository.bulk_create_users([user for _, user in unique.values()])
+        except Exception as e:
+            for row, _ in unique.values():
+                self._reject(result, row, [{"field": None, "error": f"Chunk failed: {e}"}], max_errors)
+            return
+
+        result.inserted += len(created)
+        for email in existing:
+            self._reject(result, unique[email][0], [{"field": "email", "error": "Email already exists."}],
+                         max_errors)
+
+    @staticmethod
+    def _reject(result: BulkImportResponse, row: int, errors: list, max_errors: int) -> None:
+        result.failed += 1
+        if len(result.errors) < max_errors:
+            result.errors.append({"row": row, "errors": errors})
+        else:
+            result.errors_truncated = True
@@ -0,0 +1,71 @@
+-- Drop the users table if it already exists
+DROP TABLE IF EXISTS users;
+
+-- Create the users table
+CREATE TABLE users
+(
+    id         INTEGER PRIMARY KEY AUTOINCREMENT, -- Unique identifier for each user (auto-incrementing)
+    username   TEXT    NOT NULL,                  -- Username for the user
+    email      TEXT    NOT NULL UNIQUE,           -- Email must be unique
+    is_active  BOOLEAN NOT NULL DEFAULT TRUE,     -- Active status (TRUE for active, FALSE for inactive)
+    created_at TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')) -- Timestamp when the user was created (UTC)
+);
+
+-- Drop the outbox table if it already exists
+DROP TABLE IF EXISTS outbox;
+
+-- Create the outbox table: events written in the same transaction as the change they describe,
+-- drained by the outbox dispatcher (app/events/outbox_dispatcher.py)
+CREATE TABLE outbox
+(
+    id         INTEGER PRIMARY KEY AUTOINCREMENT, -- Dispatch order
+    topic      TEXT NOT NULL,                     -- Broker topic, e.g. 'users'
+    event_type TEXT NOT NULL,                     -- SSE event name, e.g. 'created'
+    event_key  TEXT,                              -- Identity of the changed record, used for filtering
+    payload    TEXT NOT NULL,                     -- JSON-encoded event data
+    created_at TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')) -- Timestamp when the event was recorded
+);
+
+-- Drop the table_versions table if it already exists
+DROP TABLE IF EXISTS table_versions;
+
+-- Create the table_versions table: a counter per table, bumped by every transaction that writes the table;
+-- the source of the ETag / Last-Modified validators of collection responses
+CREATE TABLE table_versions
+(
+    table_name TEXT PRIMARY KEY,   -- e.g. 'users'
+    version    INTEGER   NOT NULL, -- Incremented on every write
+    updated_at TIMESTAMP NOT NULL  -- Time of the last write (UTC)
+);
+
+INSERT INTO table_versions (table_name, version, updated_at)
+VALUES ('users', 1, strftime('%Y-%m-%d %H:%M:%f', 'now'));
+
+-- Insert sample data into the users table
+INSERT INTO users (username, email, is_active)
+VALUES ('alice_smith', 'alice.smith@example.com', TRUE),
+       ('bob_johnson', 'bob.johnson@example.com', TRUE),
+       ('carol_white', 'carol.white@example.com', FALSE),
+       ('david_brown', 'david.brown@example.com', TRUE),
+       ('eve_davis', 'eve.davis@example.com', TRUE),
+       ('frank_miller', 'frank.miller@example.com', FALSE),
+       ('grace_wilson', 'grace.wilson@example.com', TRUE),
+       ('hank_moore', 'hank.moore@example.com', TRUE),
+       ('iris_taylor', 'iris.taylor@example.com', FALSE),
+       ('jack_anderson', 'jack.anderson@example.com', TRUE),
+       ('kelly_jones', 'kelly.jones@example.com', TRUE),
+       ('larry_garcia', 'larry.garcia@example.com', FALSE),
+       ('mona_rodriguez', 'mona.rodriguez@example.com', TRUE),
+       ('nina_martinez', 'nina.martinez@example.com', TRUE),
+       ('oliver_hernandez', 'oliver.hernandez@example.com', FALSE),
+       ('pamela_clark', 'pamela.clark@example.com', TRUE),
+       ('quincy_lewis', 'quincy.lewis@example.com', TRUE),
+       ('rachel_walker', 'rachel.walker@example.com', FALSE),
+       ('samuel_hall', 'samuel.hall@example.com', TRUE),
+       ('tina_young', 'tina.young@example.com', TRUE),
+       ('ursula_king', 'ursula.king@example.com', FALSE),
+       ('victor_scott', 'victor.scott@example.com', TRUE),
+       ('wendy_adams', 'wendy.adams@example.com', TRUE),
+       ('xander_baker', 'xander.baker@example.com', FALSE),
+       ('yasmine_nelson', 'yasmine.nelson@example.com', TRUE),
+       ('zachary_morris', 'zachary.morris@example.com', TRUE);
@@ -72,7 +72,9 @@ class DateUtils:
         """
         if dt:
             if not with_tz:
-                return dt.replace(tzinfo=None).isoformat(timespec="milliseconds") + "Z"
+                if dt.tzinfo is not None:
+                    dt = dt.replace(tzinfo=None)
+                return dt.isoformat(timespec="milliseconds") + "Z"
             else:
                 return dt.isoformat(timespec="milliseconds")
         return None
@@ -0,0 +1,53 @@
+"""gzip_utils.py
+
+Build gzip bodies from independently compressed segments, so a large, rarely changing part of a response is
+compressed once and reused while the parts around it change per request.
+"""
+
+import struct
+import time
+import zlib
+from typing import Iterable, Iterator, Sequence, Tuple
+
+# ID1 ID2 CM=deflate FLG=0, then MTIME, XFL=0, OS=255 (unknown)
+_GZIP_HEADER = struct.Struct('<4sIBB')
+_GZIP_TRAILER = struct.Struct('<II')
+
+
+def deflate_segment(data: bytes, level: int) -> bytes:
+    """
+    Compress `data` as a raw deflate segment that can be placed anywhere inside a deflate stream: it refers to
+    no earlier data, and it ends on a byte boundary without a final block (Z_SYNC_FLUSH).
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+def gzip_segments(segments: Sequence[Tuple[bytes, bytes | None]], level: int) -> bytes:
+    """
+    Assemble one gzip member from `(data, deflated)` pairs, compressing the segments whose `deflated` is None.
+
+    Examples:
+        >>> body = deflate_segment(b'[1, 2, 3]', 6)  # Computed once
+        >>> gzip.decompress(gzip_segments([(b'{"data": ', None), (b'[1, 2, 3]', body), (b'}', None)], 6))
+        b'{"data": [1, 2, 3]}'
+    """
+    crc, size = 0, 0
+    parts = [_GZIP_HEADER.pack(b'\x1f\x8b\x08\x00', int(time.time()), 0, 255)]
+    for data, deflated in segments:
+        parts.append(deflated if deflated is not None else deflate_segment(data, level))
+        crc = zlib.crc32(data, crc)
+        size += len(data)
+    parts.append(b'\x03\x00')  # An empty final block ends the deflate stream
+    parts.append(_GZIP_TRAILER.pack(crc, size & 0xFFFFFFFF))
+    return b''.join(parts)
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int) -> Iterator[bytes]:
+    """Compress a stream of byte chunks incrementally into one gzip member."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,48 @@
+"""histogram.py"""
+
+import bisect
+import threading
+from typing import Dict, Sequence
+
+from app.utils.class_helpers import auto_repr
+
+# Upper bounds in milliseconds; chosen for connection-pool waits, from "free connection" to "timed out".
+DEFAULT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """
+    Thread-safe fixed-bucket histogram, cumulative like Prometheus' (`le` = less than or equal).
+
+    Examples:
+        >>> h = Histogram(buckets=(10, 100))
+        >>> h.observe(3); h.observe(50); h.observe(500)
+        >>> h.snapshot()['buckets']
+        {'10': 1, '100': 2, '+Inf': 3}
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS_MS) -> None:
+        self.bounds = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict[str, object]:
+        """Return count, sum and cumulative bucket counts keyed by their upper bound."""
+        with self._lock:
+            counts, count, total = list(self._counts), self._count, self._sum
+        buckets, running = {}, 0
+        for bound, bucket_count in zip((*(f"{b:g}" for b in self.bounds), '+Inf'), counts):
+            running += bucket_count
+            buckets[bound] = running
+        return {'count': count, 'sum': round(total, 3), 'buckets': buckets}
+
+    __repr__ = auto_repr
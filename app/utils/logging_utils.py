@@ -1,6 +1,7 @@
 """logging_utils.py"""
 
 import functools
+import inspect
 import logging
 import time
 from typing import Callable
@@ -63,44 +64,75 @@ def log(level: int = logging.DEBUG, include_time: bool = False, suppress_excepti
     """
 
     def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-
-            # Handle the case for methods within classes
-            if hasattr(func, '__self__'):
-                qualname = f"{func.__self__.__class__.__name__}.{func.__name__}"
-
-            else:
-                qualname = func.__name__
-
-            logger = logging.getLogger(qualname)
-
-            start_time = time.time() if include_time else None
+        # Handle the case for methods within classes
+        if hasattr(func, '__self__'):
+            qualname = f"{func.__self__.__class__.__name__}.{func.__name__}"
+        else:
+            qualname = func.__name__
+        logger = logging.getLogger(qualname)
 
+        def describe(args, kwargs):
             # Create a readable signature of function arguments
             args_repr = [repr(a) for a in args]
             kwargs_repr = [f"{k}={v!r}" for k, v in kwargs.items()]
-            signature = ", ".join(args_repr + kwargs_repr)
+            return ", ".join(args_repr + kwargs_repr)
+
+        def returned(result, start_time):
+            # Log the result
+            logger.log(level, f"{qualname} returned {result!r}")
+
+            # Log execution time if enabled
+            if include_time:
+                duration = (time.time() - start_time) * 1000
+                logger.log(level, f"{qualname} executed in {duration:.2f} milliseconds")
+
+        def failed(args, kwargs):
+            # Log exception
+            logger.exception(f"Exception raised in {qualname} with args: {describe(args, kwargs)}")
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                # Nothing but the exception is logged below `level`, so skip the reprs of arguments and result
+                enabled = logger.isEnabledFor(level)
+                start_time = time.time() if include_time and enabled else None
+
+                # Log function call
+                if enabled:
+                    logger.log(level, f"Called {qualname}({describe(args, kwargs)})")
+
+                try:
+                    # Await the coroutine so the result and the time cover the actual work
+                    result = await func(*args, **kwargs)
+                    if enabled:
+                        returned(result, start_time)
+                    return result
+                except Exception as e:
+                    failed(args, kwargs)
+                    if suppress_exceptions:
+                        return None
+                    raise e
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # Nothing but the exception is logged below `level`, so skip the reprs of arguments and result
+            enabled = logger.isEnabledFor(level)
+            start_time = time.time() if include_time and enabled else None
 
             # Log function call
-            logger.log(level, f"Called {qualname}({signature})")
+            if enabled:
+                logger.log(level, f"Called {qualname}({describe(args, kwargs)})")
 
             try:
                 # Execute the function
                 result = func(*args, **kwargs)
-
-                # Log the result
-                logger.log(level, f"{qualname} returned {result!r}")
-
-                # Log execution time if enabled
-                if include_time:
-                    duration = (time.time() - start_time) * 1000
-                    logger.log(level, f"{qualname} executed in {duration:.2f} milliseconds")
-
+                if enabled:
+                    returned(result, start_time)
                 return result
             except Exception as e:
-                # Log exception
-                logger.exception(f"Exception raised in {qualname} with args: {signature}")
+                failed(args, kwargs)
                 if suppress_exceptions:
                     return None
                 raise e
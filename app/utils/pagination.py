@@ -0,0 +1,39 @@
+"""pagination.py"""
+
+import base64
+import binascii
+import json
+from typing import Optional
+
+from app.exceptions.api_exception import BadRequestException
+
+
+def encode_page_token(after_id: Optional[int]) -> Optional[str]:
+    """
+    Encode a keyset position as an opaque, URL-safe page token.
+
+    Examples:
+        >>> encode_page_token(42)
+        'eyJhZnRlcl9pZCI6NDJ9'
+    """
+    if after_id is None:
+        return None
+    raw = json.dumps({"after_id": after_id}, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_page_token(token: str) -> int:
+    """
+    Decode a page token produced by `encode_page_token`.
+
+    Raises:
+        BadRequestException: If the token is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        after_id = json.loads(raw)["after_id"]
+        if not isinstance(after_id, int):
+            raise ValueError(after_id)
+        return after_id
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise BadRequestException(f"Invalid page token: {token!r}")
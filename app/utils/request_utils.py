@@ -0,0 +1,46 @@
+"""request_utils.py"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from flask import Request
+
+from app.exceptions.api_exception import BadRequestException
+
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/jsonl', 'application/x-jsonlines')
+
+
+@dataclass
+class MalformedRecord:
+    """Placeholder for an NDJSON line that is not valid JSON, so it can be reported without aborting the batch."""
+    error: str
+
+
+def iter_json_records(req: Request) -> Iterator[Any]:
+    """
+    Iterate over the records of a request body that is either a JSON array or NDJSON (one JSON value per line).
+
+    NDJSON bodies are read line by line from the input stream, so large uploads are never held in memory.
+
+    Raises:
+        BadRequestException: If a non-NDJSON body is not a JSON array.
+    """
+    if req.mimetype in NDJSON_MIMETYPES:
+        return _iter_ndjson(req.stream)
+
+    body = req.get_json(silent=True)
+    if not isinstance(body, list):
+        raise BadRequestException("Expected a JSON array or an NDJSON body (Content-Type: application/x-ndjson).")
+    return iter(body)
+
+
+def _iter_ndjson(stream) -> Iterator[Any]:
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            yield MalformedRecord(error=f"Invalid JSON: {e}")
@@ -0,0 +1,136 @@
+"""single_flight.py"""
+
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+from flask import Flask
+
+T = TypeVar('T')
+
+SINGLE_FLIGHT = 'single_flight'
+
+
+class SingleFlightTimeout(TimeoutError):
+    """Raised to a caller that waited longer than the timeout for a call another caller is running."""
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller (the leader) runs the function, callers
+    arriving while it runs wait for it and receive the same result, or the same exception. Nothing is cached
+    once the call returns; the next caller starts a new one.
+
+    Only use it for plain reads whose result does not depend on the caller (no open transaction, no
+    request-specific state): every waiter gets the leader's view of the data.
+
+    Examples:
+        >>> flights = SingleFlight(timeout=5)
+        >>> flights.do(('user', 42), lambda: repository.get_user_by_id(42))
+    """
+
+    def __init__(self, timeout: float | None = None) -> None:
+        self.timeout = timeout
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.errors = 0
+        _groups.add(self)
+
+    def _reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Return `fn()`, sharing one execution between concurrent callers with the same `key`.
+
+        Raises:
+            SingleFlightTimeout: If this caller waited more than `timeout` seconds for the leader; the
+                leader's call carries on and its result still reaches the callers that keep waiting.
+            Exception: Whatever `fn` raised, in the leader and in every waiter.
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                with self._lock:
+                    self.timeouts += 1
+                raise SingleFlightTimeout(f"Timed out after {self.timeout}s waiting for an identical call in flight")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'coalesced_ratio': round(self.coalesced / self.calls, 4) if self.calls else None,
+                'timeouts': self.timeouts,
+                'errors': self.errors,
+                'in_flight': len(self._calls),
+            }
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(timeout={self.timeout}, in_flight={len(self._calls)})"
+
+
+def init_app(app: Flask) -> SingleFlight | None:
+    """Store the request coalescer in `app.extensions['single_flight']`."""
+    if not app.config['SINGLE_FLIGHT_ENABLED']:
+        return None
+    single_flight = SingleFlight(timeout=app.config['SINGLE_FLIGHT_TIMEOUT'])
+    app.extensions[SINGLE_FLIGHT] = single_flight
+    return single_flight
+
+
+# Weak, so that dropping a group (e.g. with its application) frees it.
+_groups: weakref.WeakSet[SingleFlight] = weakref.WeakSet()
+
+
+def _reset_groups_after_fork() -> None:
+    """Calls in flight at fork() belong to threads that do not exist in the child."""
+    for group in list(_groups):
+        group._reset_after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_groups_after_fork)
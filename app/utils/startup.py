@@ -0,0 +1,42 @@
+"""startup.py
+
+Warm-up hooks: work a worker can do before it accepts traffic (open pools, build services, fill caches)
+so the first requests do not pay for it.
+
+Extensions register hooks from their `init_app`; `warm_up(app)` runs them. Call it in the process that
+will serve requests: `create_app` does when `WARM_UP_ON_START` is set, which suits single-process servers.
+With a pre-forking server (e.g. gunicorn with `preload_app`) leave it off and call `warm_up(app)` from the
+worker's post-fork hook instead, since connections opened before the fork are discarded in each child.
+"""
+
+import logging
+import time
+from typing import Callable
+
+from flask import Flask
+
+logger = logging.getLogger(__name__)
+
+WARM_UP_HOOKS = 'warm_up_hooks'
+
+
+def register_warm_up_hook(app: Flask, hook: Callable[[Flask], None]) -> None:
+    """Add `hook(app)` to the functions run by `warm_up(app)`, in registration order."""
+    app.extensions.setdefault(WARM_UP_HOOKS, []).append(hook)
+
+
+def warm_up(app: Flask) -> None:
+    """
+    Run the registered warm-up hooks. A failing hook is logged and skipped: warm-up only saves
+    latency, and the work is retried lazily by the first request that needs it.
+    """
+    started = time.perf_counter()
+    for hook in app.extensions.get(WARM_UP_HOOKS, []):
+        hook_started = time.perf_counter()
+        try:
+            hook(app)
+        except Exception as e:
+            logger.warning(f"Warm-up hook {hook.__qualname__} failed: {e}")
+            continue
+        logger.debug(f"Warm-up hook {hook.__qualname__} took {(time.perf_counter() - hook_started) * 1000:.1f} ms")
+    logger.info(f"Warm-up finished in {(time.perf_counter() - started) * 1000:.1f} ms")
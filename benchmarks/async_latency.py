@@ -0,0 +1,186 @@
+"""async_latency.py
+
+Compare `DATA_ACCESS_MODE=sync` and `DATA_ACCESS_MODE=async` when every database round trip is slow.
+
+A small asyncio TCP proxy in this process forwards to the PostgreSQL server from `Config.DATABASES`
+and holds every packet for `--delay` milliseconds in each direction, simulating a database in another
+region. For each mode a server process (werkzeug, threaded) is started against the proxy, and
+`--concurrency` client threads fetch `GET /api/users/<id>` for `--duration` seconds; throughput and
+latency percentiles are printed per mode.
+
+Requires the PostgreSQL database from `Config.DATABASES` with the schema loaded.
+
+Usage:
+    python benchmarks/async_latency.py --delay 20 --concurrency 64 --duration 10
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class DelayProxy:
+    """TCP proxy that delays each chunk by `delay` seconds, keeping the order of the stream."""
+
+    def __init__(self, target_host: str, target_port: int, delay: float) -> None:
+        self.target_host, self.target_port, self.delay = target_host, target_port, delay
+        self.port = free_port()
+        self.loop = asyncio.new_event_loop()
+
+    async def pipe(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while data := await reader.read(65536):
+                await asyncio.sleep(self.delay)
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle(self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter) -> None:
+        server_reader, server_writer = await asyncio.open_connection(self.target_host, self.target_port)
+        await asyncio.gather(self.pipe(client_reader, server_writer), self.pipe(server_reader, client_writer))
+
+    def start(self) -> None:
+        started = threading.Event()
+
+        async def serve() -> None:
+            await asyncio.start_server(self.handle, '127.0.0.1', self.port)
+            started.set()
+
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(serve(), self.loop)
+        started.wait()
+
+
+def serve(port: int) -> None:
+    """Entry point of the server subprocess; the mode comes from the environment."""
+    import logging
+    from werkzeug.serving import make_server
+    from app import create_app
+
+    logging.disable(logging.CRITICAL)
+    app = create_app()
+    make_server('127.0.0.1', port, app, threaded=True).serve_forever()
+
+
+def wait_for(port: int, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Server on port {port} did not start")
+
+
+def get(conn: http.client.HTTPConnection, path: str) -> tuple[int, bytes]:
+    conn.request('GET', path)
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+def run_load(port: int, user_ids: list[int], concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    barrier = threading.Barrier(concurrency + 1)
+    deadline = 0.0
+
+    def worker(offset: int) -> None:
+        nonlocal errors
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        local, failed, i = [], 0, offset
+        barrier.wait()
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            status, _ = get(conn, f"/api/users/{user_ids[i % len(user_ids)]}")
+            local.append(time.perf_counter() - started)
+            failed += status != 200
+            i += 1
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors += failed
+
+    threads = [threading.Thread(target=worker, args=(n,), daemon=True) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    deadline = time.perf_counter() + duration
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / duration,
+        'p50': statistics.median(latencies) * 1000,
+        'p99': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--delay', type=float, default=20, help="one-way delay added by the proxy, in ms")
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10, help="seconds of load per mode")
+    parser.add_argument('--modes', default='sync,async')
+    parser.add_argument('--serve', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        return serve(args.serve)
+
+    from app.config import Config
+
+    dsn = urlsplit(Config.DATABASES['postgres'])
+    proxy = DelayProxy(dsn.hostname, dsn.port or 5432, args.delay / 1000)
+    proxy.start()
+    netloc = dsn.netloc.rsplit('@', 1)
+    proxied = urlunsplit(dsn._replace(netloc=f"{netloc[0]}@127.0.0.1:{proxy.port}" if len(netloc) == 2
+                                      else f"127.0.0.1:{proxy.port}"))
+
+    print(f"proxy: +{args.delay:g} ms each way, {args.concurrency} clients, {args.duration:g}s per mode")
+    for mode in args.modes.split(','):
+        port = free_port()
+        env = dict(os.environ, DATA_ACCESS_MODE=mode, PG_DATABASE_URL=proxied, OUTBOX_DISPATCHER_ENABLED='false')
+        server = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--serve', str(port)], env=env, cwd=ROOT)
+        try:
+            wait_for(port)
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            _, body = get(conn, '/api/users/?limit=100')
+            user_ids = [user['id'] for user in json.loads(body)['data']['items']]
+            get(conn, f"/api/users/{user_ids[0]}")  # Open the pool outside the measurement
+            conn.close()
+            result = run_load(port, user_ids, args.concurrency, args.duration)
+        finally:
+            server.terminate()
+            server.wait()
+        print(f"{mode:>6}: {result['rps']:8.1f} req/s  p50 {result['p50']:7.1f} ms  p99 {result['p99']:7.1f} ms  "
+              f"({result['requests']} requests, {result['errors']} errors)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""compression.py
+
+CPU cost of gzip against bytes saved, per zlib level, for the bodies the compression middleware handles:
+the full user listing (JSON), and the NDJSON and CSV exports. The bodies are fetched uncompressed from the
+app through the Flask test client, then compressed here in a loop; times are medians.
+
+The last table shows what a snapshot-served listing costs per request: compressing the whole body, against
+splicing the snapshot's precompressed data between a freshly compressed envelope (`gzip_segments`).
+
+Requires the PostgreSQL database from `Config.DATABASES` with the schema loaded; seed it (e.g. through
+`POST /api/users/bulk`) for bodies worth measuring.
+
+Usage:
+    python benchmarks/compression.py --repeat 5
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('OUTBOX_DISPATCHER_ENABLED', 'false')
+os.environ['COMPRESSION_ENABLED'] = 'false'
+
+from app import create_app  # noqa: E402
+from app.utils.gzip_utils import deflate_segment, gzip_segments  # noqa: E402
+
+LEVELS = (1, 3, 6, 9)
+BODIES = {
+    'listing.json': '/api/users/',
+    'export.ndjson': '/api/users/export?format=ndjson',
+    'export.csv': '/api/users/export?format=csv',
+}
+
+
+def timed(fn, repeat: int) -> float:
+    """Median wall time of `fn()` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    client = create_app().test_client()
+    bodies = {name: client.get(path).get_data() for name, path in BODIES.items()}
+
+    print(f"{'body':>14} {'level':>5} {'bytes':>10} {'gzipped':>10} {'saved':>7} {'time':>9} {'MB/s':>7}")
+    for name, body in bodies.items():
+        for level in LEVELS:
+            compressed = zlib.compress(body, level, wbits=zlib.MAX_WBITS | 16)
+            ms = timed(lambda: zlib.compress(body, level, wbits=zlib.MAX_WBITS | 16), args.repeat)
+            print(f"{name:>14} {level:5d} {len(body):10d} {len(compressed):10d} "
+                  f"{1 - len(compressed) / len(body):6.1%} {ms:7.2f}ms {len(body) / ms / 1000:7.1f}")
+
+    listing = bodies['listing.json']
+    head, data, tail = listing[:listing.index(b'[') + 1], listing[listing.index(b'[') + 1:-2], listing[-2:]
+    print(f"\nsnapshot listing, per request ({len(listing)} bytes)")
+    print(f"{'level':>5} {'whole body':>11} {'spliced':>9}")
+    for level in LEVELS:
+        deflated = deflate_segment(data, level)
+        whole = timed(lambda: zlib.compress(listing, level, wbits=zlib.MAX_WBITS | 16), args.repeat)
+        spliced = timed(lambda: gzip_segments([(head, None), (data, deflated), (tail, None)], level), args.repeat)
+        print(f"{level:5d} {whole:9.2f}ms {spliced:7.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
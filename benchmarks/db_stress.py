@@ -0,0 +1,153 @@
+"""db_stress.py
+
+Hammer the user routes from many threads against a threaded server and check that
+concurrent requests never see each other's connections or data.
+
+The app runs in this process (werkzeug, threaded) so the PostgreSQL pool statistics can be read
+directly. Each worker loops over create -> get -> page -> delete -> get (404) with its own users and
+verifies every response; afterwards the number of pool checkouts is compared with the number of
+requests that touched the database (the unit of work allows at most one per request).
+
+Requires the PostgreSQL database from `Config.DATABASES` with the schema loaded. The outbox
+dispatcher is disabled so that its polling does not show up in the checkout count.
+
+Usage:
+    python benchmarks/db_stress.py --threads 32 --iterations 50
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('OUTBOX_DISPATCHER_ENABLED', 'false')
+
+from werkzeug.serving import make_server  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.database.db import pg_db  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class Worker(threading.Thread):
+    def __init__(self, port: int, iterations: int, barrier: threading.Barrier) -> None:
+        super().__init__(daemon=True)
+        self.port = port
+        self.iterations = iterations
+        self.barrier = barrier
+        self.requests = 0
+        self.failures: Counter = Counter()
+
+    def call(self, conn: http.client.HTTPConnection, method: str, path: str, body=None):
+        self.requests += 1
+        conn.request(method, path, body=json.dumps(body) if body is not None else None,
+                     headers={'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        return response.status, json.loads(response.read() or b'null')
+
+    def check(self, ok: bool, what: str) -> bool:
+        if not ok:
+            self.failures[what] += 1
+        return ok
+
+    def run(self) -> None:
+        conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+        self.barrier.wait()
+        try:
+            self.cycle(conn)
+        except Exception as e:
+            # A dead worker must fail the run, not just send fewer requests.
+            self.failures[f"worker error: {type(e).__name__}"] += 1
+        finally:
+            conn.close()
+
+    def cycle(self, conn: http.client.HTTPConnection) -> None:
+        for _ in range(self.iterations):
+            tag = uuid.uuid4().hex[:12]
+            username, email = f"stress_{tag}", f"{tag}@stress.test"
+
+            status, body = self.call(conn, 'POST', '/api/users/', {"username": username, "email": email})
+            if not self.check(status == 201, 'create status'):
+                continue
+            user = body['data']
+            self.check(user['username'] == username and user['email'] == email, 'create returned another row')
+
+            status, body = self.call(conn, 'GET', f"/api/users/{user['id']}")
+            self.check(status == 200 and body['data']['email'] == email, 'get returned another row')
+
+            status, body = self.call(conn, 'GET', f"/api/users/?after_id={user['id'] - 1}&limit=1")
+            self.check(status == 200 and [u['id'] for u in body['data']['items']] == [user['id']], 'page')
+
+            status, _ = self.call(conn, 'DELETE', f"/api/users/{user['id']}")
+            self.check(status == 202, 'delete status')
+
+            status, _ = self.call(conn, 'GET', f"/api/users/{user['id']}")
+            self.check(status == 404, 'deleted user still visible')
+
+
+def main() -> int:
+    """Run the stress test; returns the process exit status (non-zero on any failure)."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--iterations', type=int, default=50, help="create/get/page/delete cycles per thread")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    app = create_app()
+    port = free_port()
+    server = make_server('127.0.0.1', port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with app.app_context():
+        pool = pg_db._get_current_object()
+        before = pool.pool.get_stats()
+
+    barrier = threading.Barrier(args.threads + 1)
+    workers = [Worker(port, args.iterations, barrier) for _ in range(args.threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+
+    after = pool.pool.get_stats()
+    requests = sum(worker.requests for worker in workers)
+    failures = sum((worker.failures for worker in workers), Counter())
+    checkouts = after.get('requests_num', 0) - before.get('requests_num', 0)
+    waiting = after.get('requests_waiting', 0)
+
+    print(f"requests:   {requests} in {elapsed:.2f}s ({requests / elapsed:.0f} req/s, {args.threads} threads)")
+    print(f"checkouts:  {checkouts} ({checkouts / max(requests, 1):.2f} per request)")
+    print(f"pool:       size={after.get('pool_size')} available={after.get('pool_available')} "
+          f"waiting={waiting} timeouts={after.get('requests_errors', 0) - before.get('requests_errors', 0)}")
+    if failures:
+        print(f"FAILURES:   {dict(failures)}")
+        return 1
+    if not requests:
+        print("FAILURE:    no requests were sent")
+        return 1
+    if checkouts > requests:
+        print("FAILURE:    more than one pool checkout per request")
+        return 1
+    print("OK: no cross-request interference")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""dto_conversion.py
+
+Cost of converting `UserModel`s to `UserResponse`s: the former `from_dict(model.to_dict())` round trip
+(`dataclasses.asdict`, then filtering the dict against the DTO's fields) against the converter compiled per
+(model, DTO) pair (`ConverterRegistry`), one model at a time and as a `many=True` batch.
+
+Like `timeit`, samples run with the garbage collector paused (after a full collection).
+
+Usage:
+    python benchmarks/dto_conversion.py --models 100000 --repeat 5
+"""
+
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.converters import converter_registry  # noqa: E402
+from app.dto.user_dto import UserResponse  # noqa: E402
+from app.models.user_model import UserModel  # noqa: E402
+
+
+def timed(fn, repeat: int) -> float:
+    """Median wall time of `fn()` in milliseconds, with the garbage collector paused."""
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - started) * 1000)
+        finally:
+            gc.enable()
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--models', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    now = datetime.now()
+    users = [UserModel(id=i, username=f"user{i}", email=f"user{i}@bench.test", is_active=True, created_at=now)
+             for i in range(args.models)]
+    round_trip = [UserResponse.from_dict(user.to_dict()) for user in users]
+    assert UserResponse.from_model(users, many=True) == round_trip
+    assert [UserResponse.from_model(user) for user in users] == round_trip
+
+    converter = converter_registry.get(UserModel, UserResponse)
+    variants = {
+        'asdict/from_dict': lambda: [UserResponse.from_dict(user.to_dict()) for user in users],
+        'from_model, one by one': lambda: [UserResponse.from_model(user) for user in users],
+        'from_model, many=True': lambda: UserResponse.from_model(users, many=True),
+        'converter.many': lambda: converter.many(users),
+    }
+    baseline = None
+    print(f"{'':>24} {'time':>10} {'per model':>10} {'speedup':>8}")
+    for label, fn in variants.items():
+        ms = timed(fn, args.repeat)
+        baseline = baseline or ms
+        print(f"{label:>24} {ms:8.1f}ms {ms * 1000 / args.models:8.2f}us {baseline / ms:7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""json_encoding.py
+
+Cost of encoding `ResponseHandler.ok` envelopes: the former path (`Response.to_dict()`, a deep `asdict` over all
+the data, then `json.dumps` with the former `ComplexJSONEncoder`) against `JSONCodec`, which encodes the envelope
+dataclass in one pass, with the standard library backend and, when installed, orjson.
+
+Envelopes hold one user, a page of 100 users, and the full listing of `--users` users. Like `timeit`, samples
+run with the garbage collector paused (after a full collection).
+
+Usage:
+    python benchmarks/json_encoding.py --users 20000 --repeat 5
+"""
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.base_model import BaseModel  # noqa: E402
+from app.dto.response import Response, PageResponse  # noqa: E402
+from app.dto.user_dto import UserResponse  # noqa: E402
+from app.serialization.json_codec import JSONCodec, ORJSON, STDLIB, orjson  # noqa: E402
+from app.utils.dttm_utils import DateUtils  # noqa: E402
+
+
+class FormerJSONEncoder(json.JSONEncoder):
+    """`ComplexJSONEncoder` before `to_json_native`, for the baseline."""
+
+    def default(self, obj: Any) -> Any:
+        if isinstance(obj, BaseModel):
+            return obj.to_dict()
+        elif isinstance(obj, datetime):
+            return DateUtils.serialize_to_iso(obj)
+        return super().default(obj)
+
+
+def timed(fn, repeat: int) -> float:
+    """Median wall time of `fn()` in milliseconds, with the garbage collector paused."""
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - started) * 1000)
+        finally:
+            gc.enable()
+    return statistics.median(samples)
+
+
+def envelope(data: Any) -> Response:
+    return Response(message="OK", status=200, data=data, timestamp=DateUtils.get_dttm_local(serialized=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    now = datetime.now()
+    users = [UserResponse(id=i, username=f"user{i}", email=f"user{i}@bench.test", is_active=True, created_at=now)
+             for i in range(args.users)]
+    envelopes = {
+        'one user': envelope(users[0]),
+        'page of 100': envelope(PageResponse(items=users[:100], next_page_token="eyJhZnRlcl9pZCI6MTAwfQ")),
+        f'{args.users} users': envelope(users),
+    }
+
+    variants = {'to_dict + json (former)': lambda obj: json.dumps(obj.to_dict(), cls=FormerJSONEncoder,
+                                                                  separators=(',', ':')).encode()}
+    codecs = [JSONCodec(STDLIB)] + ([JSONCodec(ORJSON)] if orjson is not None else [])
+    for codec in codecs:
+        variants[f'JSONCodec {codec.backend}'] = codec.dumps
+
+    print(f"{'':>24} " + ' '.join(f"{label:>14}" for label in envelopes))
+    baselines = {}
+    for name, encode in variants.items():
+        cells = []
+        for label, obj in envelopes.items():
+            assert json.loads(encode(obj)) == json.loads(variants['to_dict + json (former)'](obj))
+            repeat = args.repeat if obj.data is users else args.repeat * 100  # Small envelopes: more samples
+            ms = timed(lambda: encode(obj), repeat)
+            baselines.setdefault(label, ms)
+            cells.append(f"{ms:7.3f}ms {baselines[label] / ms:4.1f}x")
+        print(f"{name:>24} " + ' '.join(f"{cell:>14}" for cell in cells))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""sqlite_reads.py
+
+Measure SQLite read throughput under concurrent threads while one thread keeps writing, for
+different reader pool sizes. A pool size of 0 sends reads through the writer connection (the
+behaviour of a single shared connection), which serializes readers behind every write.
+
+sqlite3 releases the GIL while a statement runs, so with WAL and separate reader connections
+throughput grows with the number of cores until the Python side of each query dominates.
+
+Usage:
+    python benchmarks/sqlite_reads.py --threads 8 --seconds 3 --rows 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.sqlite_client import SQLiteClient  # noqa: E402
+
+SCHEMA = """
+CREATE TABLE users
+(
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    username   TEXT    NOT NULL,
+    email      TEXT    NOT NULL UNIQUE,
+    is_active  BOOLEAN NOT NULL DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def seed(path: str, rows: int) -> None:
+    client = SQLiteClient(path)
+    client.connect()
+    client.execute(SCHEMA)
+    client.bulk_insert("users", ("username", "email"), ((f"user{i}", f"user{i}@bench.test") for i in range(rows)))
+    client.close()
+
+
+def run(path: str, rows: int, threads: int, seconds: float, read_pool_size: int) -> tuple[int, int]:
+    client = SQLiteClient(path, read_pool_size=read_pool_size or None)
+    client.connect()
+    if not read_pool_size:
+        client.in_memory = True  # Route reads through the writer, like a single shared connection
+    stop = threading.Event()
+    reads = [0] * threads
+    writes = [0]
+
+    def reader(slot: int) -> None:
+        rng = random.Random(slot)
+        while not stop.is_set():
+            client.fetch_one("SELECT id, username, email, is_active, created_at FROM users WHERE id = ?",
+                             (rng.randint(1, rows),))
+            reads[slot] += 1
+
+    def writer() -> None:
+        while not stop.is_set():
+            client.execute("UPDATE users SET is_active = NOT is_active WHERE id = ?", (random.randint(1, rows),))
+            writes[0] += 1
+
+    workers = [threading.Thread(target=reader, args=(i,)) for i in range(threads)]
+    workers.append(threading.Thread(target=writer))
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    client.close()
+    return sum(reads), writes[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8, help="reader threads (plus one writer)")
+    parser.add_argument('--seconds', type=float, default=3)
+    parser.add_argument('--rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        seed(path, args.rows)
+        for pool_size in sorted({0, 1, os.cpu_count() or 1, args.threads}):
+            reads, writes = run(path, args.rows, args.threads, args.seconds, pool_size)
+            label = 'writer only' if pool_size == 0 else f'{pool_size} reader(s)'
+            print(f"{label:>14}: {reads / args.seconds:>9.0f} reads/s  {writes / args.seconds:>7.0f} writes/s")
+
+
+if __name__ == '__main__':
+    main()
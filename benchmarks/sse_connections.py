@@ -0,0 +1,113 @@
+"""sse_connections.py
+
+Compare the cost of idle SSE connections under the threaded WSGI server (`wsgi.py`)
+and the asyncio server (`aio_server.py`).
+
+For each mode a server is started in a subprocess, `--connections` clients open
+`GET /api/users/stream` and wait for the first heartbeat, and the server's resident
+memory and thread count are sampled from /proc (Linux only).
+
+Usage:
+    python benchmarks/sse_connections.py --connections 2000 --mode both
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    'threaded': "from app import create_app; create_app().run(port={port}, threaded=True, use_reloader=False)",
+    'aio': "from app import create_app; from app.aio.server import serve; serve(create_app(), port={port})",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def proc_status(pid: int) -> dict:
+    status = {}
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            status[key] = value.strip()
+    return {'rss_kb': int(status['VmRSS'].split()[0]), 'threads': int(status['Threads'])}
+
+
+async def open_stream(port: int, timeout: float):
+    reader, writer = await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), timeout)
+    writer.write(b"GET /api/users/stream HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n")
+    await writer.drain()
+    await asyncio.wait_for(reader.readuntil(b': keep-alive\n\n'), timeout)
+    return writer
+
+
+async def run_clients(port: int, connections: int, batch: int, timeout: float, pid: int):
+    writers = []
+    failed = 0
+    for start in range(0, connections, batch):
+        results = await asyncio.gather(*(open_stream(port, timeout) for _ in range(min(batch, connections - start))),
+                                       return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                failed += 1
+            else:
+                writers.append(result)
+        if failed:
+            break
+    await asyncio.sleep(1)
+    sample = proc_status(pid)
+    for writer in writers:
+        writer.close()
+    return len(writers), failed, sample
+
+
+def bench(mode: str, connections: int, batch: int, timeout: float) -> None:
+    port = free_port()
+    env = dict(os.environ, PYTHONPATH=ROOT, SSE_HEARTBEAT_INTERVAL='5')
+    server = subprocess.Popen([sys.executable, '-c', SERVERS[mode].format(port=port)], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+        baseline = proc_status(server.pid)
+        opened, failed, loaded = asyncio.run(run_clients(port, connections, batch, timeout, server.pid))
+        per_conn = (loaded['rss_kb'] - baseline['rss_kb']) / opened if opened else float('nan')
+        print(f"{mode:>8}: open={opened:<6} failed={failed:<4} "
+              f"rss={baseline['rss_kb'] / 1024:.1f}->{loaded['rss_kb'] / 1024:.1f} MiB "
+              f"({per_conn:.1f} KiB/conn) threads={baseline['threads']}->{loaded['threads']}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=['threaded', 'aio', 'both'], default='both')
+    parser.add_argument('--connections', type=int, default=1000)
+    parser.add_argument('--batch', type=int, default=100, help="connections opened concurrently")
+    parser.add_argument('--timeout', type=float, default=10)
+    args = parser.parse_args()
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    for mode in (['threaded', 'aio'] if args.mode == 'both' else [args.mode]):
+        bench(mode, args.connections, args.batch, args.timeout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""startup.py
+
+Measure worker start-up: the time to import the app package, to run `create_app`, and the latency of
+the first and second requests, with and without warm-up (`WARM_UP_ON_START`).
+
+Every sample runs in a fresh interpreter so nothing is cached between runs; medians are printed.
+Also reports whether a database driver was imported before the first request.
+
+Requires the PostgreSQL database from `Config.DATABASES` with the schema loaded.
+
+Usage:
+    python benchmarks/startup.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, logging, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+logging.disable(logging.CRITICAL)
+flask_app = app.create_app()
+created = time.perf_counter()
+driver_loaded = 'psycopg' in sys.modules
+client = flask_app.test_client()
+timings = []
+for _ in range(2):
+    request_started = time.perf_counter()
+    status = client.get('/api/users/1').status_code
+    timings.append((time.perf_counter() - request_started) * 1000)
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_request_ms': timings[0],
+    'second_request_ms': timings[1],
+    'driver_before_first_request': driver_loaded,
+    'status': status,
+}))
+"""
+
+
+def sample(warm_up: bool) -> dict:
+    env = dict(os.environ, OUTBOX_DISPATCHER_ENABLED='false', WARM_UP_ON_START=str(warm_up).lower(),
+               PYTHONPATH=ROOT)
+    output = subprocess.run([sys.executable, '-c', PROBE], env=env, cwd=ROOT, capture_output=True, text=True,
+                            check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'warm-up':>8} {'import':>9} {'create_app':>11} {'1st request':>12} {'2nd request':>12}  driver loaded")
+    for warm_up in (False, True):
+        samples = [sample(warm_up) for _ in range(args.runs)]
+        if any(s['status'] != 200 for s in samples):
+            sys.exit(f"GET /api/users/1 failed: {samples}")
+        median = {key: statistics.median(s[key] for s in samples)
+                  for key in ('import_ms', 'create_app_ms', 'first_request_ms', 'second_request_ms')}
+        print(f"{'on' if warm_up else 'off':>8} {median['import_ms']:7.1f}ms {median['create_app_ms']:9.1f}ms "
+              f"{median['first_request_ms']:10.1f}ms {median['second_request_ms']:10.1f}ms  "
+              f"{'at start-up' if samples[0]['driver_before_first_request'] else 'on first request'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""users_listing.py
+
+Compare the latency of the full `GET /api/users/` listing streamed from the database with the same listing
+served from the pre-encoded snapshot (`USERS_SNAPSHOT_ENABLED`).
+
+Each mode runs in a fresh interpreter through the Flask test client, so only the application's own work is
+measured; the first request (which loads the snapshot) is reported separately from the steady state.
+
+Requires the PostgreSQL database from `Config.DATABASES` with the schema loaded; seed it (e.g. through
+`POST /api/users/bulk`) for a listing worth measuring.
+
+Usage:
+    python benchmarks/users_listing.py --requests 200
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, logging, statistics, sys, time
+import app
+logging.disable(logging.CRITICAL)
+client = app.create_app().test_client()
+timings = []
+for _ in range(int(sys.argv[1]) + 1):
+    started = time.perf_counter()
+    response = client.get('/api/users/')
+    body = response.get_data()
+    timings.append((time.perf_counter() - started) * 1000)
+    assert response.status_code == 200, response.status_code
+steady = sorted(timings[1:])
+print(json.dumps({
+    'first_ms': timings[0],
+    'p50_ms': statistics.median(steady),
+    'p99_ms': steady[int(len(steady) * 0.99) - 1],
+    'rps': len(steady) / (sum(steady) / 1000),
+    'users': len(json.loads(body)['data']),
+    'bytes': len(body),
+}))
+"""
+
+
+def sample(snapshot: bool, requests: int) -> dict:
+    env = dict(os.environ, OUTBOX_DISPATCHER_ENABLED='false', USERS_SNAPSHOT_ENABLED=str(snapshot).lower(),
+               PYTHONPATH=ROOT)
+    output = subprocess.run([sys.executable, '-c', PROBE, str(requests)], env=env, cwd=ROOT, capture_output=True,
+                            text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'mode':>9} {'users':>7} {'bytes':>9} {'1st request':>12} {'p50':>9} {'p99':>9} {'req/s':>9}")
+    for snapshot in (False, True):
+        s = sample(snapshot, args.requests)
+        print(f"{'snapshot' if snapshot else 'stream':>9} {s['users']:7d} {s['bytes']:9d} {s['first_ms']:10.1f}ms "
+              f"{s['p50_ms']:7.2f}ms {s['p99_ms']:7.2f}ms {s['rps']:9.0f}")
+
+
+if __name__ == '__main__':
+    main()